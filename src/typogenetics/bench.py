@@ -0,0 +1,205 @@
+import json
+import logging
+import platform
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+
+from typogenetics.engine import Compiler, Engine
+from typogenetics.search import Editor, Search
+from typogenetics.similarity import StrandIndex
+from typogenetics.typogenetics import Enzyme, Folder, Rewriter, Strand, Translator
+
+logger = logging.getLogger(__name__)
+
+SEED = 42
+STRAND_LENGTHS = (16, 256, 4096)
+BATCH_SIZE = 100
+ENZYMES = {
+    "copy": "cop-mvr-mvr-mvr-off-mvl-cop",
+    "cut": "rpy-cut-lpu-cut-rpu-cut",
+    "insert": "ina-inc-ing-int-mvr-ina-inc",
+    "mixed": "cop-mvl-mvr-swi-cut-rpy",
+}
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    setup: Callable[[], Callable[[], object]]
+
+
+@dataclass(frozen=True)
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def random_strand(length: int, rng: np.random.Generator) -> Strand:
+    return Strand.from_codes(rng.integers(0, 4, length, dtype=np.uint8).tobytes())
+
+
+def iter_benchmarks() -> Iterator[Benchmark]:  # noqa: PLR0915
+    """Fixed-seed workloads for the hot paths of the engine and the search loops.
+
+    `Translator.translate` and `Rewriter.rewrite` are the reference implementations, which the search loops no longer
+    call, and are only timed to compare against the paths that replaced them.
+    """
+    for length in STRAND_LENGTHS:
+
+        def setup_from_str(length: int = length) -> Callable[[], object]:
+            strand_str = str(random_strand(length, np.random.default_rng(SEED)))
+            return lambda: Strand.from_str(strand_str)
+
+        def setup_translate(length: int = length) -> Callable[[], object]:
+            strand = random_strand(length, np.random.default_rng(SEED))
+            return lambda: Translator.translate(strand)
+
+        def setup_translate_codes(length: int = length) -> Callable[[], object]:
+            strand = random_strand(length, np.random.default_rng(SEED))
+            return lambda: Translator.translate_codes(strand)
+
+        def setup_translate_codes_batch(length: int = length) -> Callable[[], object]:
+            rng = np.random.default_rng(SEED)
+            strands = [random_strand(length, rng) for _ in range(BATCH_SIZE)]
+            return lambda: Translator.translate_codes_batch(strands)
+
+        yield Benchmark(f"strand.from_str/{length}", setup_from_str)
+        yield Benchmark(f"translator.translate_codes/{length}", setup_translate_codes)
+        yield Benchmark(f"translator.translate_codes_batch/{BATCH_SIZE}x{length}", setup_translate_codes_batch)
+        yield Benchmark(f"translator.translate/{length}", setup_translate)
+
+    for enzyme_name, enzyme_str in ENZYMES.items():
+
+        def setup_fold(enzyme_str: str = enzyme_str) -> Callable[[], object]:
+            enzyme = Enzyme.from_str(enzyme_str)
+            return lambda: Folder.fold(enzyme)
+
+        def setup_binding_site(enzyme_str: str = enzyme_str) -> Callable[[], object]:
+            enzyme = Enzyme.from_str(enzyme_str)
+            strand = random_strand(STRAND_LENGTHS[-1], np.random.default_rng(SEED))
+            return lambda: Folder.get_binding_site(enzyme, strand)
+
+        yield Benchmark(f"folder.fold/{enzyme_name}", setup_fold)
+        yield Benchmark(f"folder.get_binding_site/{enzyme_name}", setup_binding_site)
+
+        for length in STRAND_LENGTHS[:2]:
+
+            def setup_engine_rewrite(enzyme_str: str = enzyme_str, length: int = length) -> Callable[[], object]:
+                program = Compiler.compile(Enzyme.from_str(enzyme_str))
+                strand = random_strand(length, np.random.default_rng(SEED))
+                return lambda: Engine.rewrite(program, strand)
+
+            def setup_rewrite(enzyme_str: str = enzyme_str, length: int = length) -> Callable[[], object]:
+                enzyme = Enzyme.from_str(enzyme_str)
+                strand = random_strand(length, np.random.default_rng(SEED))
+                return lambda: Rewriter.rewrite(enzyme, strand)
+
+            yield Benchmark(f"engine.rewrite/{enzyme_name}/{length}", setup_engine_rewrite)
+            yield Benchmark(f"rewriter.rewrite/{enzyme_name}/{length}", setup_rewrite)
+
+    def setup_edit() -> Callable[[], object]:
+        strand = random_strand(STRAND_LENGTHS[1], np.random.default_rng(SEED))
+        rng = np.random.default_rng(SEED)
+        return lambda: Editor.edit(strand, rng)
+
+    def setup_edit_batch() -> Callable[[], object]:
+        strand = random_strand(STRAND_LENGTHS[1], np.random.default_rng(SEED))
+        rng = np.random.default_rng(SEED)
+        return lambda: Editor.edit_batch(strand, 10, rng)
+
+    def setup_random() -> Callable[[], object]:
+        strand = Strand.from_str("ATAGCGAATAGGATAATG")
+        return lambda: Search.random(strand, 2_000, np.random.default_rng(SEED))
+
+    def setup_bfs() -> Callable[[], object]:
+        init_strand = Strand.from_str("ATAAACGATAATTGACAGAGCGAATG")
+        apply_strand = Strand.from_str("ATCGATAGGGAACATGTCGT")
+        return lambda: Search.bfs(init_strand, apply_strand, 4, 5, np.random.default_rng(SEED))
+
+    def setup_sweep() -> Callable[[], object]:
+        strand = random_strand(STRAND_LENGTHS[0], np.random.default_rng(SEED))
+        return lambda: sum(1 for _ in Engine.sweep(strand, 3))
+
+    def setup_within() -> Callable[[], object]:
+        rng = np.random.default_rng(SEED)
+        strand_index = StrandIndex([random_strand(STRAND_LENGTHS[0], rng) for _ in range(10_000)])
+        query = random_strand(STRAND_LENGTHS[0], rng)
+        return lambda: strand_index.within(query, 2)
+
+    yield Benchmark("engine.sweep/3", setup_sweep)
+    yield Benchmark("editor.edit", setup_edit)
+    yield Benchmark("editor.edit_batch/10", setup_edit_batch)
+    yield Benchmark("search.random/2000", setup_random)
+    yield Benchmark("search.bfs/4x5", setup_bfs)
+    yield Benchmark("similarity.within/2", setup_within)
+
+
+class Bench:
+    @classmethod
+    def time(cls, func: Callable[[], object], min_time: float = 0.2, n_repeats: int = 5) -> float:
+        """Return the best time per call over `n_repeats` runs of enough calls to take at least `min_time` seconds."""
+        n_calls = 1
+        while True:
+            elapsed = cls.time_calls(func, n_calls)
+            if elapsed >= min_time:
+                break
+            n_calls *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+        best = elapsed
+        for _ in range(n_repeats - 1):
+            best = min(best, cls.time_calls(func, n_calls))
+        return best / n_calls
+
+    @classmethod
+    def time_calls(cls, func: Callable[[], object], n_calls: int) -> float:
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            func()
+        return time.perf_counter() - start
+
+    @classmethod
+    def run(cls, pattern: Optional[str] = None, min_time: float = 0.2, n_repeats: int = 5) -> dict[str, float]:
+        # Search loops log their results, which would otherwise dominate their timings
+        quiet_loggers = [logging.getLogger(name) for name in ("typogenetics.search", "typogenetics.cache")]
+        levels = [quiet_logger.level for quiet_logger in quiet_loggers]
+        for quiet_logger in quiet_loggers:
+            quiet_logger.setLevel(logging.WARNING)
+        try:
+            results = {}
+            for benchmark in iter_benchmarks():
+                if pattern is not None and pattern not in benchmark.name:
+                    continue
+                results[benchmark.name] = cls.time(benchmark.setup(), min_time=min_time, n_repeats=n_repeats)
+                logger.info("%s: %.3g s", benchmark.name, results[benchmark.name])
+        finally:
+            for quiet_logger, level in zip(quiet_loggers, levels, strict=True):
+                quiet_logger.setLevel(level)
+        return results
+
+    @classmethod
+    def save(cls, results: dict[str, float], path: Path) -> None:
+        machine = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+        }
+        path.write_text(json.dumps({"machine": machine, "results": results}, indent=2) + "\n")
+
+    @classmethod
+    def load(cls, path: Path) -> dict[str, float]:
+        results: dict[str, float] = json.loads(path.read_text())["results"]
+        return results
+
+    @classmethod
+    def compare(cls, baseline: dict[str, float], current: dict[str, float]) -> list[Comparison]:
+        """Compare the benchmarks present in both runs, slowest relative to the baseline first."""
+        comparisons = [Comparison(name, baseline[name], current[name]) for name in current if name in baseline]
+        return sorted(comparisons, key=lambda comparison: comparison.ratio, reverse=True)
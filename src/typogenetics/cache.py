@@ -0,0 +1,158 @@
+import logging
+from collections import OrderedDict
+from functools import partial
+from typing import Optional
+
+from typogenetics.engine import Engine, Program
+from typogenetics.stats import Stats
+from typogenetics.typogenetics import Strand
+
+logger = logging.getLogger(__name__)
+
+# Approximate CPython memory of a cache entry excluding the variable-length base codes: the key tuple and its two
+# bytes headers, the value tuple with its execution tuple and the ordered dict's hash slot and link. Each strand in a
+# value adds a Strand, a bytes header and a tuple slot.
+_ENTRY_BYTES = 330
+_STRAND_BYTES = 81
+# Approximate CPython memory of a phenotype cache entry excluding the variable-length codes: the opcodes' bytes header
+# and the ordered dict's hash slot and link. A phenotype adds a Strand and a bytes header.
+_PHENOTYPE_ENTRY_BYTES = 140
+
+
+class RewriteCache:
+    """Bounded memo of `Engine.rewrite` results with least recently used eviction.
+
+    Rewriting is deterministic, so the result of applying an enzyme to a strand only depends on the enzyme's opcodes
+    and the strand's base codes, which together form the key. The cache tracks an estimate of its memory use and
+    evicts the least recently used entries whenever that estimate exceeds `max_bytes`. Each entry also keeps how the
+    enzyme executed, so a hit records the same stats as the rewrite it replaces.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple[bytes, bytes], tuple[tuple[Strand, ...], Optional[tuple[int, bool]], int]] = (
+            OrderedDict()
+        )
+
+    def rewrite(self, program: Program, strand: Strand, stats: Optional[Stats] = None) -> list[Strand]:
+        key = (program.opcodes, strand.codes)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            if stats is not None:
+                stats.record_rewrite(program.opcodes, entry[1])
+            return list(entry[0])
+
+        self.misses += 1
+        strands, execution = Engine.run(program, strand)
+        if stats is not None:
+            stats.record_rewrite(program.opcodes, execution)
+        n_bytes = _ENTRY_BYTES + len(key[0]) + len(key[1]) + sum(_STRAND_BYTES + len(s) for s in strands)
+        if n_bytes > self.max_bytes:
+            return strands
+
+        self._entries[key] = (tuple(strands), execution, n_bytes)
+        self.n_bytes += n_bytes
+        while self.n_bytes > self.max_bytes:
+            _, (_, _, evicted_bytes) = self._entries.popitem(last=False)
+            self.n_bytes -= evicted_bytes
+            self.evictions += 1
+        return strands
+
+    @property
+    def hit_rate(self) -> float:
+        n_lookups = self.hits + self.misses
+        return self.hits / n_lookups if n_lookups > 0 else 0.0
+
+    def log_stats(self) -> None:
+        logger.info(
+            "Rewrite cache: %d hits, %d misses, %d evictions, %.1f%% hit rate, %d entries using ~%.1f MB",
+            self.hits,
+            self.misses,
+            self.evictions,
+            100 * self.hit_rate,
+            len(self),
+            self.n_bytes / 1e6,
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.n_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PhenotypeCache:
+    """Bounded memo of the longest strand produced by applying an enzyme to a fixed strand.
+
+    This is the phenotype used by `Search.bfs`. It only depends on the enzyme, and an enzyme whose binding base does
+    not occur in the apply strand cannot bind to it, so its phenotype is the apply strand itself without rewriting.
+    Like `RewriteCache`, it evicts the least recently used entries once its estimated memory exceeds `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        apply_strand: Strand,
+        cache: Optional[RewriteCache] = None,
+        stats: Optional[Stats] = None,
+        max_bytes: int = 1 << 28,
+    ) -> None:
+        self.apply_strand = apply_strand
+        self.max_bytes = max_bytes
+        self.n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.unbound = 0
+        self.evictions = 0
+        self._rewrite = Engine.rewrite if cache is None else cache.rewrite
+        if stats is not None:
+            self._rewrite = stats.timed("rewrite", partial(self._rewrite, stats=stats))
+        self._phenotypes: OrderedDict[bytes, tuple[Optional[Strand], int]] = OrderedDict()
+
+    def get(self, program: Program) -> Optional[Strand]:
+        if self.apply_strand.first_units[program.binding_code] < 0:
+            self.unbound += 1
+            return self.apply_strand
+
+        entry = self._phenotypes.get(program.opcodes)
+        if entry is not None:
+            self.hits += 1
+            self._phenotypes.move_to_end(program.opcodes)
+            return entry[0]
+
+        self.misses += 1
+        strands = self._rewrite(program, self.apply_strand)
+        phenotype = max(strands, key=len) if len(strands) > 0 else None
+        n_bytes = _PHENOTYPE_ENTRY_BYTES + len(program.opcodes)
+        if phenotype is not None:
+            n_bytes += _STRAND_BYTES + len(phenotype)
+        if n_bytes > self.max_bytes:
+            return phenotype
+
+        self._phenotypes[program.opcodes] = (phenotype, n_bytes)
+        self.n_bytes += n_bytes
+        while self.n_bytes > self.max_bytes:
+            _, (_, evicted_bytes) = self._phenotypes.popitem(last=False)
+            self.n_bytes -= evicted_bytes
+            self.evictions += 1
+        return phenotype
+
+    def log_stats(self) -> None:
+        logger.info(
+            "Phenotype cache: %d hits, %d misses, %d evictions, %d enzymes could not bind, %d entries using ~%.1f MB",
+            self.hits,
+            self.misses,
+            self.evictions,
+            self.unbound,
+            len(self),
+            self.n_bytes / 1e6,
+        )
+
+    def __len__(self) -> int:
+        return len(self._phenotypes)
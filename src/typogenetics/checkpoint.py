@@ -0,0 +1,93 @@
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+from numpy.random import Generator
+
+from typogenetics.typogenetics import Strand
+
+MAGIC = b"TYPOCKPT"
+VERSION = 1
+
+
+class Checkpoint:
+    """A snapshot of a search: a JSON header followed by named binary sections.
+
+    Checkpoints are written to a temporary file which then replaces the previous checkpoint, so a run killed while
+    saving always leaves a complete checkpoint behind.
+    """
+
+    def __init__(self, header: dict[str, Any], sections: dict[str, bytes]) -> None:
+        self.header = header
+        self.sections = sections
+
+    def save(self, path: Path) -> None:
+        header = {**self.header, "sections": [[name, len(data)] for name, data in self.sections.items()]}
+        header_bytes = json.dumps(header).encode()
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tmp_path.open("wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<II", VERSION, len(header_bytes)))
+            f.write(header_bytes)
+            for data in self.sections.values():
+                f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "Checkpoint":
+        with path.open("rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                msg = f"Not a checkpoint file: {path}"
+                raise ValueError(msg)
+            version, header_length = struct.unpack("<II", f.read(8))
+            if version != VERSION:
+                msg = f"Unsupported checkpoint version {version} in {path}"
+                raise ValueError(msg)
+            header = json.loads(f.read(header_length))
+            sections = {name: f.read(length) for name, length in header.pop("sections")}
+        return cls(header, sections)
+
+
+def pack_strands(strands: Iterable[Strand]) -> bytes:
+    """Pack strands into their lengths followed by all of their bases, four bases to a byte."""
+    strands = list(strands)
+    lengths = np.array([len(strand) for strand in strands], dtype=np.uint32)
+    packed = Strand.from_codes(b"".join(strand.codes for strand in strands)).pack()
+    return struct.pack("<Q", len(strands)) + lengths.tobytes() + packed
+
+
+def unpack_strands(data: bytes) -> list[Strand]:
+    (n_strands,) = struct.unpack_from("<Q", data)
+    lengths = np.frombuffer(data, dtype=np.uint32, count=n_strands, offset=8)
+    codes = Strand.unpack(data[8 + lengths.nbytes :], int(lengths.sum())).codes
+    ends = np.cumsum(lengths).tolist()
+    return [Strand.from_codes(codes[end - length : end]) for end, length in zip(ends, lengths.tolist(), strict=True)]
+
+
+def pack_bytes(items: Iterable[bytes]) -> bytes:
+    items = list(items)
+    lengths = np.array([len(item) for item in items], dtype=np.uint32)
+    return struct.pack("<Q", len(items)) + lengths.tobytes() + b"".join(items)
+
+
+def unpack_bytes(data: bytes) -> list[bytes]:
+    (n_items,) = struct.unpack_from("<Q", data)
+    lengths = np.frombuffer(data, dtype=np.uint32, count=n_items, offset=8)
+    body = data[8 + lengths.nbytes :]
+    ends = np.cumsum(lengths).tolist()
+    return [body[end - length : end] for end, length in zip(ends, lengths.tolist(), strict=True)]
+
+
+def get_rng_state(rng: Generator) -> dict[str, Any]:
+    return dict(rng.bit_generator.state)
+
+
+def set_rng_state(rng: Generator, state: dict[str, Any]) -> None:
+    """Restore the state of a generator in place, so that callers holding it continue the saved stream."""
+    rng.bit_generator.state = state
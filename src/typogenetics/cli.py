@@ -1,12 +1,25 @@
 import logging
+from pathlib import Path
 from typing import Annotated, Optional
 
 import numpy as np
 from rich.console import Console
 from rich.logging import RichHandler
-from typer import Argument, Option, Typer
-
-from typogenetics.search import Search
+from rich.table import Table
+from typer import Argument, Exit, Option, Typer
+
+from typogenetics.bench import Bench, Comparison
+from typogenetics.cache import RewriteCache
+from typogenetics.dedup import BloomDedup, DedupKind, Deduplicator, DiskDedup
+from typogenetics.gpmap import GenotypePhenotypeMap, PhenotypeKind
+from typogenetics.network import NeutralNetwork
+from typogenetics.parallel import ParallelSearch
+from typogenetics.search import EditMode, Search
+from typogenetics.shared import DEFAULT_MAX_BASES, DEFAULT_MAX_STRANDS
+from typogenetics.similarity import StrandIndex
+from typogenetics.sink import BinarySink, NdjsonSink, Sink, SinkFormat, SqliteSink
+from typogenetics.stats import Stats
+from typogenetics.trace import TraceRecorder
 from typogenetics.typogenetics import AminoAcid, Base, Enzyme, Folder, Rewriter, Strand, Translator
 
 logger = logging.getLogger(__name__)
@@ -25,6 +38,64 @@ def set_logger_config(info: bool, debug: bool) -> None:
         logging.basicConfig(level=logging.DEBUG, handlers=handlers, format=log_format)
 
 
+def make_deduplicator(
+    kind: DedupKind, fp_rate: float, dedup_mb: Optional[float], path: Optional[Path]
+) -> Optional[Deduplicator]:
+    max_bytes = None if dedup_mb is None else int(dedup_mb * 1e6)
+    match kind:
+        case DedupKind.EXACT:
+            return None
+        case DedupKind.BLOOM:
+            return (
+                BloomDedup(fp_rate=fp_rate) if max_bytes is None else BloomDedup(fp_rate=fp_rate, max_bytes=max_bytes)
+            )
+        case DedupKind.DISK:
+            return DiskDedup(path=path) if max_bytes is None else DiskDedup(path=path, max_memory_bytes=max_bytes)
+
+    msg = f"Unknown dedup kind: {kind}"
+    raise ValueError(msg)
+
+
+def is_resuming(checkpoint_path: Optional[Path], resume: bool) -> bool:
+    return resume and checkpoint_path is not None and checkpoint_path.exists()
+
+
+def check_checkpoint_dedup(checkpoint_path: Optional[Path], dedup: DedupKind, dedup_path: Optional[Path]) -> None:
+    # Disk deduplication is checkpointed by its path, so without one the run would only fail at its first checkpoint
+    if checkpoint_path is not None and dedup == DedupKind.DISK and dedup_path is None:
+        msg = "Checkpoints with --dedup disk need a --dedup-path to keep the seen strands in"
+        raise ValueError(msg)
+
+
+def open_sink(
+    output_path: Optional[Path], output_format: SinkFormat, checkpoint_path: Optional[Path], resume: bool
+) -> Optional[Sink]:
+    if output_path is None:
+        return None
+    # A resumed run rolls the output back to its checkpoint, so the output is only kept when there is one
+    return Sink.open(output_path, output_format, append=is_resuming(checkpoint_path, resume))
+
+
+def read_sink(path: Path, sink_format: SinkFormat) -> list[Strand]:
+    match sink_format:
+        case SinkFormat.NDJSON:
+            records = NdjsonSink.read(path)
+        case SinkFormat.BINARY:
+            records = BinarySink.read(path)
+        case SinkFormat.SQLITE:
+            records = SqliteSink.read(path)
+    return [strand for strand, _ in records]
+
+
+def report_stats(stats: Optional[Stats], show_stats: bool, stats_path: Optional[Path]) -> None:
+    if stats is None:
+        return
+    if show_stats:
+        stats.log()
+    if stats_path is not None:
+        stats.save(stats_path)
+
+
 def amino_acid_to_console(amino_acid: AminoAcid) -> str:
     color = "white"
     if amino_acid in [AminoAcid.LPU, AminoAcid.LPY, AminoAcid.RPU, AminoAcid.RPY]:
@@ -77,9 +148,11 @@ def translate(
 
 
 @app.command()
-def rewrite(
+def rewrite(  # noqa: PLR0913
     enzyme_str: Annotated[str, Argument(...)],
     strand_str: Annotated[str, Argument(...)],
+    show_trace: Annotated[bool, Option("--trace/--no-trace")] = False,
+    trace_path: Annotated[Optional[Path], Option("--trace-path")] = None,
     info: Annotated[bool, Option("--info/--no-info")] = True,
     debug: Annotated[bool, Option("--debug/--no-debug")] = False,
 ) -> None:
@@ -87,27 +160,252 @@ def rewrite(
 
     enzyme = Enzyme.from_str(enzyme_str)
     strand = Strand.from_str(strand_str)
-    new_strands = Rewriter.rewrite(enzyme, strand)
+    trace = TraceRecorder() if show_trace or trace_path is not None else None
+    new_strands = Rewriter.rewrite(enzyme, strand, trace=trace)
+    if trace is not None:
+        if show_trace:
+            console.print(trace.render(), markup=False, highlight=False)
+        if trace_path is not None:
+            trace.save(trace_path)
     console.print("New strands:")
     for new_strand in new_strands:
         console.print(f"- {strand_to_console(new_strand)}")
 
 
+@app.command()
+def replay(
+    trace_path: Annotated[Path, Argument(...)],
+    info: Annotated[bool, Option("--info/--no-info")] = True,
+    debug: Annotated[bool, Option("--debug/--no-debug")] = False,
+) -> None:
+    set_logger_config(info, debug)
+
+    trace = TraceRecorder.load(trace_path)
+    console.print(trace.render(), markup=False, highlight=False)
+
+
 @app.command()
 def simulate(  # noqa: PLR0913
     init_strand_str: Annotated[str, Argument(...)],
     n_iterations: Annotated[int, Option("--iter")] = 100_000,
     seed: Annotated[Optional[int], Option("--seed")] = None,
     print_strands: Annotated[bool, Option("--print-strands/--no-print-strands")] = False,
+    sample_pool: Annotated[bool, Option("--sample-pool/--no-sample-pool")] = False,
+    cache_mb: Annotated[Optional[float], Option("--cache-mb")] = None,
+    n_workers: Annotated[int, Option("--workers")] = 1,
+    sync_interval: Annotated[int, Option("--sync-interval")] = 10_000,
+    shared: Annotated[bool, Option("--shared/--no-shared")] = False,
+    max_strands: Annotated[Optional[int], Option("--max-strands")] = None,
+    max_bases: Annotated[Optional[int], Option("--max-bases")] = None,
+    dedup: Annotated[DedupKind, Option("--dedup")] = DedupKind.EXACT,
+    dedup_fp_rate: Annotated[float, Option("--dedup-fp-rate")] = 1e-6,
+    dedup_mb: Annotated[Optional[float], Option("--dedup-mb")] = None,
+    dedup_path: Annotated[Optional[Path], Option("--dedup-path")] = None,
+    checkpoint_path: Annotated[Optional[Path], Option("--checkpoint")] = None,
+    resume: Annotated[bool, Option("--resume/--no-resume")] = False,
+    output_path: Annotated[Optional[Path], Option("--output")] = None,
+    output_format: Annotated[SinkFormat, Option("--output-format")] = SinkFormat.NDJSON,
+    show_stats: Annotated[bool, Option("--stats/--no-stats")] = False,
+    stats_path: Annotated[Optional[Path], Option("--stats-path")] = None,
+    checkpoint_interval: Annotated[int, Option("--checkpoint-interval")] = 100_000,
     info: Annotated[bool, Option("--info/--no-info")] = True,
     debug: Annotated[bool, Option("--debug/--no-debug")] = False,
 ) -> None:
     set_logger_config(info, debug)
 
-    rng = np.random.default_rng(seed)
+    if checkpoint_path is not None and n_workers > 1:
+        msg = "Checkpoints are only supported for simulations with a single worker"
+        raise ValueError(msg)
+    if shared and n_workers == 1:
+        msg = "Simulations with --shared need more than one worker"
+        raise ValueError(msg)
+    if not shared and (max_strands is not None or max_bases is not None):
+        msg = "--max-strands and --max-bases only size the population of simulations with --shared"
+        raise ValueError(msg)
+    if shared:
+        # Shared workers keep every strand in shared memory and only stream them to the output
+        unsupported = {
+            "--dedup": dedup != DedupKind.EXACT,
+            "--cache-mb": cache_mb is not None,
+            "--stats": show_stats,
+            "--stats-path": stats_path is not None,
+            "--sample-pool": sample_pool,
+        }
+        if any(unsupported.values()):
+            options = ", ".join(option for option, is_set in unsupported.items() if is_set)
+            msg = f"Simulations with --shared do not support {options}"
+            raise ValueError(msg)
+    check_checkpoint_dedup(checkpoint_path, dedup, dedup_path)
+
     init_strand = Strand.from_str(init_strand_str)
+    cache_bytes = None if cache_mb is None else int(cache_mb * 1e6)
+
+    # A resumed run restores its deduplicator from the checkpoint, so a new one would only clear its file
+    seen = (
+        None if is_resuming(checkpoint_path, resume) else make_deduplicator(dedup, dedup_fp_rate, dedup_mb, dedup_path)
+    )
+    sink = open_sink(output_path, output_format, checkpoint_path, resume)
+    stats = Stats() if show_stats or stats_path is not None else None
+    try:
+        if shared:
+            ParallelSearch.random_shared(
+                init_strand,
+                n_iterations,
+                n_workers,
+                seed=seed,
+                max_strands=DEFAULT_MAX_STRANDS if max_strands is None else max_strands,
+                max_bases=DEFAULT_MAX_BASES if max_bases is None else max_bases,
+                print_strands=print_strands,
+                sink=sink,
+            )
+            return
+
+        if n_workers > 1:
+            ParallelSearch.random(
+                init_strand,
+                n_iterations,
+                n_workers,
+                seed=seed,
+                sync_interval=sync_interval,
+                print_strands=print_strands,
+                sample_pool=sample_pool,
+                cache_bytes=cache_bytes,
+                seen=seen,
+                sink=sink,
+                stats=stats,
+            )
+            return
+
+        rng = np.random.default_rng(seed)
+        cache = None if cache_bytes is None else RewriteCache(cache_bytes)
+        population = Search.random(
+            init_strand,
+            n_iterations,
+            rng,
+            print_strands=print_strands,
+            sample_pool=sample_pool,
+            cache=cache,
+            seen=seen,
+            checkpoint_path=checkpoint_path,
+            checkpoint_interval=checkpoint_interval,
+            resume=resume,
+            sink=sink,
+            stats=stats,
+        )
+        # A resumed run continues with the deduplicator restored from its checkpoint
+        seen = population.seen
+    finally:
+        if seen is not None:
+            seen.close()
+        if sink is not None:
+            sink.close()
+        report_stats(stats, show_stats, stats_path)
+
+
+@app.command()
+def closure(  # noqa: PLR0913
+    init_strand_str: Annotated[str, Argument(...)],
+    max_length: Annotated[Optional[int], Option("--max-length")] = None,
+    max_strands: Annotated[Optional[int], Option("--max-strands")] = None,
+    max_rounds: Annotated[Optional[int], Option("--max-rounds")] = None,
+    print_strands: Annotated[bool, Option("--print-strands/--no-print-strands")] = False,
+    dedup: Annotated[DedupKind, Option("--dedup")] = DedupKind.EXACT,
+    dedup_fp_rate: Annotated[float, Option("--dedup-fp-rate")] = 1e-6,
+    dedup_mb: Annotated[Optional[float], Option("--dedup-mb")] = None,
+    dedup_path: Annotated[Optional[Path], Option("--dedup-path")] = None,
+    output_path: Annotated[Optional[Path], Option("--output")] = None,
+    output_format: Annotated[SinkFormat, Option("--output-format")] = SinkFormat.NDJSON,
+    show_stats: Annotated[bool, Option("--stats/--no-stats")] = False,
+    stats_path: Annotated[Optional[Path], Option("--stats-path")] = None,
+    info: Annotated[bool, Option("--info/--no-info")] = True,
+    debug: Annotated[bool, Option("--debug/--no-debug")] = False,
+) -> None:
+    set_logger_config(info, debug)
+
+    init_strand = Strand.from_str(init_strand_str)
+    seen = make_deduplicator(dedup, dedup_fp_rate, dedup_mb, dedup_path)
+    sink = open_sink(output_path, output_format, None, False)
+    stats = Stats() if show_stats or stats_path is not None else None
+    try:
+        Search.closure(
+            init_strand,
+            max_length=max_length,
+            max_strands=max_strands,
+            max_rounds=max_rounds,
+            print_strands=print_strands,
+            seen=seen,
+            sink=sink,
+            stats=stats,
+        )
+    finally:
+        if seen is not None:
+            seen.close()
+        if sink is not None:
+            sink.close()
+        report_stats(stats, show_stats, stats_path)
+
+
+@app.command()
+def gpmap(  # noqa: PLR0913
+    path: Annotated[Path, Argument(...)],
+    max_length: Annotated[int, Option("--max-length")] = 10,
+    kind: Annotated[PhenotypeKind, Option("--kind")] = PhenotypeKind.FUNCTION,
+    apply_strand_str: Annotated[Optional[str], Option("--apply")] = None,
+    chunk_size: Annotated[int, Option("--chunk-size")] = 1 << 20,
+    n_workers: Annotated[int, Option("--workers")] = 1,
+    resume: Annotated[bool, Option("--resume/--no-resume")] = False,
+    info: Annotated[bool, Option("--info/--no-info")] = True,
+    debug: Annotated[bool, Option("--debug/--no-debug")] = False,
+) -> None:
+    set_logger_config(info, debug)
 
-    Search.random(init_strand, n_iterations, rng, print_strands=print_strands)
+    apply_strand = None if apply_strand_str is None else Strand.from_str(apply_strand_str)
+    genotype_map = GenotypePhenotypeMap.build(
+        path,
+        max_length,
+        kind=kind,
+        apply_strand=apply_strand,
+        chunk_size=chunk_size,
+        n_workers=n_workers,
+        resume=resume,
+    )
+    sizes = np.diff(genotype_map.offsets.astype(np.int64))
+    logger.info(
+        "%d strands have %d phenotypes, the largest of which is shared by %d strands",
+        len(genotype_map),
+        genotype_map.n_phenotypes,
+        sizes.max(initial=0),
+    )
+
+
+@app.command()
+def network(  # noqa: PLR0913
+    path: Annotated[Path, Argument(...)],
+    batch_size: Annotated[int, Option("--batch-size")] = 1 << 22,
+    edges_path: Annotated[Optional[Path], Option("--edges")] = None,
+    exact_limit: Annotated[int, Option("--exact-limit")] = 256,
+    n_top: Annotated[int, Option("--top")] = 10,
+    info: Annotated[bool, Option("--info/--no-info")] = True,
+    debug: Annotated[bool, Option("--debug/--no-debug")] = False,
+) -> None:
+    set_logger_config(info, debug)
+
+    genotype_map = GenotypePhenotypeMap(path)
+    neutral_network = NeutralNetwork.from_map(genotype_map, batch_size=batch_size, path=edges_path)
+    summaries = neutral_network.summarize(exact_limit=exact_limit)
+    summaries.sort(key=lambda summary: summary.largest_component, reverse=True)
+
+    table = Table("Phenotype", "Genotypes", "Components", "Largest", "Diameter")
+    for summary in summaries[:n_top]:
+        diameter = str(summary.diameter) if summary.exact else f"≥ {summary.diameter}"
+        table.add_row(
+            str(summary.phenotype),
+            str(summary.n_genotypes),
+            str(summary.n_components),
+            str(summary.largest_component),
+            diameter,
+        )
+    console.print(table)
 
 
 @app.command()
@@ -117,17 +415,158 @@ def search(  # noqa: PLR0913
     target_depth: Annotated[int, Option("--depth")] = 10,
     seed: Annotated[Optional[int], Option("--seed")] = None,
     n_edits: Annotated[int, Option("--edits")] = 10,
+    edit_mode: Annotated[EditMode, Option("--edit-mode")] = EditMode.RANDOM,
     print_strands: Annotated[bool, Option("--print-strands/--no-print-strands")] = False,
+    cache_mb: Annotated[Optional[float], Option("--cache-mb")] = None,
+    n_workers: Annotated[int, Option("--workers")] = 1,
+    chunk_size: Annotated[int, Option("--chunk-size")] = 1_000,
+    dedup: Annotated[DedupKind, Option("--dedup")] = DedupKind.EXACT,
+    dedup_fp_rate: Annotated[float, Option("--dedup-fp-rate")] = 1e-6,
+    dedup_mb: Annotated[Optional[float], Option("--dedup-mb")] = None,
+    dedup_path: Annotated[Optional[Path], Option("--dedup-path")] = None,
+    checkpoint_path: Annotated[Optional[Path], Option("--checkpoint")] = None,
+    resume: Annotated[bool, Option("--resume/--no-resume")] = False,
+    output_path: Annotated[Optional[Path], Option("--output")] = None,
+    output_format: Annotated[SinkFormat, Option("--output-format")] = SinkFormat.NDJSON,
+    show_stats: Annotated[bool, Option("--stats/--no-stats")] = False,
+    stats_path: Annotated[Optional[Path], Option("--stats-path")] = None,
     info: Annotated[bool, Option("--info/--no-info")] = True,
     debug: Annotated[bool, Option("--debug/--no-debug")] = False,
 ) -> None:
     set_logger_config(info, debug)
+    if n_workers > 1 and cache_mb is not None:
+        msg = "Searches with more than one worker do not support --cache-mb"
+        raise ValueError(msg)
+    check_checkpoint_dedup(checkpoint_path, dedup, dedup_path)
 
     rng = np.random.default_rng(seed)
     init_strand = Strand.from_str(init_strand_str)
     apply_strand = Strand.from_str(apply_strand_str)
 
-    Search.bfs(init_strand, apply_strand, target_depth, n_edits, rng, print_strands=print_strands)
+    # A resumed run restores its deduplicator from the checkpoint, so a new one would only clear its file
+    seen = (
+        None if is_resuming(checkpoint_path, resume) else make_deduplicator(dedup, dedup_fp_rate, dedup_mb, dedup_path)
+    )
+    sink = open_sink(output_path, output_format, checkpoint_path, resume)
+    stats = Stats() if show_stats or stats_path is not None else None
+    try:
+        if n_workers > 1:
+            ParallelSearch.bfs(
+                init_strand,
+                apply_strand,
+                target_depth,
+                n_edits,
+                rng,
+                n_workers,
+                chunk_size=chunk_size,
+                print_strands=print_strands,
+                seen=seen,
+                checkpoint_path=checkpoint_path,
+                resume=resume,
+                sink=sink,
+                stats=stats,
+                edit_mode=edit_mode,
+            )
+            return
+
+        cache = None if cache_mb is None else RewriteCache(int(cache_mb * 1e6))
+        Search.bfs(
+            init_strand,
+            apply_strand,
+            target_depth,
+            n_edits,
+            rng,
+            print_strands=print_strands,
+            cache=cache,
+            seen=seen,
+            checkpoint_path=checkpoint_path,
+            resume=resume,
+            sink=sink,
+            stats=stats,
+            edit_mode=edit_mode,
+        )
+    finally:
+        if seen is not None:
+            seen.close()
+        if sink is not None:
+            sink.close()
+        report_stats(stats, show_stats, stats_path)
+
+
+@app.command()
+def nearest(  # noqa: PLR0913
+    path: Annotated[Path, Argument(...)],
+    query_strand_str: Annotated[str, Argument(...)],
+    input_format: Annotated[SinkFormat, Option("--format")] = SinkFormat.NDJSON,
+    k: Annotated[int, Option("--k")] = 10,
+    radius: Annotated[Optional[int], Option("--radius")] = None,
+    q: Annotated[int, Option("--q")] = 4,
+    info: Annotated[bool, Option("--info/--no-info")] = True,
+    debug: Annotated[bool, Option("--debug/--no-debug")] = False,
+) -> None:
+    set_logger_config(info, debug)
+
+    query_strand = Strand.from_str(query_strand_str)
+    strand_index = StrandIndex(read_sink(path, input_format), q=q)
+    matches = strand_index.nearest(query_strand, k) if radius is None else strand_index.within(query_strand, radius)
+    for strand, distance in matches:
+        console.print(f"{distance} {strand_to_console(strand)}")
+
+
+@app.command()
+def bench(  # noqa: PLR0913
+    pattern: Annotated[Optional[str], Option("--filter")] = None,
+    save_path: Annotated[Optional[Path], Option("--save")] = None,
+    baseline_path: Annotated[Optional[Path], Option("--baseline")] = None,
+    tolerance: Annotated[float, Option("--tolerance")] = 0.2,
+    min_time: Annotated[float, Option("--min-time")] = 0.2,
+    info: Annotated[bool, Option("--info/--no-info")] = True,
+    debug: Annotated[bool, Option("--debug/--no-debug")] = False,
+) -> None:
+    set_logger_config(info, debug)
+
+    results = Bench.run(pattern, min_time=min_time)
+    if save_path is not None:
+        Bench.save(results, save_path)
+    if baseline_path is not None:
+        print_comparisons(Bench.compare(Bench.load(baseline_path), results), tolerance)
+
+
+@app.command()
+def bench_compare(
+    baseline_path: Annotated[Path, Argument(...)],
+    current_path: Annotated[Path, Argument(...)],
+    tolerance: Annotated[float, Option("--tolerance")] = 0.2,
+    info: Annotated[bool, Option("--info/--no-info")] = True,
+    debug: Annotated[bool, Option("--debug/--no-debug")] = False,
+) -> None:
+    set_logger_config(info, debug)
+
+    print_comparisons(Bench.compare(Bench.load(baseline_path), Bench.load(current_path)), tolerance)
+
+
+def print_comparisons(comparisons: list[Comparison], tolerance: float) -> None:
+    """Print benchmark timings against a baseline and exit with an error if any got slower than the tolerance."""
+    table = Table("Benchmark", "Baseline", "Current", "Ratio")
+    n_regressions = 0
+    for comparison in comparisons:
+        color = "white"
+        if comparison.ratio > 1 + tolerance:
+            color = "red"
+            n_regressions += 1
+        elif comparison.ratio < 1 / (1 + tolerance):
+            color = "green"
+        table.add_row(
+            comparison.name,
+            f"{comparison.baseline:.3g} s",
+            f"{comparison.current:.3g} s",
+            f"[{color}]{comparison.ratio:.2f}x[/]",
+        )
+    console.print(table)
+
+    if n_regressions > 0:
+        console.print(f"[red]{n_regressions} benchmarks regressed by more than {tolerance:.0%}[/]")
+        raise Exit(code=1)
 
 
 @app.command()
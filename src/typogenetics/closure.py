@@ -0,0 +1,159 @@
+import logging
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Iterator, Optional
+
+from typogenetics.dedup import Deduplicator
+from typogenetics.engine import Engine, Program
+from typogenetics.population import Population
+from typogenetics.sink import Sink
+from typogenetics.stats import Stats
+from typogenetics.typogenetics import Strand
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ClosureRound:
+    """What one round of a closure evaluated and discovered."""
+
+    round: int
+    n_pairs: int
+    n_new_strands: int
+    n_new_programs: int
+    n_too_long: int
+    n_strands: int
+    n_programs: int
+    elapsed: float
+
+
+class Closure:
+    """The strands reachable from some initial strands by applying the enzymes the reachable strands code for.
+
+    The closure is computed by semi-naive evaluation: every round only applies the enzymes discovered in the previous
+    round to all strands, and the older enzymes to the strands discovered in the previous round, so every pair of an
+    enzyme and a strand is rewritten exactly once. Enzymes are compared by their compiled programs.
+
+    Strands longer than `max_length` are dropped, and once the population holds `max_strands` strands no more are
+    added, in which case the closure is marked as truncated.
+    """
+
+    def __init__(
+        self,
+        strands: list[Strand],
+        max_length: Optional[int] = None,
+        max_strands: Optional[int] = None,
+        seen: Optional[Deduplicator] = None,
+    ) -> None:
+        self.max_length = max_length
+        self.max_strands = max_strands
+        self.population = Population(seen=seen)
+        self.programs: list[Program] = []
+        self.rounds: list[ClosureRound] = []
+        self.truncated = False
+        self._program_set: set[Program] = set()
+        # Strands and programs discovered in the last round, which have not been rewritten with yet
+        self._n_old_strands = 0
+        self._n_old_programs = 0
+        for strand in strands:
+            self.add(strand)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every pair has been rewritten, so the population is the whole closure."""
+        return not self.truncated and self._n_old_strands == len(self.population)
+
+    def add(self, strand: Strand, stats: Optional[Stats] = None) -> bool:
+        if self.max_strands is not None and len(self.population) >= self.max_strands:
+            self.truncated = True
+            return False
+        if not self.population.add(strand, stats=stats):
+            return False
+        for program in self.population.programs[-1]:
+            if program not in self._program_set:
+                self._program_set.add(program)
+                self.programs.append(program)
+        return True
+
+    @classmethod
+    def iter_pairs(
+        cls, strands: list[Strand], programs: list[Program], n_old_strands: int, n_old_programs: int
+    ) -> Iterator[tuple[Program, Strand]]:
+        """New programs with every strand, then old programs with new strands."""
+        for program in programs[n_old_programs:]:
+            for strand in strands:
+                yield program, strand
+        new_strands = strands[n_old_strands:]
+        for program in programs[:n_old_programs]:
+            for strand in new_strands:
+                yield program, strand
+
+    def step(self, sink: Optional[Sink] = None, stats: Optional[Stats] = None) -> ClosureRound:
+        """Rewrite every pair that has not been rewritten yet, adding the strands produced."""
+        start = time.perf_counter()
+        round_index = len(self.rounds) + 1
+        # The population grows while the round runs, so the round only sees the strands and programs it started with
+        strands, programs = self.population.strands[:], self.programs[:]
+        n_strands, n_programs = len(strands), len(programs)
+        n_old_strands, n_old_programs = self._n_old_strands, self._n_old_programs
+        self._n_old_strands, self._n_old_programs = n_strands, n_programs
+
+        rewrite = Engine.rewrite
+        if stats is not None:
+            rewrite = stats.timed("rewrite", partial(Engine.rewrite, stats=stats))
+        n_pairs = n_too_long = 0
+        for program, strand in self.iter_pairs(strands, programs, n_old_strands, n_old_programs):
+            # Once strands stop being added the closure is incomplete anyway, so the rest of the round is skipped
+            if self.truncated:
+                break
+            n_pairs += 1
+            for new_strand in rewrite(program, strand):
+                if self.max_length is not None and len(new_strand) > self.max_length:
+                    n_too_long += 1
+                elif self.add(new_strand, stats=stats) and sink is not None:
+                    sink.write(new_strand, round_index)
+
+        closure_round = ClosureRound(
+            round=round_index,
+            n_pairs=n_pairs,
+            n_new_strands=len(self.population) - n_strands,
+            n_new_programs=len(self.programs) - n_programs,
+            n_too_long=n_too_long,
+            n_strands=len(self.population),
+            n_programs=len(self.programs),
+            elapsed=time.perf_counter() - start,
+        )
+        self.rounds.append(closure_round)
+        if stats is not None:
+            stats.counters["pairs"] += closure_round.n_pairs
+            stats.sample(
+                round=round_index,
+                n_pairs=closure_round.n_pairs,
+                n_strands=closure_round.n_strands,
+                n_programs=closure_round.n_programs,
+            )
+        return closure_round
+
+    def run(
+        self,
+        max_rounds: Optional[int] = None,
+        sink: Optional[Sink] = None,
+        stats: Optional[Stats] = None,
+    ) -> Population:
+        """Run rounds until no new strands are discovered or `max_rounds` rounds have run."""
+        while not self.complete and (max_rounds is None or len(self.rounds) < max_rounds):
+            closure_round = self.step(sink=sink, stats=stats)
+            logger.info(
+                "Round %d: rewrote %d pairs, discovered %d strands and %d enzymes (%d strands, %d enzymes in total)",
+                closure_round.round,
+                closure_round.n_pairs,
+                closure_round.n_new_strands,
+                closure_round.n_new_programs,
+                closure_round.n_strands,
+                closure_round.n_programs,
+            )
+            if self.truncated:
+                logger.warning("Stopped adding strands after reaching the limit of %d strands", self.max_strands)
+                break
+        return self.population
@@ -0,0 +1,311 @@
+import hashlib
+import logging
+import math
+import sqlite3
+import tempfile
+from abc import ABC, abstractmethod
+from enum import StrEnum, auto
+from pathlib import Path
+from typing import Any, ClassVar, Iterator, Optional
+
+from typogenetics.checkpoint import pack_strands, unpack_strands
+from typogenetics.typogenetics import Strand
+
+logger = logging.getLogger(__name__)
+
+# Approximate CPython memory of a set entry holding base codes, excluding the codes themselves
+_SET_ENTRY_BYTES = 90
+
+
+class DedupKind(StrEnum):
+    EXACT = auto()
+    BLOOM = auto()
+    DISK = auto()
+
+
+class Deduplicator(ABC):
+    """Remembers which strands have been seen."""
+
+    kind: ClassVar[DedupKind]
+
+    @abstractmethod
+    def add(self, strand: Strand) -> bool:
+        """Record a strand, returning whether it had not been seen before."""
+
+    @abstractmethod
+    def dump(self) -> tuple[dict[str, Any], bytes]:
+        """Serialize the deduplicator into metadata and a binary payload for a checkpoint."""
+
+    @classmethod
+    @abstractmethod
+    def load(cls, meta: dict[str, Any], data: bytes) -> "Deduplicator":
+        """Restore a deduplicator from the output of `dump`."""
+
+    def close(self) -> None:  # noqa: B027
+        """Release any files the deduplicator holds, which only disk deduplication does."""
+
+    @abstractmethod
+    def __contains__(self, strand: object) -> bool: ...
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+
+class Interner(Deduplicator):
+    """Assigns each distinct strand a stable integer id and stores it once.
+
+    Strands are looked up by their base codes, whose hash CPython computes once and caches on the bytes object, so
+    membership checks never rebuild a string or call back into Python-level `Strand` methods.
+    """
+
+    kind = DedupKind.EXACT
+
+    def __init__(self) -> None:
+        self.strands: list[Strand] = []
+        self._ids: dict[bytes, int] = {}
+
+    def intern(self, strand: Strand) -> tuple[int, bool]:
+        """Return the id of a strand and whether it was newly added."""
+        strand_id = self._ids.setdefault(strand.codes, len(self.strands))
+        if strand_id < len(self.strands):
+            return strand_id, False
+        self.strands.append(strand)
+        return strand_id, True
+
+    def add(self, strand: Strand) -> bool:
+        return self.intern(strand)[1]
+
+    def get_id(self, strand: Strand) -> Optional[int]:
+        return self._ids.get(strand.codes)
+
+    def dump(self) -> tuple[dict[str, Any], bytes]:
+        return {}, pack_strands(self.strands)
+
+    @classmethod
+    def load(cls, meta: dict[str, Any], data: bytes) -> "Interner":  # noqa: ARG003
+        interner = cls()
+        for strand in unpack_strands(data):
+            interner.intern(strand)
+        return interner
+
+    def __contains__(self, strand: object) -> bool:
+        return isinstance(strand, Strand) and strand.codes in self._ids
+
+    def __getitem__(self, strand_id: int) -> Strand:
+        return self.strands[strand_id]
+
+    def __iter__(self) -> Iterator[Strand]:
+        return iter(self.strands)
+
+    def __len__(self) -> int:
+        return len(self.strands)
+
+
+class _BloomFilter:
+    def __init__(self, capacity: int, fp_rate: float) -> None:
+        self.capacity = capacity
+        self.n_bits = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.n_hashes = max(1, round(self.n_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.n_bits + 7) // 8)
+        self.count = 0
+
+    def get_positions(self, h1: int, h2: int) -> list[int]:
+        # Enhanced double hashing, plain double hashing probes arithmetic progressions that often overlap
+        n_bits = self.n_bits
+        x, y = h1 % n_bits, h2 % n_bits
+        positions = [x]
+        for i in range(1, self.n_hashes):
+            x = (x + y) % n_bits
+            y = (y + i) % n_bits
+            positions.append(x)
+        return positions
+
+    def contains(self, h1: int, h2: int) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self.get_positions(h1, h2))
+
+    def add(self, h1: int, h2: int) -> None:
+        bits = self.bits
+        for position in self.get_positions(h1, h2):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+
+class BloomDedup(Deduplicator):
+    """Scalable Bloom filter with a bounded false positive rate and a memory cap.
+
+    Filters are chained: when the newest filter reaches its capacity, a filter with twice the capacity and half the
+    false positive rate is added, which keeps the overall false positive rate below `fp_rate`. Once another filter
+    would exceed `max_bytes`, the newest filter keeps absorbing strands and its false positive rate grows instead.
+    A false positive makes a new strand look seen, so it is skipped.
+    """
+
+    kind = DedupKind.BLOOM
+
+    def __init__(self, fp_rate: float = 1e-6, max_bytes: int = 1 << 30, initial_capacity: int = 1 << 16) -> None:
+        self.fp_rate = fp_rate
+        self.max_bytes = max_bytes
+        self.filters = [_BloomFilter(initial_capacity, fp_rate / 2)]
+        self.saturated = False
+        self._count = 0
+
+    @property
+    def n_bytes(self) -> int:
+        return sum(len(bloom_filter.bits) for bloom_filter in self.filters)
+
+    def add(self, strand: Strand) -> bool:
+        h1, h2 = self._hash(strand)
+        if any(bloom_filter.contains(h1, h2) for bloom_filter in self.filters):
+            return False
+
+        last_filter = self.filters[-1]
+        if last_filter.count >= last_filter.capacity and not self.saturated:
+            next_filter = _BloomFilter(2 * last_filter.capacity, fp_rate=self.fp_rate / 2 ** (len(self.filters) + 1))
+            if self.n_bytes + len(next_filter.bits) <= self.max_bytes:
+                self.filters.append(next_filter)
+            else:
+                self.saturated = True
+                logger.warning("Bloom filter reached its memory cap, false positives will become more frequent")
+        self.filters[-1].add(h1, h2)
+        self._count += 1
+        return True
+
+    def dump(self) -> tuple[dict[str, Any], bytes]:
+        meta = {
+            "fp_rate": self.fp_rate,
+            "max_bytes": self.max_bytes,
+            "saturated": self.saturated,
+            "count": self._count,
+            "filters": [
+                [bloom_filter.capacity, bloom_filter.n_bits, bloom_filter.n_hashes, bloom_filter.count]
+                for bloom_filter in self.filters
+            ],
+        }
+        return meta, b"".join(bytes(bloom_filter.bits) for bloom_filter in self.filters)
+
+    @classmethod
+    def load(cls, meta: dict[str, Any], data: bytes) -> "BloomDedup":
+        bloom = cls(fp_rate=meta["fp_rate"], max_bytes=meta["max_bytes"])
+        bloom.saturated = meta["saturated"]
+        bloom._count = meta["count"]
+        bloom.filters = []
+        offset = 0
+        for capacity, n_bits, n_hashes, count in meta["filters"]:
+            bloom_filter = _BloomFilter.__new__(_BloomFilter)
+            bloom_filter.capacity, bloom_filter.n_bits, bloom_filter.n_hashes = capacity, n_bits, n_hashes
+            bloom_filter.count = count
+            bloom_filter.bits = bytearray(data[offset : offset + (n_bits + 7) // 8])
+            offset += len(bloom_filter.bits)
+            bloom.filters.append(bloom_filter)
+        return bloom
+
+    def _hash(self, strand: Strand) -> tuple[int, int]:
+        digest = hashlib.blake2b(strand.codes, digest_size=16).digest()
+        return int.from_bytes(digest[:8]), int.from_bytes(digest[8:])
+
+    def __contains__(self, strand: object) -> bool:
+        if not isinstance(strand, Strand):
+            return False
+        h1, h2 = self._hash(strand)
+        return any(bloom_filter.contains(h1, h2) for bloom_filter in self.filters)
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class DiskDedup(Deduplicator):
+    """Exact deduplication that keeps recent strands in memory and spills them to SQLite past `max_memory_bytes`.
+
+    Spilled strands are numbered, so restoring a checkpoint can drop the strands spilled after it was taken. Strands
+    already in the file are cleared unless `keep_existing` is set, which only restoring a checkpoint does.
+    """
+
+    kind = DedupKind.DISK
+
+    def __init__(
+        self, path: Optional[Path] = None, max_memory_bytes: int = 1 << 28, keep_existing: bool = False
+    ) -> None:
+        self.max_memory_bytes = max_memory_bytes
+        self._temp_dir = None
+        if path is None:
+            self._temp_dir = tempfile.TemporaryDirectory(prefix="typogenetics-")
+            path = Path(self._temp_dir.name) / "seen.sqlite"
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode = OFF")
+        self._conn.execute("PRAGMA synchronous = OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen (codes BLOB PRIMARY KEY, id INTEGER NOT NULL) WITHOUT ROWID"
+        )
+        self._n_spilled = self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+        # Strands left by an earlier run would look seen, so only a checkpoint being restored keeps them
+        if self._n_spilled > 0 and not keep_existing:
+            logger.warning("Clearing %d strands left in %s by an earlier run", self._n_spilled, path)
+            with self._conn:
+                self._conn.execute("DELETE FROM seen")
+            self._n_spilled = 0
+        self._memory: set[bytes] = set()
+        self._memory_bytes = 0
+
+    def add(self, strand: Strand) -> bool:
+        codes = strand.codes
+        if codes in self._memory or self._on_disk(codes):
+            return False
+
+        self._memory.add(codes)
+        self._memory_bytes += _SET_ENTRY_BYTES + len(codes)
+        if self._memory_bytes > self.max_memory_bytes:
+            self.spill()
+        return True
+
+    def spill(self) -> None:
+        with self._conn:
+            rows = ((codes, self._n_spilled + i) for i, codes in enumerate(self._memory))
+            self._conn.executemany("INSERT INTO seen VALUES (?, ?)", rows)
+        self._n_spilled += len(self._memory)
+        self._memory.clear()
+        self._memory_bytes = 0
+
+    def _on_disk(self, codes: bytes) -> bool:
+        if self._n_spilled == 0:
+            return False
+        return self._conn.execute("SELECT 1 FROM seen WHERE codes = ?", (codes,)).fetchone() is not None
+
+    def dump(self) -> tuple[dict[str, Any], bytes]:
+        if self._temp_dir is not None:
+            msg = "Disk deduplication can only be checkpointed with an explicit path"
+            raise ValueError(msg)
+        self.spill()
+        return {"path": str(self.path), "max_memory_bytes": self.max_memory_bytes, "n_spilled": self._n_spilled}, b""
+
+    @classmethod
+    def load(cls, meta: dict[str, Any], data: bytes) -> "DiskDedup":  # noqa: ARG003
+        disk = cls(path=Path(meta["path"]), max_memory_bytes=meta["max_memory_bytes"], keep_existing=True)
+        with disk._conn:
+            disk._conn.execute("DELETE FROM seen WHERE id >= ?", (meta["n_spilled"],))
+        disk._n_spilled = meta["n_spilled"]
+        return disk
+
+    def close(self) -> None:
+        self._conn.close()
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+
+    def __contains__(self, strand: object) -> bool:
+        if not isinstance(strand, Strand):
+            return False
+        return strand.codes in self._memory or self._on_disk(strand.codes)
+
+    def __len__(self) -> int:
+        return self._n_spilled + len(self._memory)
+
+
+_DEDUP_TYPES: dict[DedupKind, type[Deduplicator]] = {
+    DedupKind.EXACT: Interner,
+    DedupKind.BLOOM: BloomDedup,
+    DedupKind.DISK: DiskDedup,
+}
+
+
+def load_deduplicator(kind: DedupKind, meta: dict[str, Any], data: bytes) -> Deduplicator:
+    return _DEDUP_TYPES[kind].load(meta, data)
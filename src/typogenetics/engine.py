@@ -0,0 +1,322 @@
+import re
+from dataclasses import dataclass
+from functools import cache
+from itertools import product
+from operator import length_hint
+from typing import TYPE_CHECKING, Iterator, Optional, Sequence
+
+from typogenetics.typogenetics import (
+    BINDING_CODES,
+    CODE_TURNS,
+    Enzyme,
+    Folder,
+    Strand,
+)
+
+if TYPE_CHECKING:
+    from typogenetics.stats import Stats
+
+# Code stored in a strand buffer where there is no base
+EMPTY = 4
+
+# Opcodes are the codes of the duplets that translate to each amino acid
+CUT, DEL, SWI, MVR, MVL, COP, OFF, INA, INC, ING, INT, RPY, RPU, LPY, LPU = range(1, 16)
+
+# For each search opcode, whether a base code stops the search
+_SEARCH_TARGETS = {
+    RPY: (False, True, False, True),
+    RPU: (True, False, True, False),
+    LPY: (False, True, False, True),
+    LPU: (True, False, True, False),
+}
+_RUN = re.compile(rb"[\x00-\x03]+")
+# Opcodes that never write to the buffers while copy mode is off
+_READ_ONLY_OPCODES = frozenset((CUT, SWI, MVR, MVL, OFF, RPY, RPU, LPY, LPU))
+_OPCODES = range(CUT, LPU + 1)
+_OPCODE_BYTES = {opcode: bytes((opcode,)) for opcode in _OPCODES}
+# Longest run of opcodes whose every sequence is kept in memory to extend programs with
+_MAX_TAIL_LENGTH = 4
+
+
+@dataclass(frozen=True, slots=True)
+class Program:
+    """An enzyme compiled into opcodes along with the base code it binds to."""
+
+    opcodes: bytes
+    binding_code: int
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+
+class Compiler:
+    @classmethod
+    def compile(cls, enzyme: Enzyme) -> Program:
+        return cls.compile_codes(enzyme.to_codes())
+
+    @classmethod
+    def compile_codes(cls, opcodes: bytes) -> Program:
+        turning_number = sum(map(CODE_TURNS.__getitem__, opcodes))
+        return Program(opcodes, BINDING_CODES[turning_number % 4])
+
+    @classmethod
+    def compile_codes_batch(cls, genes: Sequence[bytes]) -> list[Program]:
+        binding_codes = Folder.get_binding_codes_batch(genes)
+        return [Program(opcodes, code) for opcodes, code in zip(genes, binding_codes.tolist(), strict=True)]
+
+    @classmethod
+    def decompile(cls, program: Program) -> Enzyme:
+        return Enzyme.from_codes(program.opcodes)
+
+
+class RewriteState:
+    """An enzyme bound to a strand, along with the strands it has cut off so far.
+
+    The two strands are stored in physical buffers that are never reversed or copied while rewriting. `swi` flips
+    `flipped`, which swaps the bound and complement buffers and the direction the enzyme considers "right", and `cut`
+    only moves the `lo`/`hi` bounds of the live region of the buffers. Units are physical buffer positions.
+
+    A state can be executed a few opcodes at a time, and forked to try different continuations of the same prefix.
+    """
+
+    __slots__ = (
+        "copy_mode",
+        "flipped",
+        "hi",
+        "lo",
+        "n_executed",
+        "primary",
+        "secondary",
+        "shared",
+        "strands",
+        "unit",
+    )
+
+    def __init__(self, strand: Strand, unit: int) -> None:
+        self.primary = bytearray(strand.codes)
+        self.secondary = bytearray((EMPTY,)) * len(strand)
+        self.unit = unit
+        self.lo = 0
+        self.hi = len(strand)
+        self.flipped = False
+        self.copy_mode = False
+        self.strands: list[Strand] = []
+        # Number of opcodes run by the last call to `Engine.execute`
+        self.n_executed = 0
+        # Whether the buffers may be shared with a fork of this state, and must be copied before they are written to
+        self.shared = False
+
+    def fork(self) -> "RewriteState":
+        """Copy of the state that shares its buffers with this state until either of them writes to the buffers."""
+        state = RewriteState.__new__(RewriteState)
+        state.primary, state.secondary = self.primary, self.secondary
+        state.unit, state.lo, state.hi = self.unit, self.lo, self.hi
+        state.flipped, state.copy_mode = self.flipped, self.copy_mode
+        state.strands = list(self.strands)
+        state.n_executed = 0
+        state.shared = self.shared = True
+        return state
+
+    def unshare(self) -> None:
+        if self.shared:
+            self.primary, self.secondary = bytearray(self.primary), bytearray(self.secondary)
+            self.shared = False
+
+    def live_codes(self) -> tuple[bytearray, bytearray]:
+        """Bound and complement codes of the live region, ordered left to right as the enzyme sees them."""
+        if self.flipped:
+            return self.secondary[self.lo : self.hi][::-1], self.primary[self.lo : self.hi][::-1]
+        return self.primary[self.lo : self.hi], self.secondary[self.lo : self.hi]
+
+    def materialize(self) -> list[Strand]:
+        return self.strands + Engine.strands_from_codes(*self.live_codes())
+
+
+class Engine:
+    """Executes compiled programs, producing exactly the same strands as `Rewriter.rewrite`.
+
+    The strand being rewritten is held in a `RewriteState`: two parallel byte buffers of base codes, one for the bound
+    strand and one for its complement, with `EMPTY` marking units that have no base.
+    """
+
+    @classmethod
+    def rewrite(cls, program: Program, strand: Strand, stats: Optional["Stats"] = None) -> list[Strand]:
+        strands, execution = cls.run(program, strand)
+        if stats is not None:
+            stats.record_rewrite(program.opcodes, execution)
+        return strands
+
+    @classmethod
+    def run(cls, program: Program, strand: Strand) -> tuple[list[Strand], Optional[tuple[int, bool]]]:
+        """Rewrite a strand, also returning how many opcodes ran and whether the program completed.
+
+        The execution is None when the program cannot bind to the strand.
+        """
+        unit = strand.first_units[program.binding_code]
+        if unit < 0:
+            return [strand], None
+
+        state = RewriteState(strand, unit)
+        completed = cls.execute(state, program.opcodes)
+        return state.materialize(), (state.n_executed, completed)
+
+    @classmethod
+    def sweep(cls, strand: Strand, max_length: int) -> Iterator[tuple[Program, list[Strand]]]:
+        """Rewrite a strand with every program of 1 to `max_length` opcodes, grouped by the base code they bind to.
+
+        Programs that bind to the same unit and share a prefix pass through the same states, so the programs of each
+        binding code are walked as a trie: every node forks its parent's state and only executes its last opcode. Once
+        a program stops early, all of its extensions stop in the same place and share its strands.
+        """
+        for binding_code in range(len(BINDING_CODES)):
+            unit = strand.first_units[binding_code]
+            if unit < 0 or max_length < 1:
+                for opcodes in cls.iter_extensions(b"", 0, max_length, binding_code):
+                    yield Program(opcodes, binding_code), [strand]
+                continue
+
+            root = RewriteState(strand, unit)
+            stack: list[tuple[bytes, int, RewriteState, list[Strand]]] = [(b"", 0, root, root.materialize())]
+            while stack:
+                prefix, turning_number, state, state_strands = stack.pop()
+                is_leaf = len(prefix) + 1 == max_length
+                for opcode in _OPCODES:
+                    child_turning_number = (turning_number + CODE_TURNS[opcode]) % 4
+                    binds = BINDING_CODES[child_turning_number] == binding_code
+                    # Leaves are only needed by the programs they end, which might bind elsewhere
+                    if is_leaf and not binds:
+                        continue
+                    opcodes = prefix + _OPCODE_BYTES[opcode]
+                    child = state.fork()
+                    completed = cls.execute(child, _OPCODE_BYTES[opcode])
+                    # A state that has not written to its buffers, moved its bounds or cut has the same strands
+                    if (
+                        child.primary is state.primary
+                        and child.flipped == state.flipped
+                        and len(child.strands) == len(state.strands)
+                    ):
+                        strands = state_strands
+                    else:
+                        strands = child.materialize()
+                    if completed:
+                        if binds:
+                            yield Program(opcodes, binding_code), list(strands)
+                        if not is_leaf:
+                            stack.append((opcodes, child_turning_number, child, strands))
+                        continue
+
+                    for extension in cls.iter_extensions(opcodes, child_turning_number, max_length, binding_code):
+                        yield Program(extension, binding_code), list(strands)
+
+    @classmethod
+    def iter_extensions(cls, prefix: bytes, turning_number: int, max_length: int, binding_code: int) -> Iterator[bytes]:
+        """Non-empty opcodes of at most `max_length` that start with a prefix and bind to a base code."""
+        for length in range(max(len(prefix), 1), max_length + 1):
+            n_suffix_opcodes = length - len(prefix)
+            n_tail_opcodes = min(n_suffix_opcodes, _MAX_TAIL_LENGTH)
+            for head in product(_OPCODES, repeat=n_suffix_opcodes - n_tail_opcodes):
+                head_prefix = prefix + bytes(head)
+                head_turning_number = turning_number + sum(map(CODE_TURNS.__getitem__, head))
+                for tail_turning_number, tails in enumerate(_get_tails(n_tail_opcodes)):
+                    if BINDING_CODES[(head_turning_number + tail_turning_number) % 4] == binding_code:
+                        for tail in tails:
+                            yield head_prefix + tail
+
+    # pylint: disable=too-many-branches,too-many-statements
+    @classmethod
+    def execute(cls, state: RewriteState, opcodes: bytes) -> bool:  # noqa: PLR0912, PLR0915
+        """Apply opcodes to the state, returning False if the enzyme stopped before running all of them."""
+        if state.shared and (state.copy_mode or not _READ_ONLY_OPCODES.issuperset(opcodes)):
+            state.unshare()
+        bind, comp = (state.secondary, state.primary) if state.flipped else (state.primary, state.secondary)
+        step = -1 if state.flipped else 1
+        unit, lo, hi, copy_mode = state.unit, state.lo, state.hi, state.copy_mode
+
+        completed = True
+        opcode_iter = iter(opcodes)
+        for opcode in opcode_iter:
+            if opcode >= RPY:
+                direction = step if opcode <= RPU else -step
+                targets = _SEARCH_TARGETS[opcode]
+                end_of_strand = False
+                while True:
+                    unit += direction
+                    if unit < lo or unit >= hi:
+                        end_of_strand = True
+                        break
+                    code = bind[unit]
+                    if code == EMPTY:
+                        end_of_strand = True
+                        break
+                    if copy_mode:
+                        comp[unit] = 3 - code
+                    if targets[code]:
+                        break
+                if end_of_strand:
+                    completed = False
+                    break
+            elif opcode >= INA:
+                # Insert to the right of the unit, which is before it in the buffer when flipped
+                position = unit + 1 if step == 1 else unit
+                bind.insert(position, opcode - INA)
+                comp.insert(position, INT - opcode if copy_mode else EMPTY)
+                hi += 1
+                if step == -1:
+                    unit += 1
+            elif opcode in {MVR, MVL}:
+                unit += step if opcode == MVR else -step
+                if unit < lo or unit >= hi or bind[unit] == EMPTY:
+                    completed = False
+                    break
+                if copy_mode:
+                    comp[unit] = 3 - bind[unit]
+            elif opcode == COP:
+                copy_mode = True
+                comp[unit] = 3 - bind[unit]
+            elif opcode == OFF:
+                copy_mode = False
+            elif opcode == CUT:
+                if step == 1:
+                    state.strands += cls.strands_from_codes(bind[unit + 1 : hi], comp[unit + 1 : hi])
+                    hi = unit + 1
+                else:
+                    state.strands += cls.strands_from_codes(bind[lo:unit][::-1], comp[lo:unit][::-1])
+                    lo = unit
+            elif opcode == DEL:
+                bind[unit] = EMPTY
+                unit -= step
+                if unit < lo or unit >= hi or bind[unit] == EMPTY:
+                    completed = False
+                    break
+            elif opcode == SWI:
+                if comp[unit] == EMPTY:
+                    completed = False
+                    break
+                bind, comp = comp, bind
+                step = -step
+
+        state.unit, state.lo, state.hi, state.copy_mode = unit, lo, hi, copy_mode
+        state.flipped = step == -1
+        # The iterator knows how many opcodes are left, which avoids counting inside the loop
+        state.n_executed = len(opcodes) - length_hint(opcode_iter)
+        return completed
+
+    @classmethod
+    def strands_from_codes(cls, bind: bytes | bytearray, comp: bytes | bytearray) -> list[Strand]:
+        """Split base pair buffers into strands in the same order as `Rewriter.strands_from_pairs`.
+
+        A strand is emitted when the gap that ends it is reached, bound strand before complement strand.
+        """
+        runs = [(match.end(), 0, match.group()) for match in _RUN.finditer(bind)]
+        runs += [(match.end(), 1, match.group()[::-1]) for match in _RUN.finditer(comp)]
+        runs.sort()
+        return [Strand.from_codes(codes) for _, _, codes in runs]
+
+
+@cache
+def _get_tails(length: int) -> tuple[list[bytes], ...]:
+    """Every sequence of `length` opcodes, grouped by the turning number modulo 4 that they add."""
+    tails: tuple[list[bytes], ...] = ([], [], [], [])
+    for tail in product(_OPCODES, repeat=length):
+        tails[sum(map(CODE_TURNS.__getitem__, tail)) % 4].append(bytes(tail))
+    return tails
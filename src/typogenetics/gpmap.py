@@ -0,0 +1,489 @@
+import json
+import logging
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from enum import StrEnum, auto
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from typogenetics.cache import PhenotypeCache
+from typogenetics.engine import Compiler
+from typogenetics.typogenetics import Strand
+
+logger = logging.getLogger(__name__)
+
+VERSION = 1
+# Genotype indexes and phenotype keys are packed into 64 bits: two bits per base, four bits per amino acid code
+MAX_LENGTH = 32
+# Multiplier used to spread phenotype keys over the buckets of the index
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+Chunk = tuple[int, int, int]
+
+
+class PhenotypeKind(StrEnum):
+    # The longest strand produced by applying a strand's largest enzyme to a fixed strand, as in `Search.bfs`
+    FUNCTION = auto()
+    # The amino acid codes of every enzyme a strand codes for
+    TRANSLATION = auto()
+
+
+def get_genotype_offset(length: int) -> int:
+    """Genotype ID of the first strand of a length. Strands are numbered by length, then lexicographically."""
+    return (4**length - 4) // 3
+
+
+def get_genotype_id(strand: Strand) -> int:
+    index = 0
+    for code in strand.codes:
+        index = 4 * index + code
+    return get_genotype_offset(len(strand)) + index
+
+
+def get_strand(genotype_id: int) -> Strand:
+    length = 1
+    while get_genotype_offset(length + 1) <= genotype_id:
+        length += 1
+    index = genotype_id - get_genotype_offset(length)
+    return Strand.from_codes(bytes((index >> 2 * (length - 1 - unit)) & 3 for unit in range(length)))
+
+
+def iter_chunks(max_length: int, chunk_size: int) -> Iterator[Chunk]:
+    """Ranges of strand indexes, as (length, start, stop), covering every strand of 1 to `max_length` bases."""
+    for length in range(1, max_length + 1):
+        for start in range(0, 4**length, chunk_size):
+            yield length, start, min(start + chunk_size, 4**length)
+
+
+def get_buckets(keys: npt.NDArray[np.uint64], n_bucket_bits: int) -> npt.NDArray[np.int64]:
+    """Hash buckets of phenotype keys, from the top bits of the keys multiplied by a large odd number."""
+    if n_bucket_bits == 0:
+        return np.zeros(len(keys), dtype=np.int64)
+    return ((keys * _HASH_MULTIPLIER) >> np.uint64(64 - n_bucket_bits)).astype(np.int64)
+
+
+def get_destinations(
+    groups: npt.NDArray[np.int64], cursors: npt.NDArray[np.int64]
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Stable counting sort of a chunk into groups, returning the chunk's order and where each sorted element goes.
+
+    Each group is written from its cursor, and the cursors are moved past the chunk for the next one.
+    """
+    order = np.argsort(groups, kind="stable")
+    sorted_groups = groups[order]
+    counts = np.bincount(groups, minlength=len(cursors))
+    ranks = np.arange(len(groups)) - (np.cumsum(counts) - counts)[sorted_groups]
+    destinations = cursors[sorted_groups] + ranks
+    cursors += counts
+    return order, destinations
+
+
+def unpack_genes(keys: npt.NDArray[np.uint64]) -> list[bytes]:
+    """Amino acid codes of enzymes packed into keys. Enzymes have no zero codes, so leading zero digits are dropped."""
+    shifts = np.arange(60, -4, -4, dtype=np.uint64)
+    digits = ((keys[:, None] >> shifts) & np.uint64(15)).astype(np.uint8).tobytes()
+    return [digits[i : i + len(shifts)].lstrip(b"\x00") for i in range(0, len(digits), len(shifts))]
+
+
+def unpack_digits(key: int) -> bytes:
+    """Base 16 digits of a key, most significant first."""
+    return bytes.fromhex("".join(f"0{digit}" for digit in f"{key:x}")) if key > 0 else b""
+
+
+class Phenotyper:
+    """Computes the phenotype keys of every strand in a range of strands of one length with NumPy.
+
+    Strand `i` of length `n` has the bases of the `n` base 4 digits of `i`, so each duplet of every strand in a range
+    is a four bit field of the range's indexes. A translation is keyed by the codes of its enzymes written as base 16
+    digits, with a zero digit between enzymes. The function of a strand only depends on its largest enzyme, so it is
+    computed once per distinct largest enzyme and keyed by its bytes, leaving the caller to number them.
+    """
+
+    def __init__(self, kind: PhenotypeKind, apply_strand: Optional[Strand] = None, max_phenotypes: int = 1 << 20):
+        if kind == PhenotypeKind.FUNCTION and apply_strand is None:
+            msg = "A strand to apply enzymes to is required to map the function phenotype"
+            raise ValueError(msg)
+        self.kind = kind
+        self.apply_strand = apply_strand
+        self.max_phenotypes = max_phenotypes
+        self.phenotypes = None if apply_strand is None else PhenotypeCache(apply_strand)
+
+    def map_chunk(self, chunk: Chunk) -> tuple[npt.NDArray[np.uint64], Optional[list[bytes]]]:
+        """Phenotype keys of a range of strands, or indexes into a list of phenotypes for the function phenotype."""
+        length, start, stop = chunk
+        indexes = np.arange(start, stop, dtype=np.uint64)
+        if self.kind == PhenotypeKind.TRANSLATION:
+            return self.get_translation_keys(indexes, length), None
+
+        gene_keys = self.get_largest_gene_keys(indexes, length)
+        unique_keys, inverse = np.unique(gene_keys, return_inverse=True)
+        return inverse.astype(np.uint64), self.get_functions(unpack_genes(unique_keys))
+
+    @classmethod
+    def iter_duplet_codes(cls, indexes: npt.NDArray[np.uint64], length: int) -> Iterator[npt.NDArray[np.uint64]]:
+        for duplet in range(length // 2):
+            yield (indexes >> np.uint64(2 * length - 4 - 4 * duplet)) & np.uint64(15)
+
+    @classmethod
+    def get_translation_keys(cls, indexes: npt.NDArray[np.uint64], length: int) -> npt.NDArray[np.uint64]:
+        keys = np.zeros(len(indexes), dtype=np.uint64)
+        in_gap = np.zeros(len(indexes), dtype=bool)
+        for codes in cls.iter_duplet_codes(indexes, length):
+            coding = codes != 0
+            shifted = np.where(in_gap, keys << np.uint64(8), keys << np.uint64(4))
+            keys = np.where(coding, shifted | codes, keys)
+            in_gap = ~coding & (keys != 0)
+        return keys
+
+    @classmethod
+    def get_largest_gene_keys(cls, indexes: npt.NDArray[np.uint64], length: int) -> npt.NDArray[np.uint64]:
+        """Codes of the first of the longest enzymes of each strand, as in `Search.get_largest_program`."""
+        run_keys = np.zeros(len(indexes), dtype=np.uint64)
+        run_lengths = np.zeros(len(indexes), dtype=np.int64)
+        largest_keys = np.zeros(len(indexes), dtype=np.uint64)
+        largest_lengths = np.zeros(len(indexes), dtype=np.int64)
+        for codes in cls.iter_duplet_codes(indexes, length):
+            coding = codes != 0
+            run_keys = np.where(coding, (run_keys << np.uint64(4)) | codes, np.uint64(0))
+            run_lengths = np.where(coding, run_lengths + 1, 0)
+            longer = run_lengths > largest_lengths
+            largest_keys = np.where(longer, run_keys, largest_keys)
+            largest_lengths = np.where(longer, run_lengths, largest_lengths)
+        return largest_keys
+
+    def get_functions(self, genes: list[bytes]) -> list[bytes]:
+        """Codes of the longest strand each enzyme produces, or no codes if there is no enzyme or no strand."""
+        if self.phenotypes is None:
+            return [b""] * len(genes)
+        if len(self.phenotypes) >= self.max_phenotypes:
+            self.phenotypes = PhenotypeCache(self.phenotypes.apply_strand)
+        functions = []
+        for program in Compiler.compile_codes_batch(genes):
+            phenotype = self.phenotypes.get(program) if len(program) > 0 else None
+            functions.append(b"" if phenotype is None else phenotype.codes)
+        return functions
+
+
+# Per-process phenotyper of map workers, set up by the pool initializer
+_phenotypers: dict[str, Phenotyper] = {}
+
+
+def _init_phenotyper(kind: PhenotypeKind, apply_strand: Optional[Strand]) -> None:
+    _phenotypers["gpmap"] = Phenotyper(kind, apply_strand)
+
+
+def _map_chunk(chunk: Chunk) -> tuple[npt.NDArray[np.uint64], Optional[list[bytes]]]:
+    return _phenotypers["gpmap"].map_chunk(chunk)
+
+
+class GenotypePhenotypeMap:
+    """The phenotype of every strand of 1 to `max_length` bases, stored on disk and indexed by phenotype.
+
+    The map is a directory of flat arrays that are memory mapped rather than loaded:
+
+    - `genotype_keys.u64`: the phenotype key of each genotype ID
+    - `phenotype_keys.u64`: the distinct phenotype keys, whose positions are phenotype IDs
+    - `offsets.u64`: where the genotypes of each phenotype start in `genotype_ids`
+    - `genotype_ids.u32` or `genotype_ids.u64`: genotype IDs grouped by phenotype, in increasing order
+    - `bucket_offsets.u64`: where each hash bucket of phenotype keys starts in `phenotype_keys`
+
+    Translation keys are the packed enzymes themselves. Function keys are positions in `phenotypes.bin`, which holds
+    the codes of each distinct longest strand, with no codes for strands that produce nothing.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.manifest = self.load_manifest(path)
+        if not self.manifest["complete"]:
+            msg = f"Genotype-phenotype map {path} has not been finished, build it again with resume"
+            raise ValueError(msg)
+        self.kind = PhenotypeKind(self.manifest["kind"])
+        self.max_length: int = self.manifest["max_length"]
+        self.genotype_keys = np.memmap(path / "genotype_keys.u64", dtype=np.uint64, mode="r")
+        self.phenotype_keys = self._load_array("phenotype_keys.u64", np.uint64)
+        self.offsets = self._load_array("offsets.u64", np.uint64)
+        self.genotype_ids = self._load_array(self.manifest["genotype_ids_file"], np.dtype(self.manifest["id_dtype"]))
+        self.bucket_offsets = np.fromfile(path / "bucket_offsets.u64", dtype=np.uint64)
+        self.n_bucket_bits = (len(self.bucket_offsets) - 1).bit_length() - 1
+        self.functions = list(self.read_phenotypes(path, self.manifest["phenotypes_size"]))
+
+    def _load_array(self, name: str, dtype: npt.DTypeLike) -> npt.NDArray[Any]:
+        # Memory mapping an empty file is not supported
+        if (self.path / name).stat().st_size == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self.path / name, dtype=dtype, mode="r")
+
+    @classmethod
+    def build(  # noqa: PLR0913
+        cls,
+        path: Path,
+        max_length: int,
+        kind: PhenotypeKind = PhenotypeKind.FUNCTION,
+        apply_strand: Optional[Strand] = None,
+        chunk_size: int = 1 << 20,
+        n_workers: int = 1,
+        resume: bool = False,
+    ) -> "GenotypePhenotypeMap":
+        """Map every strand of 1 to `max_length` bases to its phenotype and index the map by phenotype.
+
+        Strands are enumerated in chunks of `chunk_size` consecutive genotype IDs, and chunks are mapped across
+        `n_workers` processes. Progress is saved after every chunk, so with `resume` an interrupted build continues
+        from the last chunk it finished.
+        """
+        if not 1 <= max_length <= MAX_LENGTH:
+            msg = f"Maximum strand length must be between 1 and {MAX_LENGTH}, got {max_length}"
+            raise ValueError(msg)
+
+        n_genotypes = get_genotype_offset(max_length + 1)
+        manifest = {
+            "version": VERSION,
+            "kind": kind,
+            "max_length": max_length,
+            "apply_strand": None if apply_strand is None else str(apply_strand),
+            "chunk_size": chunk_size,
+            "n_genotypes": n_genotypes,
+            "n_chunks_done": 0,
+            "phenotypes_size": 0,
+            "complete": False,
+        }
+        if resume and (path / "manifest.json").exists():
+            saved = cls.load_manifest(path)
+            changed = [
+                name for name in ("kind", "max_length", "apply_strand", "chunk_size") if saved[name] != manifest[name]
+            ]
+            if len(changed) > 0:
+                msg = f"Cannot resume {path}, it was built with different {', '.join(changed)}"
+                raise ValueError(msg)
+            manifest = saved
+            logger.info("Resuming from chunk %d", manifest["n_chunks_done"])
+        else:
+            path.mkdir(parents=True, exist_ok=True)
+            (path / "phenotypes.bin").write_bytes(b"")
+
+        if not manifest["complete"]:
+            cls.map_genotypes(path, manifest, Phenotyper(kind, apply_strand), n_workers)
+            cls.index_phenotypes(path, manifest, chunk_size)
+        return cls(path)
+
+    @classmethod
+    def map_genotypes(cls, path: Path, manifest: dict[str, Any], phenotyper: Phenotyper, n_workers: int) -> None:
+        """Write the phenotype key of every genotype, saving the manifest after every chunk."""
+        genotype_keys = np.memmap(
+            path / "genotype_keys.u64",
+            dtype=np.uint64,
+            mode="r+" if manifest["n_chunks_done"] > 0 else "w+",
+            shape=manifest["n_genotypes"],
+        )
+        # Function keys number the distinct phenotypes in the order they are first found
+        with (path / "phenotypes.bin").open("r+b") as f:
+            f.truncate(manifest["phenotypes_size"])
+        functions = {
+            phenotype: key for key, phenotype in enumerate(cls.read_phenotypes(path, manifest["phenotypes_size"]))
+        }
+
+        chunks = list(iter_chunks(manifest["max_length"], manifest["chunk_size"]))[manifest["n_chunks_done"] :]
+        with (path / "phenotypes.bin").open("ab") as phenotypes_file:
+            for (length, start, stop), (values, phenotypes) in zip(
+                chunks, cls.iter_mapped_chunks(chunks, phenotyper, n_workers), strict=True
+            ):
+                keys = values
+                if phenotypes is not None:
+                    phenotype_keys = np.empty(len(phenotypes), dtype=np.uint64)
+                    for i, phenotype in enumerate(phenotypes):
+                        key = functions.get(phenotype)
+                        if key is None:
+                            key = functions[phenotype] = len(functions)
+                            phenotypes_file.write(struct.pack("<I", len(phenotype)) + phenotype)
+                        phenotype_keys[i] = key
+                    keys = phenotype_keys[values]
+
+                offset = get_genotype_offset(length)
+                genotype_keys[offset + start : offset + stop] = keys
+                genotype_keys.flush()
+                phenotypes_file.flush()
+                manifest["phenotypes_size"] = phenotypes_file.tell()
+                manifest["n_chunks_done"] += 1
+                cls.save_manifest(path, manifest)
+                logger.info("Mapped %d of %d genotypes", offset + stop, manifest["n_genotypes"])
+
+    @classmethod
+    def iter_mapped_chunks(
+        cls, chunks: list[Chunk], phenotyper: Phenotyper, n_workers: int
+    ) -> Iterator[tuple[npt.NDArray[np.uint64], Optional[list[bytes]]]]:
+        if n_workers <= 1:
+            yield from map(phenotyper.map_chunk, chunks)
+            return
+        with ProcessPoolExecutor(
+            n_workers, initializer=_init_phenotyper, initargs=(phenotyper.kind, phenotyper.apply_strand)
+        ) as executor:
+            yield from executor.map(_map_chunk, chunks)
+
+    @classmethod
+    def index_phenotypes(cls, path: Path, manifest: dict[str, Any], chunk_size: int) -> None:
+        """Group genotype IDs by phenotype without holding the whole map in memory.
+
+        Function keys are small consecutive integers, so genotypes are counting sorted by key straight into place.
+        Translation keys are first scattered into hash buckets with a counting sort over chunks of the map, then each
+        bucket is counting sorted by its distinct keys, again a chunk at a time, since a common phenotype can make one
+        bucket as large as the map. Phenotype IDs are therefore ordered by bucket, then key.
+        """
+        n_genotypes = manifest["n_genotypes"]
+        genotype_keys = np.memmap(path / "genotype_keys.u64", dtype=np.uint64, mode="r")
+        id_dtype = np.dtype(np.uint32 if n_genotypes < 1 << 32 else np.uint64)
+        genotype_ids_file = f"genotype_ids.{'u32' if id_dtype == np.uint32 else 'u64'}"
+        genotype_ids = np.memmap(path / genotype_ids_file, dtype=id_dtype, mode="w+", shape=n_genotypes)
+
+        phenotype_keys: list[npt.NDArray[np.uint64]] = []
+        offsets: list[npt.NDArray[np.int64]] = []
+        bucket_offsets = [0]
+        if manifest["kind"] == PhenotypeKind.FUNCTION:
+            keys, firsts = cls.sort_bucket(genotype_keys, None, genotype_ids, 0, n_genotypes, chunk_size)
+            phenotype_keys.append(keys)
+            offsets.append(firsts)
+            bucket_offsets.append(len(keys))
+        else:
+            n_bucket_bits = max(0, (n_genotypes // chunk_size).bit_length())
+            counts = np.zeros(1 << n_bucket_bits, dtype=np.int64)
+            for start in range(0, n_genotypes, chunk_size):
+                counts += np.bincount(
+                    get_buckets(genotype_keys[start : start + chunk_size], n_bucket_bits), minlength=len(counts)
+                )
+            bucket_starts = np.concatenate(([0], np.cumsum(counts)))
+
+            bucket_keys = np.memmap(path / "bucket_keys.tmp", dtype=np.uint64, mode="w+", shape=n_genotypes)
+            bucket_ids = np.memmap(path / "bucket_ids.tmp", dtype=id_dtype, mode="w+", shape=n_genotypes)
+            cursors = bucket_starts[:-1].copy()
+            for start in range(0, n_genotypes, chunk_size):
+                keys = np.asarray(genotype_keys[start : start + chunk_size])
+                order, destinations = get_destinations(get_buckets(keys, n_bucket_bits), cursors)
+                bucket_keys[destinations] = keys[order]
+                bucket_ids[destinations] = (start + order).astype(id_dtype)
+
+            for bucket_start, bucket_stop in zip(bucket_starts[:-1].tolist(), bucket_starts[1:].tolist(), strict=True):
+                keys, firsts = cls.sort_bucket(
+                    bucket_keys, bucket_ids, genotype_ids, bucket_start, bucket_stop, chunk_size
+                )
+                phenotype_keys.append(keys)
+                offsets.append(firsts)
+                bucket_offsets.append(bucket_offsets[-1] + len(keys))
+            del bucket_keys, bucket_ids
+            (path / "bucket_keys.tmp").unlink()
+            (path / "bucket_ids.tmp").unlink()
+        genotype_ids.flush()
+
+        np.concatenate(phenotype_keys).astype(np.uint64).tofile(path / "phenotype_keys.u64")
+        np.concatenate([*offsets, [n_genotypes]]).astype(np.uint64).tofile(path / "offsets.u64")
+        np.array(bucket_offsets, dtype=np.uint64).tofile(path / "bucket_offsets.u64")
+        manifest.update(
+            complete=True,
+            n_phenotypes=bucket_offsets[-1],
+            id_dtype=id_dtype.name,
+            genotype_ids_file=genotype_ids_file,
+        )
+        cls.save_manifest(path, manifest)
+        logger.info("Indexed %d genotypes by %d phenotypes", n_genotypes, bucket_offsets[-1])
+
+    @classmethod
+    def sort_bucket(  # noqa: PLR0913
+        cls,
+        keys: npt.NDArray[np.uint64],
+        ids: Optional[npt.NDArray[Any]],
+        genotype_ids: npt.NDArray[Any],
+        start: int,
+        stop: int,
+        chunk_size: int,
+    ) -> tuple[npt.NDArray[np.uint64], npt.NDArray[np.int64]]:
+        """Counting sort a range of genotype IDs by key into `genotype_ids`, reading the range a chunk at a time.
+
+        Without `ids` the genotype IDs are the positions of the keys. Returns the distinct keys and where the genotypes
+        of each start, so memory only grows with the number of distinct keys in the range.
+        """
+        chunks = [(chunk_start, min(chunk_start + chunk_size, stop)) for chunk_start in range(start, stop, chunk_size)]
+        distinct = np.zeros(0, dtype=np.uint64)
+        for chunk_start, chunk_stop in chunks:
+            distinct = np.union1d(distinct, np.asarray(keys[chunk_start:chunk_stop]))
+        if len(distinct) <= 1:
+            # One key needs no sorting, the genotypes are already in increasing order
+            genotype_ids[start:stop] = np.arange(start, stop) if ids is None else ids[start:stop]
+            return distinct, np.full(len(distinct), start, dtype=np.int64)
+
+        counts = np.zeros(len(distinct), dtype=np.int64)
+        for chunk_start, chunk_stop in chunks:
+            counts += np.bincount(np.searchsorted(distinct, keys[chunk_start:chunk_stop]), minlength=len(distinct))
+        firsts = start + np.concatenate(([0], np.cumsum(counts)[:-1]))
+        cursors = firsts.copy()
+        for chunk_start, chunk_stop in chunks:
+            order, destinations = get_destinations(np.searchsorted(distinct, keys[chunk_start:chunk_stop]), cursors)
+            chunk_ids = np.arange(chunk_start, chunk_stop) if ids is None else np.asarray(ids[chunk_start:chunk_stop])
+            genotype_ids[destinations] = chunk_ids[order]
+        return distinct, firsts
+
+    @classmethod
+    def load_manifest(cls, path: Path) -> dict[str, Any]:
+        manifest: dict[str, Any] = json.loads((path / "manifest.json").read_text())
+        if manifest["version"] != VERSION:
+            msg = f"Unsupported genotype-phenotype map version {manifest['version']} in {path}"
+            raise ValueError(msg)
+        return manifest
+
+    @classmethod
+    def save_manifest(cls, path: Path, manifest: dict[str, Any]) -> None:
+        tmp_path = path / "manifest.json.tmp"
+        with tmp_path.open("w") as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path.replace(path / "manifest.json")
+
+    @classmethod
+    def read_phenotypes(cls, path: Path, size: int) -> Iterable[bytes]:
+        data = (path / "phenotypes.bin").read_bytes()[:size]
+        position = 0
+        while position < len(data):
+            (length,) = struct.unpack_from("<I", data, position)
+            yield data[position + 4 : position + 4 + length]
+            position += 4 + length
+
+    @property
+    def n_phenotypes(self) -> int:
+        return len(self.phenotype_keys)
+
+    def __len__(self) -> int:
+        return len(self.genotype_keys)
+
+    def get_key(self, strand: Strand) -> int:
+        return int(self.genotype_keys[get_genotype_id(strand)])
+
+    def find_phenotype_id(self, key: int) -> Optional[int]:
+        """Phenotype ID of a phenotype key, or None if no strand has the phenotype."""
+        bucket = int(get_buckets(np.array([key], dtype=np.uint64), self.n_bucket_bits)[0])
+        lo, hi = int(self.bucket_offsets[bucket]), int(self.bucket_offsets[bucket + 1])
+        position = lo + int(np.searchsorted(self.phenotype_keys[lo:hi], np.uint64(key)))
+        if position < hi and int(self.phenotype_keys[position]) == key:
+            return position
+        return None
+
+    def get_phenotype_id(self, strand: Strand) -> int:
+        phenotype_id = self.find_phenotype_id(self.get_key(strand))
+        assert phenotype_id is not None
+        return phenotype_id
+
+    def get_genotype_ids(self, phenotype_id: int) -> npt.NDArray[Any]:
+        return self.genotype_ids[int(self.offsets[phenotype_id]) : int(self.offsets[phenotype_id + 1])]
+
+    def get_strands(self, phenotype_id: int) -> list[Strand]:
+        return [get_strand(genotype_id) for genotype_id in self.get_genotype_ids(phenotype_id).tolist()]
+
+    def get_function(self, key: int) -> Optional[Strand]:
+        """Longest strand produced for a function key, or None if no strand is produced."""
+        codes = self.functions[key]
+        return Strand.from_codes(codes) if len(codes) > 0 else None
+
+    @classmethod
+    def get_translation(cls, key: int) -> list[bytes]:
+        """Amino acid codes of each enzyme for a translation key."""
+        return [codes for codes in unpack_digits(key).split(b"\x00") if len(codes) > 0]
@@ -0,0 +1,361 @@
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from typogenetics.gpmap import MAX_LENGTH, GenotypePhenotypeMap, get_genotype_offset
+
+logger = logging.getLogger(__name__)
+
+# Genotype ID of the first strand of each length
+_OFFSETS = np.array([get_genotype_offset(length) for length in range(1, MAX_LENGTH + 1)], dtype=np.uint64)
+
+
+def get_lengths(genotype_ids: npt.NDArray[np.uint64]) -> npt.NDArray[np.int64]:
+    lengths: npt.NDArray[np.int64] = np.searchsorted(_OFFSETS, genotype_ids, side="right").astype(np.int64)
+    return lengths
+
+
+class UnionFind:
+    """Disjoint sets of the integers 0 to n - 1, merged many pairs at a time.
+
+    Each round hooks the larger root of every pair onto the smaller one, so conflicting hooks onto the same root are
+    resolved by taking the minimum and retried in the next round. Finding roots compresses the paths it follows.
+    """
+
+    def __init__(self, n: int) -> None:
+        self.parents = np.arange(n, dtype=np.int64)
+
+    def find(self, nodes: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+        roots = self.parents[nodes]
+        while True:
+            grandparents = self.parents[roots]
+            if np.array_equal(grandparents, roots):
+                break
+            roots = grandparents
+        self.parents[nodes] = roots
+        return roots
+
+    def union(self, a: npt.NDArray[np.int64], b: npt.NDArray[np.int64]) -> None:
+        while len(a) > 0:
+            roots_a, roots_b = self.find(a), self.find(b)
+            separate = roots_a != roots_b
+            a, b, roots_a, roots_b = a[separate], b[separate], roots_a[separate], roots_b[separate]
+            np.minimum.at(self.parents, np.maximum(roots_a, roots_b), np.minimum(roots_a, roots_b))
+
+    def get_labels(self) -> npt.NDArray[np.int64]:
+        """Root of every integer, which is the smallest integer of its set."""
+        return self.find(np.arange(len(self.parents), dtype=np.int64))
+
+
+@dataclass(frozen=True)
+class PhenotypeNetwork:
+    """The neutral network of one phenotype."""
+
+    phenotype: int
+    n_genotypes: int
+    n_components: int
+    largest_component: int
+    # Diameter of the largest component, which is only a lower bound when it is not exact
+    diameter: int
+    exact: bool
+
+
+class NeutralNetwork:
+    """Strands connected by edits, as made by `Editor`, that keep their phenotype.
+
+    Nodes are genotype IDs, as numbered by `GenotypePhenotypeMap`, and edges are found with sorted joins rather than by
+    comparing strands pairwise. Strands one mutation apart have the same key once the mutated base is masked out, and
+    deleting a base from a strand gives the ID of a strand one base shorter. Strands are processed in batches of whole
+    phenotypes, and within a batch one length at a time, so only strands that could be neighbors are ever sorted
+    together. With a `path` the edges are appended to a file and memory mapped instead of being kept in memory.
+    """
+
+    def __init__(
+        self,
+        nodes: npt.NDArray[np.uint64],
+        phenotypes: npt.NDArray[np.uint64],
+        edges: npt.NDArray[np.int64],
+        labels: npt.NDArray[np.int64],
+    ) -> None:
+        self.nodes = nodes
+        self.phenotypes = phenotypes
+        self.edges = edges
+        self.labels = labels
+        self._adjacency: Optional[tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]] = None
+        self._distances: Optional[npt.NDArray[np.int32]] = None
+
+    @classmethod
+    def build(
+        cls,
+        genotype_ids: npt.NDArray[np.uint64],
+        phenotype_keys: npt.NDArray[np.uint64],
+        batch_size: int = 1 << 22,
+        path: Optional[Path] = None,
+    ) -> "NeutralNetwork":
+        """Build the network of distinct genotypes with the given phenotype keys."""
+        order = np.argsort(genotype_ids, kind="stable")
+        nodes = np.asarray(genotype_ids, dtype=np.uint64)[order]
+        phenotypes = np.asarray(phenotype_keys, dtype=np.uint64)[order]
+        if np.any(nodes[1:] == nodes[:-1]):
+            msg = "Genotype IDs must be distinct"
+            raise ValueError(msg)
+
+        by_phenotype = np.argsort(phenotypes, kind="stable")
+        sorted_phenotypes = phenotypes[by_phenotype]
+        bounds = np.flatnonzero(np.concatenate(([True], sorted_phenotypes[1:] != sorted_phenotypes[:-1], [True])))
+
+        def iter_batches() -> Iterator[tuple[npt.NDArray[np.uint64], npt.NDArray[np.uint64]]]:
+            for start, stop in cls.iter_batch_bounds(bounds, batch_size):
+                yield sorted_phenotypes[start:stop], nodes[by_phenotype[start:stop]]
+
+        return cls.from_batches(nodes, phenotypes, iter_batches(), path=path)
+
+    @classmethod
+    def from_map(
+        cls, genotype_map: GenotypePhenotypeMap, batch_size: int = 1 << 22, path: Optional[Path] = None
+    ) -> "NeutralNetwork":
+        """Build the network of every strand of a genotype-phenotype map, reading one batch of phenotypes at a time."""
+        offsets = genotype_map.offsets.astype(np.int64)
+
+        def iter_batches() -> Iterator[tuple[npt.NDArray[np.uint64], npt.NDArray[np.uint64]]]:
+            for first, last in cls.iter_batch_bounds(offsets, batch_size):
+                first_phenotype = int(np.searchsorted(offsets, first))
+                last_phenotype = int(np.searchsorted(offsets, last))
+                counts = np.diff(offsets[first_phenotype : last_phenotype + 1])
+                phenotypes = np.repeat(genotype_map.phenotype_keys[first_phenotype:last_phenotype], counts)
+                yield phenotypes, np.asarray(genotype_map.genotype_ids[first:last], dtype=np.uint64)
+
+        nodes = np.arange(len(genotype_map), dtype=np.uint64)
+        return cls.from_batches(nodes, genotype_map.genotype_keys, iter_batches(), path=path)
+
+    @classmethod
+    def iter_batch_bounds(cls, bounds: npt.NDArray[np.int64], batch_size: int) -> Iterator[tuple[int, int]]:
+        """Ranges of whole groups, given the bounds between groups, of about `batch_size` elements each."""
+        start_bound = 0
+        while start_bound < len(bounds) - 1:
+            start = int(bounds[start_bound])
+            # Always take at least one group, however large it is
+            stop_bound = max(int(np.searchsorted(bounds, start + batch_size, side="right")) - 1, start_bound + 1)
+            yield start, int(bounds[stop_bound])
+            start_bound = stop_bound
+
+    @classmethod
+    def from_batches(
+        cls,
+        nodes: npt.NDArray[np.uint64],
+        phenotypes: npt.NDArray[np.uint64],
+        batches: Iterator[tuple[npt.NDArray[np.uint64], npt.NDArray[np.uint64]]],
+        path: Optional[Path] = None,
+    ) -> "NeutralNetwork":
+        union_find = UnionFind(len(nodes))
+        edge_chunks: list[npt.NDArray[np.int64]] = []
+        n_edges = 0
+        edge_file = None if path is None else path.open("wb")
+        try:
+            for batch_phenotypes, batch_ids in batches:
+                for id_pairs in cls.iter_edges(batch_phenotypes, batch_ids):
+                    edges = np.searchsorted(nodes, id_pairs).astype(np.int64)
+                    union_find.union(edges[:, 0], edges[:, 1])
+                    n_edges += len(edges)
+                    if edge_file is None:
+                        edge_chunks.append(edges)
+                    else:
+                        edge_file.write(edges.tobytes())
+        finally:
+            if edge_file is not None:
+                edge_file.close()
+
+        if path is None:
+            edges = np.concatenate(edge_chunks) if len(edge_chunks) > 0 else np.zeros((0, 2), dtype=np.int64)
+        elif n_edges == 0:
+            edges = np.zeros((0, 2), dtype=np.int64)
+        else:
+            edges = np.memmap(path, dtype=np.int64, mode="r", shape=(n_edges, 2))
+        logger.info("Found %d edges between %d genotypes", n_edges, len(nodes))
+        return cls(nodes, np.asarray(phenotypes), edges, union_find.get_labels())
+
+    @classmethod
+    def iter_edges(
+        cls, phenotypes: npt.NDArray[np.uint64], genotype_ids: npt.NDArray[np.uint64]
+    ) -> Iterator[npt.NDArray[np.uint64]]:
+        """Pairs of genotype IDs one edit apart with the same phenotype, each pair once."""
+        lengths = get_lengths(genotype_ids)
+        indexes = genotype_ids - _OFFSETS[lengths - 1]
+        for length in np.unique(lengths).tolist():
+            selected = lengths == length
+            length_phenotypes, length_indexes = phenotypes[selected], indexes[selected]
+            length_ids = genotype_ids[selected]
+            for unit in range(length):
+                yield cls.join_mutations(length_phenotypes, length_indexes, length_ids, 2 * (length - 1 - unit))
+
+            longer = lengths == length + 1
+            if np.any(longer):
+                for unit in range(length + 1):
+                    yield cls.join_deletions(
+                        length_phenotypes,
+                        length_ids,
+                        phenotypes[longer],
+                        indexes[longer],
+                        genotype_ids[longer],
+                        length,
+                        unit,
+                    )
+
+    @classmethod
+    def join_mutations(
+        cls,
+        phenotypes: npt.NDArray[np.uint64],
+        indexes: npt.NDArray[np.uint64],
+        genotype_ids: npt.NDArray[np.uint64],
+        shift: int,
+    ) -> npt.NDArray[np.uint64]:
+        """Pairs of strands of one length that only differ in the base at a bit shift, found by masking the base."""
+        masked = indexes & ~(np.uint64(3) << np.uint64(shift))
+        order = np.lexsort((masked, phenotypes))
+        masked, phenotypes, genotype_ids = masked[order], phenotypes[order], genotype_ids[order]
+        pairs = []
+        # A masked key is shared by at most the four strands with each base at the masked unit
+        for distance in range(1, 4):
+            same = (masked[distance:] == masked[:-distance]) & (phenotypes[distance:] == phenotypes[:-distance])
+            pairs.append(np.stack((genotype_ids[:-distance][same], genotype_ids[distance:][same]), axis=1))
+        return np.concatenate(pairs)
+
+    @classmethod
+    def join_deletions(  # noqa: PLR0913
+        cls,
+        phenotypes: npt.NDArray[np.uint64],
+        genotype_ids: npt.NDArray[np.uint64],
+        longer_phenotypes: npt.NDArray[np.uint64],
+        longer_indexes: npt.NDArray[np.uint64],
+        longer_ids: npt.NDArray[np.uint64],
+        length: int,
+        unit: int,
+    ) -> npt.NDArray[np.uint64]:
+        """Pairs of a strand one base longer than `length` and the strand left by deleting the base at a unit."""
+        n_low_bits = np.uint64(2 * (length - unit))
+        base = (longer_indexes >> n_low_bits) & np.uint64(3)
+        # Deleting any base of a run leaves the same strand, so only the first base of each run is deleted
+        keep = np.ones(len(longer_indexes), dtype=bool)
+        if unit > 0:
+            keep = base != ((longer_indexes >> (n_low_bits + np.uint64(2))) & np.uint64(3))
+        low = longer_indexes & ((np.uint64(1) << n_low_bits) - np.uint64(1))
+        high = longer_indexes >> (n_low_bits + np.uint64(2))
+        deleted_ids = ((high << n_low_bits) | low) + np.uint64(get_genotype_offset(length))
+
+        if len(genotype_ids) == 0:
+            return np.zeros((0, 2), dtype=np.uint64)
+        order = np.argsort(genotype_ids)
+        sorted_ids = genotype_ids[order]
+        positions = np.minimum(np.searchsorted(sorted_ids, deleted_ids), len(sorted_ids) - 1)
+        found = keep & (sorted_ids[positions] == deleted_ids)
+        found &= phenotypes[order][positions] == longer_phenotypes
+        return np.stack((longer_ids[found], deleted_ids[found]), axis=1)
+
+    @property
+    def n_components(self) -> int:
+        return int(np.count_nonzero(self.labels == np.arange(len(self.labels))))
+
+    def get_adjacency(self) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """Neighbors of every node in compressed sparse row form."""
+        if self._adjacency is None:
+            sources = np.concatenate((self.edges[:, 0], self.edges[:, 1]))
+            targets = np.concatenate((self.edges[:, 1], self.edges[:, 0]))
+            order = np.argsort(sources, kind="stable")
+            indptr = np.concatenate(([0], np.cumsum(np.bincount(sources, minlength=len(self.nodes)))))
+            self._adjacency = indptr.astype(np.int64), targets[order]
+        return self._adjacency
+
+    def search(self, sources: npt.NDArray[np.int64]) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int32]]:
+        """Nodes reached by a breadth-first search from each source, and their distances from the source.
+
+        Sources must be in distinct components, so that every component is searched at the same time.
+        """
+        indptr, neighbors = self.get_adjacency()
+        if self._distances is None:
+            self._distances = np.full(len(self.nodes), -1, dtype=np.int32)
+        distances = self._distances
+        frontier = np.asarray(sources, dtype=np.int64)
+        distances[frontier] = 0
+        reached, reached_distances = [frontier], [np.zeros(len(frontier), dtype=np.int32)]
+        distance = 0
+        while len(frontier) > 0:
+            starts, counts = indptr[frontier], indptr[frontier + 1] - indptr[frontier]
+            positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            candidates = neighbors[positions]
+            frontier = np.unique(candidates[distances[candidates] < 0])
+            distance += 1
+            distances[frontier] = distance
+            reached.append(frontier)
+            reached_distances.append(np.full(len(frontier), distance, dtype=np.int32))
+        nodes = np.concatenate(reached)
+        # Only the reached nodes are reset, so searching small components does not touch the whole network
+        distances[nodes] = -1
+        return nodes, np.concatenate(reached_distances)
+
+    def get_diameters(self, exact_limit: int = 256) -> tuple[npt.NDArray[np.int32], npt.NDArray[np.bool_]]:
+        """Diameter of every component, indexed by its label, and whether it is exact.
+
+        Components of up to `exact_limit` nodes are searched from every node. Larger components are searched twice,
+        from the node and then from the node farthest from it, which gives a lower bound that is exact for trees.
+        """
+        order = np.argsort(self.labels, kind="stable")
+        labels = self.labels[order]
+        starts = np.flatnonzero(np.concatenate(([True], labels[1:] != labels[:-1])))
+        sizes = np.diff(np.append(starts, len(order)))
+        roots = labels[starts]
+        diameters = np.zeros(len(self.nodes), dtype=np.int32)
+        exact = np.zeros(len(self.nodes), dtype=bool)
+
+        small = sizes <= exact_limit
+        exact[roots[small]] = True
+        # Every round searches from the next node of every small component that has one
+        for rank in range(1, int(sizes[small].max(initial=0))):
+            nodes, distances = self.search(order[starts[small & (sizes > rank)] + rank])
+            np.maximum.at(diameters, self.labels[nodes], distances)
+
+        if np.any(~small):
+            nodes, distances = self.search(roots[~small])
+            by_distance = np.lexsort((distances, self.labels[nodes]))
+            last = np.flatnonzero(np.diff(np.append(self.labels[nodes][by_distance], -1)) != 0)
+            nodes, distances = self.search(nodes[by_distance[last]])
+            np.maximum.at(diameters, self.labels[nodes], distances)
+        return diameters, exact
+
+    def summarize(self, exact_limit: int = 256) -> list[PhenotypeNetwork]:
+        """Components of the network of every phenotype, with the diameter of each phenotype's largest component."""
+        order = np.lexsort((self.labels, self.phenotypes))
+        phenotypes, labels = self.phenotypes[order], self.labels[order]
+        new_phenotype = np.concatenate(([True], phenotypes[1:] != phenotypes[:-1]))
+        new_component = new_phenotype | np.concatenate(([True], labels[1:] != labels[:-1]))
+        component_starts = np.flatnonzero(new_component)
+        component_sizes = np.diff(np.append(component_starts, len(order)))
+        component_phenotypes = np.cumsum(new_phenotype)[component_starts] - 1
+
+        diameters, exact = self.get_diameters(exact_limit=exact_limit)
+        summaries = []
+        phenotype_starts = np.flatnonzero(np.concatenate(([True], np.diff(component_phenotypes) != 0)))
+        phenotype_stops = np.append(phenotype_starts[1:], len(component_starts))
+        for first, last in zip(phenotype_starts.tolist(), phenotype_stops.tolist(), strict=True):
+            largest = first + int(np.argmax(component_sizes[first:last]))
+            label = int(labels[component_starts[largest]])
+            summaries.append(
+                PhenotypeNetwork(
+                    phenotype=int(phenotypes[component_starts[first]]),
+                    n_genotypes=int(component_sizes[first:last].sum()),
+                    n_components=last - first,
+                    largest_component=int(component_sizes[largest]),
+                    diameter=int(diameters[label]),
+                    exact=bool(exact[label]),
+                )
+            )
+        return summaries
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def describe(self) -> dict[str, Any]:
+        return {"n_genotypes": len(self), "n_edges": len(self.edges), "n_components": self.n_components}
@@ -0,0 +1,272 @@
+import logging
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from numpy.random import Generator, SeedSequence
+
+from typogenetics.cache import RewriteCache
+from typogenetics.dedup import Deduplicator
+from typogenetics.engine import Compiler, Engine, Program
+from typogenetics.population import Population
+from typogenetics.search import Candidate, EditMode, Search, Validator
+from typogenetics.shared import DEFAULT_MAX_BASES, DEFAULT_MAX_STRANDS, PopulationFullError, SharedPopulation
+from typogenetics.sink import Sink
+from typogenetics.stats import Stats
+from typogenetics.typogenetics import Strand, Translator
+
+logger = logging.getLogger(__name__)
+
+# Per-process state of bfs validation workers, set up by the pool initializer
+_validators: dict[str, Validator] = {}
+
+
+def _random_worker(
+    conn: Connection,
+    seed_sequence: SeedSequence,
+    init_strand: Strand,
+    sample_pool: bool,
+    cache_bytes: Optional[int],
+) -> None:
+    """Run epochs of random search on a local population until told to stop.
+
+    Each message from the parent holds the strands other workers discovered since the last epoch and the number of
+    iterations to run. The reply holds the strands this worker discovered during the epoch.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    population = Population([init_strand])
+    cache = None if cache_bytes is None else RewriteCache(cache_bytes)
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        new_strands, n_iterations = message
+        population.extend(new_strands)
+        n_known = len(population)
+        Search.iterate_random(population, n_iterations, rng, sample_pool=sample_pool, cache=cache)
+        conn.send(population.strands[n_known:])
+    conn.close()
+
+
+def _shared_random_worker(population: SharedPopulation, seed_sequence: SeedSequence, n_iterations: int) -> None:
+    """Run random search on a shared population, compiling the enzymes of each sampled strand once per process."""
+    rng = np.random.default_rng(seed_sequence)
+    programs: dict[int, list[Program]] = {}
+    for iteration in range(n_iterations):
+        index = int(rng.integers(0, len(population)))
+        strand_programs = programs.get(index)
+        if strand_programs is None:
+            strand_programs = [Compiler.compile_codes(codes) for codes in Translator.translate_codes(population[index])]
+            programs[index] = strand_programs
+        if len(strand_programs) == 0:
+            continue
+        program = strand_programs[rng.integers(0, len(strand_programs))]
+        rewrite_strand = population.sample_strand(rng)
+        try:
+            for strand in Engine.rewrite(program, rewrite_strand):
+                population.add(strand)
+        except PopulationFullError:
+            # The strands found so far are already in the population, so the run can still finish with them
+            logger.warning("Shared population is full, stopping a worker after %d iterations", iteration)
+            break
+    population.close()
+
+
+def _init_validator(apply_strand: Strand, target_strand: Strand) -> None:
+    _validators["bfs"] = Validator(apply_strand, target_strand)
+
+
+def _validate_chunk(candidates: list[Candidate]) -> list[Optional[bytes]]:
+    return _validators["bfs"].validate_many(candidates)
+
+
+class ParallelSearch:
+    @classmethod
+    def random(  # noqa: PLR0913
+        cls,
+        init_strand: Strand,
+        n_iterations: int,
+        n_workers: int,
+        seed: Optional[int] = None,
+        sync_interval: int = 10_000,
+        print_strands: bool = False,
+        sample_pool: bool = False,
+        cache_bytes: Optional[int] = None,
+        seen: Optional[Deduplicator] = None,
+        sink: Optional[Sink] = None,
+        stats: Optional[Stats] = None,
+    ) -> Population:
+        """Run `Search.random` across a pool of worker processes that share discoveries every `sync_interval`.
+
+        Each worker gets its own random stream spawned from `seed`, runs its share of the iterations on a local copy of
+        the population, and after every epoch the strands each worker discovered are merged into the global population
+        in worker order and sent to every worker. For a given seed, worker count and sync interval, the result is the
+        same on every run. A `seen` deduplicator only bounds the memory of the global population in this process, and
+        strands are streamed to a `sink` with the number of iterations run by the end of the epoch they were merged in.
+        Work happens in the workers, so `stats` only samples the growth of the population after every epoch.
+        """
+        seed_sequences = SeedSequence(seed).spawn(n_workers)
+        remaining = [n_iterations // n_workers + (i < n_iterations % n_workers) for i in range(n_workers)]
+        population = Population([init_strand], seen=seen)
+        if sink is not None:
+            sink.write(init_strand, 0)
+
+        connections: list[Connection] = []
+        processes: list[mp.Process] = []
+        for seed_sequence in seed_sequences:
+            parent_conn, child_conn = mp.Pipe()
+            process = mp.Process(
+                target=_random_worker,
+                args=(child_conn, seed_sequence, init_strand, sample_pool, cache_bytes),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            connections.append(parent_conn)
+            processes.append(process)
+
+        try:
+            n_synced = len(population)
+            n_epochs = 0
+            while any(n > 0 for n in remaining):
+                new_strands = population.strands[n_synced:]
+                n_synced = len(population)
+                for i, conn in enumerate(connections):
+                    n_epoch_iterations = min(sync_interval, remaining[i])
+                    remaining[i] -= n_epoch_iterations
+                    conn.send((new_strands, n_epoch_iterations))
+                for conn in connections:
+                    population.extend(conn.recv())
+                n_done = n_iterations - sum(remaining)
+                if sink is not None:
+                    for strand in population.strands[n_synced:]:
+                        sink.write(strand, n_done)
+                if stats is not None:
+                    stats.counters["iterations"] = n_done
+                    stats.sample(iteration=n_done, n_strands=len(population))
+                n_epochs += 1
+                logger.debug("Population has %d strands after epoch %d", len(population), n_epochs)
+        finally:
+            for conn in connections:
+                with suppress(OSError):
+                    conn.send(None)
+                conn.close()
+            for process in processes:
+                process.join()
+
+        if sink is not None:
+            sink.flush()
+        Search.log_population(population, n_iterations, print_strands=print_strands)
+        return population
+
+    @classmethod
+    def bfs(  # noqa: PLR0913
+        cls,
+        init_strand: Strand,
+        apply_strand: Strand,
+        target_depth: int,
+        n_edits: int,
+        rng: Generator,
+        n_workers: int,
+        chunk_size: int = 1_000,
+        print_strands: bool = False,
+        seen: Optional[Deduplicator] = None,
+        checkpoint_path: Optional[Path] = None,
+        resume: bool = False,
+        sink: Optional[Sink] = None,
+        stats: Optional[Stats] = None,
+        edit_mode: EditMode = EditMode.RANDOM,
+    ) -> list[Strand]:
+        """Run `Search.bfs`, validating the edits of each level in chunks across a pool of worker processes.
+
+        Edits are drawn and deduplicated in the parent exactly as in the serial search, so for a given seed the valid
+        strands are identical. Each worker keeps its own phenotype cache for the lifetime of the pool, and `stats` only
+        measures the work done in this process.
+        """
+        target = Search.get_bfs_target(init_strand, apply_strand)
+        if target is None:
+            return []
+        target_strand, init_opcodes = target
+
+        with ProcessPoolExecutor(
+            n_workers,
+            initializer=_init_validator,
+            initargs=(apply_strand, target_strand),
+        ) as executor:
+
+            def validate_many(candidates: list[Candidate]) -> list[Optional[bytes]]:
+                chunks = [candidates[i : i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+                return [opcodes for chunk in executor.map(_validate_chunk, chunks) for opcodes in chunk]
+
+            valid_strands = Search.bfs_levels(
+                init_strand,
+                init_opcodes,
+                target_depth,
+                n_edits,
+                rng,
+                validate_many,
+                seen=seen,
+                checkpoint_path=checkpoint_path,
+                resume=resume,
+                sink=sink,
+                stats=stats,
+                edit_mode=edit_mode,
+            )
+
+        Search.log_valid_strands(valid_strands, target_depth, n_edits, print_strands=print_strands, edit_mode=edit_mode)
+        return valid_strands
+
+    @classmethod
+    def random_shared(  # noqa: PLR0913
+        cls,
+        init_strand: Strand,
+        n_iterations: int,
+        n_workers: int,
+        seed: Optional[int] = None,
+        max_strands: int = DEFAULT_MAX_STRANDS,
+        max_bases: int = DEFAULT_MAX_BASES,
+        print_strands: bool = False,
+        sink: Optional[Sink] = None,
+    ) -> list[Strand]:
+        """Run random search with every worker sampling from and appending to one population in shared memory.
+
+        Unlike `ParallelSearch.random`, workers see each other's discoveries immediately and the population is held in
+        memory once, but the order in which workers append strands depends on scheduling, so runs are not reproducible.
+        The shared population does not record when strands were found, so they are all sent to a `sink` at the end.
+        Workers stop early once the population is full.
+        """
+        seed_sequences = SeedSequence(seed).spawn(n_workers)
+        population = SharedPopulation.create(max_strands, max_bases)
+        try:
+            population.add(init_strand)
+            processes = [
+                mp.Process(
+                    target=_shared_random_worker,
+                    args=(population, seed_sequence, n_iterations // n_workers + (i < n_iterations % n_workers)),
+                    daemon=True,
+                )
+                for i, seed_sequence in enumerate(seed_sequences)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            if any(process.exitcode != 0 for process in processes):
+                msg = "A shared population worker failed"
+                raise RuntimeError(msg)
+            strands = list(population)
+        finally:
+            population.close()
+            population.unlink()
+
+        if sink is not None:
+            for strand in strands:
+                sink.write(strand, n_iterations)
+            sink.flush()
+
+        Search.log_population(strands, n_iterations, print_strands=print_strands)
+        return strands
@@ -0,0 +1,97 @@
+import time
+from typing import Iterable, Iterator, Optional
+
+from numpy.random import Generator
+
+from typogenetics.dedup import Deduplicator, Interner
+from typogenetics.engine import Compiler, Program
+from typogenetics.stats import Stats
+from typogenetics.typogenetics import Strand, Translator
+
+
+class Population:
+    """Unique strands discovered during a simulation, indexed by the enzymes they code for.
+
+    Strands are immutable, so each strand is translated and its enzymes compiled (which folds them and finds their
+    binding base) exactly once, when it is added. Every enzyme is also appended to a flat pool so that enzymes can be
+    sampled directly rather than through the strand that codes for them.
+
+    Strands are deduplicated exactly by default, but any `Deduplicator` can be passed in to bound memory.
+    """
+
+    def __init__(self, strands: Iterable[Strand] = (), seen: Optional[Deduplicator] = None) -> None:
+        self.strands: list[Strand] = []
+        self.seen = Interner() if seen is None else seen
+        self.programs: list[list[Program]] = []
+        self.pool: list[Program] = []
+        self._compiled: dict[bytes, Program] = {}
+        self.extend(strands)
+
+    def add(self, strand: Strand, stats: Optional[Stats] = None) -> bool:
+        """Add a strand if it is new, returning whether it was added."""
+        if stats is not None:
+            return self.add_timed(strand, stats)
+        if not self.seen.add(strand):
+            return False
+        self.strands.append(strand)
+        self._index_programs(Translator.translate_codes(strand))
+        return True
+
+    def add_timed(self, strand: Strand, stats: Stats) -> bool:
+        start = time.perf_counter()
+        is_new = self.seen.add(strand)
+        translate_start = time.perf_counter()
+        stats.timers["dedup"] += translate_start - start
+        stats.counters["dedup"] += 1
+        if not is_new:
+            return False
+        self.strands.append(strand)
+        self._index_programs(Translator.translate_codes(strand))
+        stats.timers["translate"] += time.perf_counter() - translate_start
+        stats.counters["translate"] += 1
+        return True
+
+    def extend(self, strands: Iterable[Strand]) -> list[Strand]:
+        """Add many strands at once, translating them in a single batch. Returns the strands that were new."""
+        new_strands = [strand for strand in strands if self.seen.add(strand)]
+        self._index_strands(new_strands)
+        return new_strands
+
+    @classmethod
+    def restore(cls, strands: list[Strand], seen: Deduplicator) -> "Population":
+        """Rebuild a population from its strands and a deduplicator that has already seen them."""
+        population = cls(seen=seen)
+        population._index_strands(strands)
+        return population
+
+    def _index_strands(self, strands: list[Strand]) -> None:
+        self.strands += strands
+        strand_genes = Translator.translate_codes_batch(strands)
+        new_genes = list({codes for genes in strand_genes for codes in genes if codes not in self._compiled})
+        self._compiled.update(zip(new_genes, Compiler.compile_codes_batch(new_genes), strict=True))
+        for genes in strand_genes:
+            self._index_programs(genes)
+
+    def _index_programs(self, genes: list[bytes]) -> None:
+        programs = []
+        for codes in genes:
+            program = self._compiled.get(codes)
+            if program is None:
+                program = Compiler.compile_codes(codes)
+                self._compiled[codes] = program
+            programs.append(program)
+
+        self.programs.append(programs)
+        self.pool += programs
+
+    def sample_strand(self, rng: Generator) -> Strand:
+        return self.strands[rng.integers(0, len(self.strands))]
+
+    def __contains__(self, strand: object) -> bool:
+        return strand in self.seen
+
+    def __iter__(self) -> Iterator[Strand]:
+        return iter(self.strands)
+
+    def __len__(self) -> int:
+        return len(self.strands)
@@ -1,12 +1,29 @@
 import logging
 from enum import StrEnum, auto
-from queue import Queue
-from typing import Optional
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Collection, Iterator, Optional
 
 import numpy as np
 from numpy.random import Generator
 
-from typogenetics.typogenetics import Base, Rewriter, Strand, Translator
+from typogenetics.cache import PhenotypeCache, RewriteCache
+from typogenetics.checkpoint import (
+    Checkpoint,
+    get_rng_state,
+    pack_bytes,
+    pack_strands,
+    set_rng_state,
+    unpack_bytes,
+    unpack_strands,
+)
+from typogenetics.closure import Closure
+from typogenetics.dedup import DedupKind, Deduplicator, Interner, load_deduplicator
+from typogenetics.engine import Compiler, Engine, Program
+from typogenetics.population import Population
+from typogenetics.sink import Sink
+from typogenetics.stats import Stats
+from typogenetics.typogenetics import BASES, Strand, Translator
 
 logger = logging.getLogger(__name__)
 
@@ -17,14 +34,21 @@ class EditType(StrEnum):
     DELETE = auto()
 
 
+class EditMode(StrEnum):
+    RANDOM = auto()
+    EXHAUSTIVE = auto()
+
+
 class Editor:
     PROB_MUTATE = 0.80
     PROB_INSERT = 0.10
     PROB_DELETE = 0.10
 
     @classmethod
-    def edit(cls, strand: Strand, rng: Generator) -> Strand:
+    def edit(cls, strand: Strand, rng: Generator, stats: Optional[Stats] = None) -> Strand:
         edit_type = cls.select_edit_type(rng)
+        if stats is not None:
+            stats.edits[edit_type] += 1
         match edit_type:
             case EditType.MUTATE:
                 return cls.mutate(strand, rng)
@@ -36,32 +60,86 @@ class Editor:
         msg = f"Unknown edit type: {edit_type}"
         raise ValueError(msg)
 
+    @classmethod
+    def edit_batch(cls, strand: Strand, k: int, rng: Generator, stats: Optional[Stats] = None) -> list[Strand]:
+        """Draw k independent edits of a strand with one vectorized draw each for edit types, positions and bases.
+
+        Mutations replace a base with one of the other three bases directly instead of redrawing until the base changes.
+        An empty strand has no base to mutate or delete, so every edit of it is an insertion.
+        """
+        codes = strand.codes
+        n_bases = len(codes)
+        if n_bases == 0:
+            edit_types = np.ones(k, dtype=np.int64)
+        else:
+            thresholds = np.cumsum([cls.PROB_MUTATE, cls.PROB_INSERT, cls.PROB_DELETE])
+            edit_types = np.minimum(np.searchsorted(thresholds, rng.random(k)), 2)
+        is_insert = edit_types == 1
+        positions = (rng.random(k) * (n_bases + is_insert)).astype(np.int64).tolist()
+        # Uniform over 0..11, so modulo 4 picks an inserted base and modulo 3 picks one of the other bases to mutate to
+        draws = rng.integers(0, 12, k).tolist()
+        if stats is not None:
+            for edit_type, count in zip(_EDIT_TYPES, np.bincount(edit_types, minlength=3).tolist(), strict=True):
+                stats.edits[edit_type] += count
+
+        buffer = bytearray(codes)
+        new_strands = []
+        for type_index, position, draw in zip(edit_types.tolist(), positions, draws, strict=True):
+            if type_index == 0:
+                code = buffer[position]
+                buffer[position] = (code + 1 + draw % 3) % len(BASES)
+                new_strands.append(Strand.from_codes(buffer))
+                buffer[position] = code
+            elif type_index == 1:
+                new_strands.append(Strand.from_codes(codes[:position] + _BASE_BYTES[draw % 4] + codes[position:]))
+            else:
+                new_strands.append(Strand.from_codes(codes[:position] + codes[position + 1 :]))
+        return new_strands
+
+    @classmethod
+    def iter_neighbors(cls, strand: Strand) -> Iterator[Strand]:
+        """Every distinct strand one mutation, insertion or deletion away from a strand, in a fixed order.
+
+        Inserting a base next to an equal base, or deleting any base of a run, gives the same strand wherever it happens
+        in the run, so only the first position of each run is used. Every strand yielded is therefore distinct, and
+        there are at most 3n + 4(n + 1) + n of them for a strand of n bases.
+        """
+        codes = strand.codes
+        buffer = bytearray(codes)
+        for position, code in enumerate(codes):
+            for new_code in range(len(BASES)):
+                if new_code != code:
+                    buffer[position] = new_code
+                    yield Strand.from_codes(buffer)
+            buffer[position] = code
+        for position in range(len(codes) + 1):
+            previous_code = codes[position - 1] if position > 0 else None
+            for new_code in range(len(BASES)):
+                if new_code != previous_code:
+                    yield Strand.from_codes(codes[:position] + _BASE_BYTES[new_code] + codes[position:])
+        for position, code in enumerate(codes):
+            if position == 0 or codes[position - 1] != code:
+                yield Strand.from_codes(codes[:position] + codes[position + 1 :])
+
     @classmethod
     def mutate(cls, strand: Strand, rng: Generator) -> Strand:
         r1 = rng.integers(0, len(strand))
-        new_bases = strand.bases.copy()
-        base = new_bases[r1]
-        while new_bases[r1] == base:
-            all_bases = [Base.A, Base.C, Base.G, Base.T]
-            r2 = rng.integers(0, len(all_bases))
-            new_bases[r1] = all_bases[r2]
-        return Strand(new_bases)
+        new_codes = bytearray(strand.codes)
+        code = new_codes[r1]
+        while new_codes[r1] == code:
+            new_codes[r1] = rng.integers(0, len(BASES))
+        return Strand.from_codes(new_codes)
 
     @classmethod
     def insert(cls, strand: Strand, rng: Generator) -> Strand:
         r1 = rng.integers(0, len(strand) + 1)
-        new_bases = strand.bases.copy()
-        all_bases = [Base.A, Base.C, Base.G, Base.T]
-        r2 = rng.integers(0, len(all_bases))
-        new_bases.insert(r1, all_bases[r2])
-        return Strand(new_bases)
+        r2 = rng.integers(0, len(BASES))
+        return Strand.from_codes(strand.codes[:r1] + bytes((r2,)) + strand.codes[r1:])
 
     @classmethod
     def delete(cls, strand: Strand, rng: Generator) -> Strand:
         r1 = rng.integers(0, len(strand))
-        new_bases = strand.bases.copy()
-        new_bases.pop(r1)
-        return Strand(new_bases)
+        return Strand.from_codes(strand.codes[:r1] + strand.codes[r1 + 1 :])
 
     @classmethod
     def select_edit_type(cls, rng: Generator) -> EditType:
@@ -81,36 +159,204 @@ class Editor:
         raise ValueError(msg)
 
 
+# Edit types in the order of their probabilities, and the single byte of each base code
+_EDIT_TYPES = (EditType.MUTATE, EditType.INSERT, EditType.DELETE)
+_BASE_BYTES = tuple(bytes((code,)) for code in range(len(BASES)))
+
+# An edited strand along with the opcodes of the largest enzyme of the strand it was edited from
+Candidate = tuple[Strand, bytes]
+
+
 class Search:
     @classmethod
-    def random(
+    def random(  # noqa: PLR0913
         cls,
         init_strand: Strand,
         n_iterations: int,
         rng: Generator,
         print_strands: bool = False,
+        sample_pool: bool = False,
+        cache: Optional[RewriteCache] = None,
+        seen: Optional[Deduplicator] = None,
+        checkpoint_path: Optional[Path] = None,
+        checkpoint_interval: int = 100_000,
+        resume: bool = False,
+        sink: Optional[Sink] = None,
+        stats: Optional[Stats] = None,
+    ) -> Population:
+        """Repeatedly apply a random enzyme to a random strand, adding the strands produced to the population.
+
+        By default an enzyme is sampled by first sampling a strand and then one of its enzymes. With `sample_pool`
+        enzymes are sampled uniformly from all enzymes coded for by the population.
+
+        With a `checkpoint_path` the run is saved every `checkpoint_interval` iterations, and with `resume` it continues
+        from that checkpoint, if there is one, exactly as if it had never stopped.
+
+        With a `sink` every strand is streamed to it along with the iteration it was discovered at, and with `stats` the
+        time spent rewriting, deduplicating and translating is measured along with the growth of the population.
+        """
+        n_done = 0
+        if resume and checkpoint_path is not None and checkpoint_path.exists():
+            population, n_done = cls.load_random_checkpoint(checkpoint_path, rng, sink=sink)
+            logger.info("Resuming from iteration %d with %d strands", n_done, len(population))
+        else:
+            population = Population([init_strand], seen=seen)
+            if sink is not None:
+                sink.write(init_strand, 0)
+
+        while n_done < n_iterations:
+            n_epoch_iterations = n_iterations - n_done
+            if checkpoint_path is not None:
+                n_epoch_iterations = min(n_epoch_iterations, checkpoint_interval)
+            cls.iterate_random(
+                population,
+                n_epoch_iterations,
+                rng,
+                sample_pool=sample_pool,
+                cache=cache,
+                sink=sink,
+                first_iteration=n_done + 1,
+                stats=stats,
+            )
+            n_done += n_epoch_iterations
+            if checkpoint_path is not None:
+                cls.save_random_checkpoint(checkpoint_path, population, rng, n_done, sink=sink)
+        if sink is not None:
+            sink.flush()
+
+        cls.log_population(population, n_iterations, print_strands=print_strands)
+        if cache is not None:
+            cache.log_stats()
+        return population
+
+    @classmethod
+    def closure(  # noqa: PLR0913
+        cls,
+        init_strand: Strand,
+        max_length: Optional[int] = None,
+        max_strands: Optional[int] = None,
+        max_rounds: Optional[int] = None,
+        print_strands: bool = False,
+        seen: Optional[Deduplicator] = None,
+        sink: Optional[Sink] = None,
+        stats: Optional[Stats] = None,
+    ) -> Population:
+        """Discover every strand reachable from the initial strand, applying each enzyme to each strand exactly once.
+
+        Unlike `random`, the result does not depend on a seed, and the search stops by itself once no new strands are
+        found. With a `sink` every strand is streamed to it along with the round it was discovered in.
+        """
+        closure = Closure([init_strand], max_length=max_length, max_strands=max_strands, seen=seen)
+        if sink is not None:
+            sink.write(init_strand, 0)
+        population = closure.run(max_rounds=max_rounds, sink=sink, stats=stats)
+        if sink is not None:
+            sink.flush()
+
+        if print_strands:
+            for strand_str in sorted(str(strand) for strand in population):
+                logger.info("Strand: %s", strand_str)
+        logger.info(
+            "Discovered %d unique strands coding for %d enzymes in %d rounds, the closure is %s",
+            len(population),
+            len(closure.programs),
+            len(closure.rounds),
+            "complete" if closure.complete else "incomplete",
+        )
+        return population
+
+    @classmethod
+    def save_random_checkpoint(
+        cls,
+        path: Path,
+        population: Population,
+        rng: Generator,
+        n_done: int,
+        sink: Optional[Sink] = None,
     ) -> None:
-        strands = [init_strand]
-        known_set = {str(init_strand)}
-        for _ in range(n_iterations):
-            enzyme_strand = strands[rng.integers(0, len(strands))]
-            enzymes = Translator.translate(enzyme_strand)
-            if len(enzymes) == 0:
-                continue
-            enzyme = enzymes[rng.integers(0, len(enzymes))]
-            rewrite_strand = strands[rng.integers(0, len(strands))]
-            new_strands = Rewriter.rewrite(enzyme, rewrite_strand)
-            for strand in new_strands:
-                if str(strand) not in known_set:
-                    strands.append(strand)
-                known_set.add(str(strand))
+        header = {"search": "random", "n_done": n_done, "rng": get_rng_state(rng), "dedup": population.seen.kind}
+        if sink is not None:
+            header["sink_position"] = sink.tell()
+        sections = {"strands": pack_strands(population.strands)}
+        # An exact deduplicator has seen exactly the strands of the population, so it is rebuilt from them instead
+        if not isinstance(population.seen, Interner):
+            header["dedup_meta"], sections["dedup"] = population.seen.dump()
+        Checkpoint(header, sections).save(path)
 
+    @classmethod
+    def load_random_checkpoint(cls, path: Path, rng: Generator, sink: Optional[Sink] = None) -> tuple[Population, int]:
+        checkpoint = Checkpoint.load(path)
+        header = checkpoint.header
+        if header["search"] != "random":
+            msg = f"Checkpoint {path} is from a {header['search']} search, not a random search"
+            raise ValueError(msg)
+
+        set_rng_state(rng, header["rng"])
+        cls.truncate_sink(sink, header)
+        strands = unpack_strands(checkpoint.sections["strands"])
+        kind = DedupKind(header["dedup"])
+        if kind == DedupKind.EXACT:
+            return Population(strands), header["n_done"]
+        seen = load_deduplicator(kind, header["dedup_meta"], checkpoint.sections["dedup"])
+        return Population.restore(strands, seen), header["n_done"]
+
+    @classmethod
+    def truncate_sink(cls, sink: Optional[Sink], header: dict[str, Any]) -> None:
+        """Drop the strands a sink received after a checkpoint was taken, since the resumed run finds them again."""
+        if sink is not None and "sink_position" in header:
+            sink.truncate(header["sink_position"])
+
+    @classmethod
+    def log_population(cls, population: Collection[Strand], n_iterations: int, print_strands: bool = False) -> None:
         if print_strands:
-            sorted_strands = sorted(known_set)
+            sorted_strands = sorted(str(strand) for strand in population)
             for strand_str in sorted_strands:
                 logger.info("Strand: %s", strand_str)
 
-        logger.info("Discovered %d unique strands while simulating for %d iterations", len(known_set), n_iterations)
+        logger.info("Discovered %d unique strands while simulating for %d iterations", len(population), n_iterations)
+
+    @classmethod
+    def iterate_random(  # noqa: PLR0913
+        cls,
+        population: Population,
+        n_iterations: int,
+        rng: Generator,
+        sample_pool: bool = False,
+        cache: Optional[RewriteCache] = None,
+        sink: Optional[Sink] = None,
+        first_iteration: int = 1,
+        stats: Optional[Stats] = None,
+    ) -> None:
+        rewrite = Engine.rewrite if cache is None else cache.rewrite
+        add = population.add
+        if stats is not None:
+            rewrite = stats.timed("rewrite", partial(rewrite, stats=stats))
+            add = partial(population.add, stats=stats)
+        for iteration in range(first_iteration, first_iteration + n_iterations):
+            if stats is not None and iteration % stats.sample_interval == 0:
+                stats.sample(iteration=iteration, n_strands=len(population))
+            if sample_pool:
+                if len(population.pool) == 0:
+                    continue
+                program = population.pool[rng.integers(0, len(population.pool))]
+            else:
+                programs = population.programs[rng.integers(0, len(population))]
+                if len(programs) == 0:
+                    continue
+                program = programs[rng.integers(0, len(programs))]
+            rewrite_strand = population.sample_strand(rng)
+            for strand in rewrite(program, rewrite_strand):
+                if add(strand) and sink is not None:
+                    sink.write(strand, iteration)
+        if stats is not None:
+            stats.counters["iterations"] += n_iterations
+
+    @classmethod
+    def get_largest_program(cls, strand: Strand) -> Optional[Program]:
+        genes = Translator.translate_codes(strand)
+        if len(genes) == 0:
+            return None
+        return Compiler.compile_codes(max(genes, key=len))
 
     @classmethod
     def get_largest_rewrite_strand(
@@ -118,18 +364,18 @@ class Search:
         init_strand: Strand,
         apply_strand: Strand,
         log_rewrite: bool = False,
+        cache: Optional[RewriteCache] = None,
     ) -> Optional[Strand]:
-        init_enzymes = Translator.translate(init_strand)
+        largest_init_program = cls.get_largest_program(init_strand)
         if log_rewrite:
-            logger.info("init_strand was translated into the enzymes: %s", init_enzymes)
-        init_enzyme_lengths = [len(enzyme) for enzyme in init_enzymes]
-        if len(init_enzyme_lengths) == 0:
+            logger.info("init_strand was translated into the enzymes: %s", Translator.translate(init_strand))
+        if largest_init_program is None:
             return None
-        largest_init_enzyme = init_enzymes[np.argmax(init_enzyme_lengths)]
         if log_rewrite:
-            logger.info("The largest was: %s", largest_init_enzyme)
+            logger.info("The largest was: %s", Compiler.decompile(largest_init_program))
 
-        strands = Rewriter.rewrite(largest_init_enzyme, apply_strand)
+        rewrite = Engine.rewrite if cache is None else cache.rewrite
+        strands = rewrite(largest_init_program, apply_strand)
         if log_rewrite:
             logger.info(
                 "When the largest enzyme was applied to %s, the following strands were produced: %s",
@@ -138,8 +384,7 @@ class Search:
             )
         if len(strands) == 0:
             return None
-        strand_lengths = [len(strand) for strand in strands]
-        longest_strand = strands[np.argmax(strand_lengths)]
+        longest_strand = max(strands, key=len)
         if log_rewrite:
             logger.info("The longest strand produced was: %s", longest_strand)
         return longest_strand
@@ -153,58 +398,262 @@ class Search:
         n_edits: int,
         rng: Generator,
         print_strands: bool = False,
-    ) -> None:
+        cache: Optional[RewriteCache] = None,
+        seen: Optional[Deduplicator] = None,
+        checkpoint_path: Optional[Path] = None,
+        resume: bool = False,
+        sink: Optional[Sink] = None,
+        stats: Optional[Stats] = None,
+        edit_mode: EditMode = EditMode.RANDOM,
+    ) -> list[Strand]:
         """Searches through the space of enzymes for enzymes with similar function.
         Every step of the search, edit a strand, translate it into enzymes, select the largest enzyme,
         apply it to the target strand to produce more strands, select the longest strand produced, compare that
         longest strand to the longest strand produced by the initial strand's corresponding largest enzyme.
         If the two strands match, then we assume that the enzyme has maintained its function after editing.
+        With `EditMode.EXHAUSTIVE` every strand one edit away is tried instead of `n_edits` random edits.
         """
+        target = cls.get_bfs_target(init_strand, apply_strand, cache=cache)
+        if target is None:
+            return []
+        target_strand, init_opcodes = target
 
-        init_longest_rewrite_strand = cls.get_largest_rewrite_strand(init_strand, apply_strand, log_rewrite=True)
-        if init_longest_rewrite_strand is None:
+        validator = Validator(apply_strand, target_strand, cache=cache, stats=stats)
+        valid_strands = cls.bfs_levels(
+            init_strand,
+            init_opcodes,
+            target_depth,
+            n_edits,
+            rng,
+            validator.validate_many,
+            seen=seen,
+            checkpoint_path=checkpoint_path,
+            resume=resume,
+            sink=sink,
+            stats=stats,
+            edit_mode=edit_mode,
+        )
+
+        cls.log_valid_strands(valid_strands, target_depth, n_edits, print_strands=print_strands, edit_mode=edit_mode)
+        validator.log_stats()
+        if cache is not None:
+            cache.log_stats()
+        return valid_strands
+
+    @classmethod
+    def get_bfs_target(
+        cls,
+        init_strand: Strand,
+        apply_strand: Strand,
+        cache: Optional[RewriteCache] = None,
+    ) -> Optional[tuple[Strand, bytes]]:
+        """Find the longest strand the initial strand's largest enzyme produces, along with that enzyme's opcodes."""
+        init_longest_rewrite_strand = cls.get_largest_rewrite_strand(
+            init_strand, apply_strand, log_rewrite=True, cache=cache
+        )
+        init_program = cls.get_largest_program(init_strand)
+        if init_longest_rewrite_strand is None or init_program is None:
             logger.error("Could not find any rewrite strands for the given apply strand")
-            return
+            return None
 
         logger.info(
             "Will search for enzymes that produce %s when they are applied to %s",
             init_longest_rewrite_strand,
             apply_strand,
         )
+        return init_longest_rewrite_strand, init_program.opcodes
 
-        seen_strands = set()
-        valid_strands = set()
+    @classmethod
+    def bfs_levels(  # noqa: PLR0912, PLR0913
+        cls,
+        init_strand: Strand,
+        init_opcodes: bytes,
+        target_depth: int,
+        n_edits: int,
+        rng: Generator,
+        validate_many: Callable[[list[Candidate]], list[Optional[bytes]]],
+        seen: Optional[Deduplicator] = None,
+        checkpoint_path: Optional[Path] = None,
+        resume: bool = False,
+        sink: Optional[Sink] = None,
+        stats: Optional[Stats] = None,
+        edit_mode: EditMode = EditMode.RANDOM,
+    ) -> list[Strand]:
+        """Breadth-first search over edits, one level at a time.
 
-        queue: Queue[tuple[Strand, int]] = Queue()
-        queue.put((init_strand, 0))
-        while not queue.empty():
-            curr_strand, depth = queue.get()
+        Edits only depend on the strands being edited, so every edit of a level is drawn up front, in the order a FIFO
+        queue would draw them, and the whole level is validated in one call. This lets callers batch or parallelize
+        validation while discovering exactly the same strands for a given seed.
 
-            if depth > target_depth:
-                continue
+        With a `checkpoint_path` the search is saved after every level, and with `resume` it continues from that
+        checkpoint, if there is one. With a `sink` every valid strand is streamed to it along with its level, and with
+        `stats` editing, deduplication and validation are timed and the search is sampled after every level.
+        """
+        seen_strands = Interner() if seen is None else seen
+        valid_strands: list[Strand] = []
+        frontier = [(init_strand, init_opcodes)]
+        start_depth = 0
+        if resume and checkpoint_path is not None and checkpoint_path.exists():
+            start_depth, frontier, valid_strands, seen_strands = cls.load_bfs_checkpoint(
+                checkpoint_path, rng, sink=sink
+            )
+            logger.info("Resuming from depth %d with %d valid strands", start_depth, len(valid_strands))
 
-            for _ in range(n_edits):
-                edited_strand = Editor.edit(curr_strand, rng)
-                if str(edited_strand) in seen_strands:
-                    continue
-                seen_strands.add(str(edited_strand))
+        def edit_node(strand: Strand) -> list[Strand]:
+            if edit_mode == EditMode.EXHAUSTIVE:
+                return list(Editor.iter_neighbors(strand))
+            return Editor.edit_batch(strand, n_edits, rng, stats=stats)
 
-                longest_rewrite_strand = cls.get_largest_rewrite_strand(edited_strand, apply_strand)
-                if longest_rewrite_strand is None:
-                    continue
+        add = seen_strands.add
+        if stats is not None:
+            edit_node = stats.timed("edit", edit_node)
+            add = stats.timed("dedup", seen_strands.add)
+            validate_many = stats.timed("validate", validate_many)
+
+        try:
+            for depth in range(start_depth, target_depth + 1):
+                candidates = []
+                for curr_strand, curr_opcodes in frontier:
+                    for edited_strand in edit_node(curr_strand):
+                        if add(edited_strand):
+                            candidates.append((edited_strand, curr_opcodes))
 
-                if longest_rewrite_strand == init_longest_rewrite_strand:
-                    valid_strands.add(str(edited_strand))
-                    queue.put((edited_strand, depth + 1))
+                frontier = []
+                for (strand, _), opcodes in zip(candidates, validate_many(candidates), strict=True):
+                    if opcodes is not None:
+                        valid_strands.append(strand)
+                        frontier.append((strand, opcodes))
+                        if sink is not None:
+                            sink.write(strand, depth)
+                if stats is not None:
+                    stats.sample(depth=depth, n_candidates=len(candidates), n_valid=len(valid_strands))
+                if checkpoint_path is not None:
+                    cls.save_bfs_checkpoint(
+                        checkpoint_path, depth + 1, frontier, valid_strands, seen_strands, rng, sink=sink
+                    )
+                if len(frontier) == 0:
+                    break
+        finally:
+            # The caller only closes the deduplicator it passed in, not one restored from the checkpoint
+            if seen_strands is not seen:
+                seen_strands.close()
 
+        if sink is not None:
+            sink.flush()
+        return valid_strands
+
+    @classmethod
+    def save_bfs_checkpoint(  # noqa: PLR0913
+        cls,
+        path: Path,
+        depth: int,
+        frontier: list[Candidate],
+        valid_strands: list[Strand],
+        seen: Deduplicator,
+        rng: Generator,
+        sink: Optional[Sink] = None,
+    ) -> None:
+        dedup_meta, dedup_data = seen.dump()
+        header = {
+            "search": "bfs",
+            "depth": depth,
+            "rng": get_rng_state(rng),
+            "dedup": seen.kind,
+            "dedup_meta": dedup_meta,
+        }
+        if sink is not None:
+            header["sink_position"] = sink.tell()
+        sections = {
+            "frontier_strands": pack_strands(strand for strand, _ in frontier),
+            "frontier_opcodes": pack_bytes(opcodes for _, opcodes in frontier),
+            "valid_strands": pack_strands(valid_strands),
+            "dedup": dedup_data,
+        }
+        Checkpoint(header, sections).save(path)
+
+    @classmethod
+    def load_bfs_checkpoint(
+        cls, path: Path, rng: Generator, sink: Optional[Sink] = None
+    ) -> tuple[int, list[Candidate], list[Strand], Deduplicator]:
+        checkpoint = Checkpoint.load(path)
+        header, sections = checkpoint.header, checkpoint.sections
+        if header["search"] != "bfs":
+            msg = f"Checkpoint {path} is from a {header['search']} search, not a bfs search"
+            raise ValueError(msg)
+
+        set_rng_state(rng, header["rng"])
+        cls.truncate_sink(sink, header)
+        frontier_strands = unpack_strands(sections["frontier_strands"])
+        frontier_opcodes = unpack_bytes(sections["frontier_opcodes"])
+        frontier = list(zip(frontier_strands, frontier_opcodes, strict=True))
+        seen = load_deduplicator(DedupKind(header["dedup"]), header["dedup_meta"], sections["dedup"])
+        return header["depth"], frontier, unpack_strands(sections["valid_strands"]), seen
+
+    @classmethod
+    def log_valid_strands(
+        cls,
+        valid_strands: list[Strand],
+        target_depth: int,
+        n_edits: int,
+        print_strands: bool = False,
+        edit_mode: EditMode = EditMode.RANDOM,
+    ) -> None:
         if print_strands:
-            sorted_strands = sorted(valid_strands)
+            sorted_strands = sorted(str(strand) for strand in valid_strands)
             for strand_str in sorted_strands:
                 logger.info("Strand: %s", strand_str)
 
+        if edit_mode == EditMode.EXHAUSTIVE:
+            logger.info(
+                "Discovered %d valid strands while searching every edit until depth %d",
+                len(valid_strands),
+                target_depth,
+            )
+            return
         logger.info(
             "Discovered %d valid strands while searching until depth %d and branching factor %d",
             len(valid_strands),
             target_depth,
             n_edits,
         )
+
+
+class Validator:
+    """Checks whether edited strands code for an enzyme with the same function as the initial strand.
+
+    The longest strand produced only depends on the largest enzyme, so it is memoized by enzyme, and an edited strand
+    whose largest enzyme is the same as its parent's is valid without evaluating it at all.
+    """
+
+    def __init__(
+        self,
+        apply_strand: Strand,
+        target_strand: Strand,
+        cache: Optional[RewriteCache] = None,
+        stats: Optional[Stats] = None,
+    ) -> None:
+        self.target_strand = target_strand
+        self.phenotypes = PhenotypeCache(apply_strand, cache=cache, stats=stats)
+        self.n_inherited = 0
+        self.get_largest_program = Search.get_largest_program
+        if stats is not None:
+            self.get_largest_program = stats.timed("translate", Search.get_largest_program)
+
+    def validate(self, strand: Strand, parent_opcodes: bytes) -> Optional[bytes]:
+        """Return the opcodes of the largest enzyme of a valid strand, or None if the strand is not valid."""
+        program = self.get_largest_program(strand)
+        if program is None:
+            return None
+        if program.opcodes == parent_opcodes:
+            self.n_inherited += 1
+            return program.opcodes
+        if self.phenotypes.get(program) != self.target_strand:
+            return None
+        return program.opcodes
+
+    def validate_many(self, candidates: list[Candidate]) -> list[Optional[bytes]]:
+        return [self.validate(strand, parent_opcodes) for strand, parent_opcodes in candidates]
+
+    def log_stats(self) -> None:
+        logger.info("%d edited strands kept the largest enzyme of their parent", self.n_inherited)
+        self.phenotypes.log_stats()
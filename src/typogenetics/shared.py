@@ -0,0 +1,179 @@
+import os
+import zlib
+from multiprocessing import Lock
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Lock as LockType
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+import numpy.typing as npt
+from numpy.random import Generator
+
+from typogenetics.typogenetics import Strand
+
+# Slots of the header: the number of strands and the number of bases stored
+_N_STRANDS = 0
+_N_BASES = 1
+# Where shared memory blocks are backed on Linux, whose size bounds the blocks that can be created
+_SHM_PATH = Path("/dev/shm")
+# Capacity of a shared population unless given, about 1.4 GB of shared memory once full
+DEFAULT_MAX_STRANDS = 10_000_000
+DEFAULT_MAX_BASES = 1_000_000_000
+
+
+class PopulationFullError(ValueError):
+    """Raised when a strand does not fit in the capacity a shared population was created with."""
+
+
+class SharedPopulation:
+    """Unique strands stored in a shared memory block that many processes can sample from and append to.
+
+    The block holds a header with the strand and base counts, an offset table into one concatenated buffer of base
+    codes, a CRC32 of each strand, and an open addressing hash index mapping strands to their ids. The capacity is fixed
+    when the population is created.
+
+    Appending takes a lock, reading does not. A strand's bases, offset, checksum and index slot are all written before
+    the strand count is published, so readers only ever see complete strands.
+    """
+
+    def __init__(self, shm: SharedMemory, lock: LockType, max_strands: int, max_bases: int) -> None:
+        self.shm = shm
+        self.lock = lock
+        self.max_strands = max_strands
+        self.max_bases = max_bases
+
+        n_slots = self.get_n_slots(max_strands)
+        self._mask = n_slots - 1
+        offset = 0
+        self._header: npt.NDArray[np.int64] = np.ndarray((2,), dtype=np.int64, buffer=shm.buf, offset=offset)
+        offset += self._header.nbytes
+        self._offsets: npt.NDArray[np.int64] = np.ndarray(
+            (max_strands + 1,), dtype=np.int64, buffer=shm.buf, offset=offset
+        )
+        offset += self._offsets.nbytes
+        self._slots: npt.NDArray[np.int64] = np.ndarray((n_slots,), dtype=np.int64, buffer=shm.buf, offset=offset)
+        offset += self._slots.nbytes
+        self._checksums: npt.NDArray[np.uint32] = np.ndarray(
+            (max_strands,), dtype=np.uint32, buffer=shm.buf, offset=offset
+        )
+        offset += self._checksums.nbytes
+        self._bases: npt.NDArray[np.uint8] = np.ndarray((max_bases,), dtype=np.uint8, buffer=shm.buf, offset=offset)
+
+    @classmethod
+    def create(cls, max_strands: int, max_bases: int) -> "SharedPopulation":
+        """Create an empty population, whose pages are only committed as strands are added.
+
+        New shared memory is zero filled, so the block is not written to up front. Writing past the space available for
+        shared memory would crash a worker with a bus error, so a block that does not fit is refused here instead.
+        """
+        size = cls.get_size(max_strands, max_bases)
+        available = cls.get_available_size()
+        if available is not None and size > available:
+            msg = (
+                f"A shared population of {max_strands} strands and {max_bases} bases needs {size / 1e6:.1f} MB of "
+                f"shared memory, but only {available / 1e6:.1f} MB are available, so lower the maximums"
+            )
+            raise ValueError(msg)
+        shm = SharedMemory(create=True, size=size)
+        return cls(shm, Lock(), max_strands, max_bases)
+
+    @classmethod
+    def get_available_size(cls) -> Optional[int]:
+        """Bytes free for shared memory, or None where shared memory is not backed by a file system."""
+        if not _SHM_PATH.is_dir():
+            return None
+        status = os.statvfs(_SHM_PATH)
+        return status.f_bavail * status.f_frsize
+
+    @classmethod
+    def attach(cls, name: str, lock: LockType, max_strands: int, max_bases: int) -> "SharedPopulation":
+        return cls(SharedMemory(name=name), lock, max_strands, max_bases)
+
+    @classmethod
+    def get_n_slots(cls, max_strands: int) -> int:
+        """Size of the hash index: a power of two at least twice the capacity, keeping probe sequences short."""
+        return 1 << max(2 * max_strands - 1, 1).bit_length()
+
+    @classmethod
+    def get_size(cls, max_strands: int, max_bases: int) -> int:
+        return 8 * 2 + 8 * (max_strands + 1) + 8 * cls.get_n_slots(max_strands) + 4 * max_strands + max_bases
+
+    def __reduce__(
+        self,
+    ) -> tuple[Callable[[str, LockType, int, int], "SharedPopulation"], tuple[str, LockType, int, int]]:
+        return (SharedPopulation.attach, (self.shm.name, self.lock, self.max_strands, self.max_bases))
+
+    def add(self, strand: Strand) -> bool:
+        """Add a strand if it is new, returning whether it was added."""
+        codes = strand.codes
+        checksum = zlib.crc32(codes)
+        slot = self._probe(codes, checksum)
+        if self._slots[slot] != 0:
+            return False
+
+        with self.lock:
+            # Another process may have added the strand, or taken the slot, since the unlocked probe
+            slot = self._probe(codes, checksum)
+            if self._slots[slot] != 0:
+                return False
+
+            n_strands = int(self._header[_N_STRANDS])
+            n_bases = int(self._header[_N_BASES])
+            if n_strands >= self.max_strands or n_bases + len(codes) > self.max_bases:
+                msg = f"Shared population is full with {n_strands} strands and {n_bases} bases"
+                raise PopulationFullError(msg)
+
+            self._bases[n_bases : n_bases + len(codes)] = np.frombuffer(codes, dtype=np.uint8)
+            self._offsets[n_strands + 1] = n_bases + len(codes)
+            self._checksums[n_strands] = checksum
+            self._slots[slot] = n_strands + 1
+            self._header[_N_BASES] = n_bases + len(codes)
+            self._header[_N_STRANDS] = n_strands + 1
+        return True
+
+    def _probe(self, codes: bytes, checksum: int) -> int:
+        """Find the index slot holding a strand, or the empty slot where it would be inserted."""
+        slot = checksum & self._mask
+        while True:
+            entry = int(self._slots[slot])
+            if entry == 0:
+                return slot
+            index = entry - 1
+            if self._checksums[index] == checksum and self.get_codes(index) == codes:
+                return slot
+            slot = (slot + 1) & self._mask
+
+    def get_codes(self, index: int) -> bytes:
+        return self._bases[self._offsets[index] : self._offsets[index + 1]].tobytes()
+
+    def sample_strand(self, rng: Generator) -> Strand:
+        return self[int(rng.integers(0, len(self)))]
+
+    def close(self) -> None:
+        del self._header, self._offsets, self._slots, self._checksums, self._bases
+        self.shm.close()
+
+    def unlink(self) -> None:
+        self.shm.unlink()
+
+    def __contains__(self, strand: object) -> bool:
+        if not isinstance(strand, Strand):
+            return False
+        return self._slots[self._probe(strand.codes, zlib.crc32(strand.codes))] != 0
+
+    def __getitem__(self, index: int) -> Strand:
+        return Strand.from_codes(self.get_codes(index))
+
+    def __iter__(self) -> Iterator[Strand]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __len__(self) -> int:
+        return int(self._header[_N_STRANDS])
+
+    def __enter__(self) -> "SharedPopulation":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
@@ -0,0 +1,219 @@
+import logging
+
+import numpy as np
+import numpy.typing as npt
+
+from typogenetics.typogenetics import Strand
+
+logger = logging.getLogger(__name__)
+
+# Longest query whose bit vectors fit in one machine word for the vectorized kernel
+WORD_SIZE = 64
+# Longest q-grams, which fit in 16 bits and have a list for each of their 4^q values
+MAX_Q = 8
+
+
+def get_edit_distance(strand_a: Strand, strand_b: Strand) -> int:
+    """Levenshtein distance between two strands of any length.
+
+    This is Hyyrö's form of Myers' bit-parallel algorithm: a column of the dynamic programming matrix is stored as bit
+    vectors of its vertical differences, one bit per base of the first strand, and updated a whole column at a time.
+    """
+    m = len(strand_a)
+    if m == 0:
+        return len(strand_b)
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    peq = [0, 0, 0, 0]
+    for unit, code in enumerate(strand_a.codes):
+        peq[code] |= 1 << unit
+
+    pv, mv, score = mask, 0, m
+    for code in strand_b.codes:
+        eq = peq[code]
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & mask
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        # The first row of the matrix counts insertions, so it always increases by one
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+    return score
+
+
+def get_edit_distances(
+    query: Strand, codes: npt.NDArray[np.uint8], starts: npt.NDArray[np.int64], lengths: npt.NDArray[np.int64]
+) -> npt.NDArray[np.int64]:
+    """Levenshtein distances from a query to many strands, given by where their base codes start in one flat buffer.
+
+    The bit vectors of every strand are updated together, one base at a time. Queries longer than a machine word fall
+    back to `get_edit_distance`.
+    """
+    m = len(query)
+    if m == 0:
+        return lengths.astype(np.int64)
+    if m > WORD_SIZE:
+        return np.array(
+            [
+                get_edit_distance(query, Strand.from_codes(codes[start : start + length].tobytes()))
+                for start, length in zip(starts.tolist(), lengths.tolist(), strict=True)
+            ],
+            dtype=np.int64,
+        )
+
+    mask = np.uint64((1 << m) - 1)
+    high = np.uint64(1 << (m - 1))
+    one = np.uint64(1)
+    peq = np.zeros(4, dtype=np.uint64)
+    for unit, code in enumerate(query.codes):
+        peq[code] |= np.uint64(1 << unit)
+
+    # Longest strands first, so the strands that still have bases left are always a prefix
+    order = np.argsort(-lengths, kind="stable")
+    sorted_starts, sorted_lengths = starts[order], lengths[order]
+    pv = np.full(len(order), mask, dtype=np.uint64)
+    mv = np.zeros(len(order), dtype=np.uint64)
+    scores = np.full(len(order), m, dtype=np.int64)
+    for unit in range(int(sorted_lengths.max(initial=0))):
+        n = int(np.count_nonzero(sorted_lengths > unit))
+        eq = peq[codes[sorted_starts[:n] + unit]]
+        pv_n, mv_n = pv[:n], mv[:n]
+        xv = eq | mv_n
+        xh = (((eq & pv_n) + pv_n) ^ pv_n) | eq
+        ph = mv_n | ~(xh | pv_n)
+        mh = pv_n & xh
+        scores[:n] += (ph & high) != 0
+        scores[:n] -= (mh & high) != 0
+        ph = ((ph << one) | one) & mask
+        mh = (mh << one) & mask
+        pv[:n] = (mh | ~(xv | ph)) & mask
+        mv[:n] = ph & xv
+
+    distances = np.empty(len(order), dtype=np.int64)
+    distances[order] = scores
+    return distances
+
+
+class StrandIndex:
+    """Strands indexed by their q-grams, the substrings of `q` bases, to find the strands similar to a query.
+
+    A strand within edit distance k of a query shares at least n - q + 1 - kq of the q-grams at the n - q + 1 positions
+    of the query, since each edit changes at most q of them. Candidates are counted from the inverted lists of the
+    query's q-grams, filtered by that bound and by length, and only the candidates have their distances computed.
+    Once the bound filters nothing, every strand of a close enough length is compared instead.
+    """
+
+    def __init__(self, strands: list[Strand], q: int = 4) -> None:
+        if not 1 <= q <= MAX_Q:
+            msg = f"q must be between 1 and {MAX_Q}, got {q}"
+            raise ValueError(msg)
+        self.strands = strands
+        self.q = q
+        # Base codes of every strand concatenated, so memory grows with the total number of bases
+        self.lengths = np.array([len(strand) for strand in strands], dtype=np.int64)
+        self.starts = np.cumsum(self.lengths) - self.lengths
+        self.codes = np.frombuffer(b"".join(strand.codes for strand in strands), dtype=np.uint8)
+        self.gram_offsets, self.gram_strands = self.index_grams(self.codes, self.starts, self.lengths, q)
+        logger.debug("Indexed %d strands by %d %d-grams", len(strands), len(self.gram_strands), q)
+
+    @classmethod
+    def get_grams(cls, codes: npt.NDArray[np.uint8], q: int) -> npt.NDArray[np.uint16]:
+        """Q-grams starting at every unit of strands of one length, given as rows, packed two bits per base."""
+        n_starts = max(codes.shape[1] - q + 1, 0)
+        grams = np.zeros((len(codes), n_starts), dtype=np.uint16)
+        for offset in range(q):
+            grams = (grams << 2) | codes[:, offset : offset + n_starts]
+        return grams
+
+    @classmethod
+    def index_grams(
+        cls, codes: npt.NDArray[np.uint8], starts: npt.NDArray[np.int64], lengths: npt.NDArray[np.int64], q: int
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """Inverted lists of the distinct strands that contain each q-gram, in compressed sparse row form.
+
+        Strands are gathered from the flat buffer one length at a time, so no strand is padded to the longest one.
+        """
+        # Strands shorter than q have no q-grams
+        by_length = np.argsort(lengths, kind="stable")
+        by_length = by_length[lengths[by_length] >= q]
+        if len(by_length) == 0:
+            return np.zeros(4**q + 1, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        sorted_lengths = lengths[by_length]
+        bounds = np.flatnonzero(np.concatenate(([True], sorted_lengths[1:] != sorted_lengths[:-1], [True])))
+        gram_chunks, strand_chunks = [], []
+        for first, last in zip(bounds[:-1].tolist(), bounds[1:].tolist(), strict=True):
+            length = int(sorted_lengths[first])
+            ids = by_length[first:last]
+            grams = cls.get_grams(codes[starts[ids][:, np.newaxis] + np.arange(length)], q)
+            gram_chunks.append(grams.ravel())
+            strand_chunks.append(np.repeat(ids, grams.shape[1]))
+        grams, strands = np.concatenate(gram_chunks), np.concatenate(strand_chunks)
+        # Q-grams are listed a strand at a time, so a stable sort by q-gram, which is a radix sort for 16 bit values,
+        # leaves repeats of a q-gram in the same strand next to each other
+        order = np.argsort(grams, kind="stable")
+        grams, strands = grams[order], strands[order]
+        distinct = np.concatenate(([True], (grams[1:] != grams[:-1]) | (strands[1:] != strands[:-1])))
+        grams, strands = grams[distinct], strands[distinct]
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(grams, minlength=4**q))))
+        return offsets.astype(np.int64), strands
+
+    def get_threshold(self, query: Strand, radius: int) -> int:
+        """Fewest q-gram positions of the query that a strand within the radius shares."""
+        return len(query) - self.q + 1 - radius * self.q
+
+    def get_candidates(self, query: Strand, radius: int) -> npt.NDArray[np.int64]:
+        """Strands that might be within the radius of the query, which is all strands of a close enough length."""
+        candidates = np.abs(self.lengths - len(query)) <= radius
+        threshold = self.get_threshold(query, radius)
+        if threshold > 0:
+            grams = self.get_grams(np.frombuffer(query.codes, dtype=np.uint8)[np.newaxis, :], self.q)[0]
+            postings = [
+                self.gram_strands[self.gram_offsets[gram] : self.gram_offsets[gram + 1]] for gram in grams.tolist()
+            ]
+            counts = np.bincount(np.concatenate(postings), minlength=len(self.strands))
+            candidates &= counts >= threshold
+        return np.flatnonzero(candidates)
+
+    def search(self, query: Strand, radius: int) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """Indexes of the strands within the radius of the query and their distances, nearest first."""
+        candidates = self.get_candidates(query, radius)
+        distances = get_edit_distances(query, self.codes, self.starts[candidates], self.lengths[candidates])
+        within = distances <= radius
+        candidates, distances = candidates[within], distances[within]
+        order = np.lexsort((candidates, distances))
+        return candidates[order], distances[order]
+
+    def within(self, query: Strand, radius: int) -> list[tuple[Strand, int]]:
+        """Strands within an edit distance of the query, nearest first."""
+        indexes, distances = self.search(query, radius)
+        return [
+            (self.strands[index], distance)
+            for index, distance in zip(indexes.tolist(), distances.tolist(), strict=True)
+        ]
+
+    def nearest(self, query: Strand, k: int) -> list[tuple[Strand, int]]:
+        """The k strands nearest to the query, with ties broken by the order the strands were indexed in."""
+        max_radius = max(len(query), int(self.lengths.max(initial=0)))
+        radius = 0
+        while True:
+            # Once the q-gram bound filters nothing, a search with the largest radius costs the same as a smaller one
+            if radius >= max_radius or self.get_threshold(query, radius) <= 0:
+                radius = max_radius
+            indexes, distances = self.search(query, radius)
+            if len(indexes) >= k or radius == max_radius:
+                break
+            radius += 1
+        return [
+            (self.strands[index], distance)
+            for index, distance in zip(indexes[:k].tolist(), distances[:k].tolist(), strict=True)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.strands)
@@ -0,0 +1,174 @@
+import json
+import sqlite3
+import struct
+from abc import ABC, abstractmethod
+from enum import StrEnum, auto
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Optional, TextIO
+
+from typogenetics.typogenetics import Strand
+
+
+class SinkFormat(StrEnum):
+    NDJSON = auto()
+    BINARY = auto()
+    SQLITE = auto()
+
+
+class Sink(ABC):
+    """Streams discovered strands to a file as they are found, along with the step they were found at.
+
+    The step is the iteration for random simulations and the level for breadth-first searches. Records are buffered
+    and written in bulk every `buffer_size` strands, so a file can be tailed while a run is in progress.
+    """
+
+    def __init__(self, buffer_size: int = 10_000) -> None:
+        self.buffer_size = buffer_size
+        self.buffer: list[tuple[Strand, int]] = []
+        self.n_written = 0
+
+    @classmethod
+    def open(cls, path: Path, sink_format: SinkFormat, append: bool = False, buffer_size: int = 10_000) -> "Sink":
+        match sink_format:
+            case SinkFormat.NDJSON:
+                return NdjsonSink(path, append=append, buffer_size=buffer_size)
+            case SinkFormat.BINARY:
+                return BinarySink(path, append=append, buffer_size=buffer_size)
+            case SinkFormat.SQLITE:
+                return SqliteSink(path, append=append, buffer_size=buffer_size)
+
+        msg = f"Unknown sink format: {sink_format}"
+        raise ValueError(msg)
+
+    def write(self, strand: Strand, step: int) -> None:
+        self.buffer.append((strand, step))
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if len(self.buffer) > 0:
+            self._write_records(self.buffer)
+            self.n_written += len(self.buffer)
+            self.buffer = []
+
+    @abstractmethod
+    def tell(self) -> int:
+        """Flush and return a position that `truncate` can later roll the sink back to."""
+
+    @abstractmethod
+    def truncate(self, position: int) -> None:
+        """Drop every record written after `tell` returned `position`, e.g. when resuming from a checkpoint."""
+
+    @abstractmethod
+    def _write_records(self, records: list[tuple[Strand, int]]) -> None: ...
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "Sink":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+class NdjsonSink(Sink):
+    """One JSON object per line with the strand and the step it was found at."""
+
+    def __init__(self, path: Path, append: bool = False, buffer_size: int = 10_000) -> None:
+        super().__init__(buffer_size=buffer_size)
+        self.file: TextIO = path.open("a" if append else "w")
+
+    def _write_records(self, records: list[tuple[Strand, int]]) -> None:
+        self.file.write("".join(f'{{"strand": "{strand}", "step": {step}}}\n' for strand, step in records))
+        self.file.flush()
+
+    def tell(self) -> int:
+        self.flush()
+        return self.file.tell()
+
+    def truncate(self, position: int) -> None:
+        self.flush()
+        self.file.truncate(position)
+        self.file.seek(position)
+
+    def close(self) -> None:
+        super().close()
+        self.file.close()
+
+    @classmethod
+    def read(cls, path: Path) -> Iterator[tuple[Strand, int]]:
+        with path.open() as f:
+            for line in f:
+                record: dict[str, Any] = json.loads(line)
+                yield Strand.from_str(record["strand"]), record["step"]
+
+
+class BinarySink(Sink):
+    """Records of the step and strand length as little-endian uint32s followed by the packed bases of the strand."""
+
+    def __init__(self, path: Path, append: bool = False, buffer_size: int = 10_000) -> None:
+        super().__init__(buffer_size=buffer_size)
+        self.file: BinaryIO = path.open("ab" if append else "wb")
+
+    def _write_records(self, records: list[tuple[Strand, int]]) -> None:
+        self.file.write(b"".join(struct.pack("<II", step, len(strand)) + strand.pack() for strand, step in records))
+        self.file.flush()
+
+    def tell(self) -> int:
+        self.flush()
+        return self.file.tell()
+
+    def truncate(self, position: int) -> None:
+        self.flush()
+        self.file.truncate(position)
+        self.file.seek(position)
+
+    def close(self) -> None:
+        super().close()
+        self.file.close()
+
+    @classmethod
+    def read(cls, path: Path) -> Iterator[tuple[Strand, int]]:
+        with path.open("rb") as f:
+            while header := f.read(8):
+                step, length = struct.unpack("<II", header)
+                yield Strand.unpack(f.read(-(-length // 4)), length), step
+
+
+class SqliteSink(Sink):
+    """A `strands` table with the strand and the step it was found at."""
+
+    def __init__(self, path: Path, append: bool = False, buffer_size: int = 10_000) -> None:
+        super().__init__(buffer_size=buffer_size)
+        self.conn = sqlite3.connect(path)
+        if not append:
+            self.conn.execute("DROP TABLE IF EXISTS strands")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS strands (id INTEGER PRIMARY KEY, strand TEXT, step INTEGER)")
+
+    def _write_records(self, records: list[tuple[Strand, int]]) -> None:
+        with self.conn:
+            self.conn.executemany("INSERT INTO strands (strand, step) VALUES (?, ?)", ((str(s), n) for s, n in records))
+
+    def tell(self) -> int:
+        self.flush()
+        max_id: Optional[int] = self.conn.execute("SELECT MAX(id) FROM strands").fetchone()[0]
+        return 0 if max_id is None else max_id
+
+    def truncate(self, position: int) -> None:
+        self.flush()
+        with self.conn:
+            self.conn.execute("DELETE FROM strands WHERE id > ?", (position,))
+
+    def close(self) -> None:
+        super().close()
+        self.conn.close()
+
+    @classmethod
+    def read(cls, path: Path) -> Iterator[tuple[Strand, int]]:
+        conn = sqlite3.connect(path)
+        try:
+            for strand_str, step in conn.execute("SELECT strand, step FROM strands ORDER BY id"):
+                yield Strand.from_str(strand_str), step
+        finally:
+            conn.close()
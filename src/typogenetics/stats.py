@@ -0,0 +1,110 @@
+import json
+import logging
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+from typogenetics.typogenetics import AMINO_ACID_CODES, AMINO_ACIDS, AminoAcid, Termination
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Stats:
+    """Counters and timers for the hot paths of a run.
+
+    Instrumented functions take an optional `Stats` and only pay for instrumentation when one is passed. Progress is
+    sampled every `sample_interval` iterations of a random simulation and after every level of a breadth-first search,
+    and each sample is also passed to `hook`, e.g. to export metrics while a run is in progress.
+    """
+
+    def __init__(self, sample_interval: int = 10_000, hook: Optional[Callable[["Stats"], None]] = None) -> None:
+        self.sample_interval = sample_interval
+        self.hook = hook
+        self.start = time.perf_counter()
+        self.counters: Counter[str] = Counter()
+        self.timers: defaultdict[str, float] = defaultdict(float)
+        # Executions of each amino acid, by amino acid code
+        self.amino_acid_codes: Counter[int] = Counter()
+        self.terminations: Counter[Termination] = Counter()
+        self.edits: Counter[str] = Counter()
+        self.samples: list[dict[str, float]] = []
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def timed(self, name: str, func: Callable[..., T]) -> Callable[..., T]:
+        """Wrap a function so that its calls are counted and timed under `name`."""
+        timers, counters = self.timers, self.counters
+
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timers[name] += time.perf_counter() - start
+                counters[name] += 1
+
+        return wrapper
+
+    def record_execution(self, opcodes: bytes, n_executed: int, completed: bool) -> None:
+        """Record the amino acids a compiled enzyme executed and why it stopped.
+
+        An enzyme can stop on its last opcode, so whether it completed is passed in rather than told from the count.
+        """
+        self.amino_acid_codes.update(opcodes[:n_executed])
+        if completed:
+            self.terminations[Termination.COMPLETED] += 1
+        elif opcodes[n_executed - 1] == AMINO_ACID_CODES[AminoAcid.SWI]:
+            self.terminations[Termination.EMPTY_COMPLEMENT] += 1
+        else:
+            self.terminations[Termination.END_OF_STRAND] += 1
+
+    def record_rewrite(self, opcodes: bytes, execution: Optional[tuple[int, bool]]) -> None:
+        """Record a rewrite from the execution returned by `Engine.run`, which is None when the enzyme did not bind."""
+        if execution is None:
+            self.terminations[Termination.UNBOUND] += 1
+        else:
+            self.record_execution(opcodes, *execution)
+
+    def get_amino_acid_counts(self) -> dict[str, int]:
+        return {str(AMINO_ACIDS[code]): count for code, count in self.amino_acid_codes.most_common()}
+
+    def sample(self, **values: float) -> None:
+        self.samples.append({"elapsed": self.elapsed, **values})
+        if self.hook is not None:
+            self.hook(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        elapsed = self.elapsed
+        return {
+            "elapsed": elapsed,
+            "counters": dict(self.counters),
+            "throughput": {name: count / elapsed for name, count in self.counters.items()},
+            "timers": dict(self.timers),
+            "amino_acids": self.get_amino_acid_counts(),
+            "terminations": {termination.value: count for termination, count in self.terminations.most_common()},
+            "edits": dict(self.edits.most_common()),
+            "samples": self.samples,
+        }
+
+    def save(self, path: Path) -> None:
+        path.write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+
+    def log(self) -> None:
+        elapsed = self.elapsed
+        logger.info("Stats after %.2f seconds", elapsed)
+        for name, seconds in sorted(self.timers.items(), key=lambda item: -item[1]):
+            logger.info("  %s: %.3f s (%.0f%%)", name, seconds, 100 * seconds / elapsed)
+        for name, count in self.counters.most_common():
+            logger.info("  %s: %d (%.0f/s)", name, count, count / elapsed)
+        if len(self.amino_acid_codes) > 0:
+            amino_acid_counts = self.get_amino_acid_counts()
+            logger.info("  Amino acids: %s", ", ".join(f"{name}={n}" for name, n in amino_acid_counts.items()))
+        if len(self.terminations) > 0:
+            logger.info("  Terminations: %s", ", ".join(f"{t.value}={n}" for t, n in self.terminations.most_common()))
+        if len(self.edits) > 0:
+            logger.info("  Edits: %s", ", ".join(f"{edit}={n}" for edit, n in self.edits.most_common()))
@@ -0,0 +1,119 @@
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from typogenetics.typogenetics import AminoAcid, Base, BasePair, Enzyme, Rewriter, Strand, Termination
+
+# Written in place of a missing base when a pair is stored as its bound base followed by its complement
+GAP = "."
+
+
+@dataclass(frozen=True, slots=True)
+class TraceEvent:
+    """An amino acid applied by an enzyme, the unit and copy mode after it, and the base pairs it changed.
+
+    The change is a splice: `n_removed` pairs starting at `start` were replaced by the `inserted` pairs.
+    """
+
+    amino_acid: AminoAcid
+    unit: int
+    copy_mode: bool
+    start: int
+    n_removed: int
+    inserted: tuple[str, ...]
+
+
+class TraceRecorder:
+    """Records a structured trace of `Rewriter.rewrite`, which only pays for tracing when a recorder is passed in.
+
+    Each event only stores the pairs that an amino acid changed, so traces stay small for long strands, and the state
+    of the strand after every step is rebuilt when the trace is replayed.
+    """
+
+    def __init__(self) -> None:
+        self.enzyme: Optional[Enzyme] = None
+        self.strand: Optional[Strand] = None
+        self.unit: Optional[int] = None
+        self.events: list[TraceEvent] = []
+        self.termination: Optional[Termination] = None
+        self.strands: list[Strand] = []
+        self._pairs: tuple[str, ...] = ()
+
+    def start(self, enzyme: Enzyme, strand: Strand, unit: Optional[int]) -> None:
+        self.enzyme, self.strand, self.unit = enzyme, strand, unit
+        self._pairs = tuple(f"{base}{GAP}" for base in strand.iter_bases())
+
+    def record(self, amino_acid: AminoAcid, unit: int, copy_mode: bool, pairs: list[BasePair]) -> None:
+        new_pairs = tuple(self.pair_to_str(pair) for pair in pairs)
+        old_pairs = self._pairs
+        start = 0
+        max_common = min(len(old_pairs), len(new_pairs))
+        while start < max_common and old_pairs[start] == new_pairs[start]:
+            start += 1
+        old_end, new_end = len(old_pairs), len(new_pairs)
+        while old_end > start and new_end > start and old_pairs[old_end - 1] == new_pairs[new_end - 1]:
+            old_end -= 1
+            new_end -= 1
+
+        self.events.append(TraceEvent(amino_acid, unit, copy_mode, start, old_end - start, new_pairs[start:new_end]))
+        self._pairs = new_pairs
+
+    def finish(self, termination: Termination, strands: list[Strand]) -> None:
+        self.termination = termination
+        self.strands = list(strands)
+
+    def replay(self) -> Iterator[tuple[TraceEvent, list[str]]]:
+        """Yield every event along with the pairs after it."""
+        assert self.strand is not None
+        pairs = [f"{base}{GAP}" for base in self.strand.iter_bases()]
+        for event in self.events:
+            pairs[event.start : event.start + event.n_removed] = event.inserted
+            yield event, list(pairs)
+
+    def render(self) -> str:
+        assert self.enzyme is not None
+        assert self.strand is not None
+        lines = [f"Rewriting {self.strand} with {self.enzyme}, binding at unit {self.unit}"]
+        lines.append(self.pairs_to_string([f"{base}{GAP}" for base in self.strand.iter_bases()]))
+        for event, pairs in self.replay():
+            lines.append(f"Applied {event.amino_acid} -> unit {event.unit}, copy={event.copy_mode}")
+            lines.append(self.pairs_to_string(pairs))
+        lines.append(f"Stopped: {self.termination}")
+        lines.append(f"Produced: {', '.join(str(strand) for strand in self.strands)}")
+        return "\n".join(lines)
+
+    @classmethod
+    def pair_to_str(cls, pair: BasePair) -> str:
+        return f"{GAP if pair.bind is None else pair.bind}{GAP if pair.comp is None else pair.comp}"
+
+    @classmethod
+    def pairs_to_string(cls, pairs: list[str]) -> str:
+        base_pairs = [BasePair(*(None if c == GAP else Base.from_str(c) for c in pair)) for pair in pairs]
+        return Rewriter.pairs_to_string(base_pairs)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "enzyme": str(self.enzyme),
+            "strand": str(self.strand),
+            "unit": self.unit,
+            "events": [[*asdict(event).values()] for event in self.events],
+            "termination": self.termination,
+            "strands": [str(strand) for strand in self.strands],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TraceRecorder":
+        trace = cls()
+        trace.start(Enzyme.from_str(data["enzyme"]), Strand.from_str(data["strand"]), data["unit"])
+        for amino_acid, unit, copy_mode, start, n_removed, inserted in data["events"]:
+            trace.events.append(TraceEvent(AminoAcid(amino_acid), unit, copy_mode, start, n_removed, tuple(inserted)))
+        trace.finish(Termination(data["termination"]), [Strand.from_str(strand) for strand in data["strands"]])
+        return trace
+
+    def save(self, path: Path) -> None:
+        path.write_text(json.dumps(self.to_dict()) + "\n")
+
+    @classmethod
+    def load(cls, path: Path) -> "TraceRecorder":
+        return cls.from_dict(json.loads(path.read_text()))
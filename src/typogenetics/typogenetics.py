@@ -1,7 +1,14 @@
 import logging
 from dataclasses import dataclass
 from enum import StrEnum, auto
-from typing import Iterator, Optional
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional, Sequence, overload
+
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from typogenetics.stats import Stats
+    from typogenetics.trace import TraceRecorder
 
 logger = logging.getLogger(__name__)
 
@@ -70,47 +77,141 @@ class AminoAcid(StrEnum):
     LPU = auto()
 
 
+class Termination(StrEnum):
+    """Why an enzyme stopped rewriting a strand."""
+
+    COMPLETED = auto()
+    UNBOUND = auto()
+    END_OF_STRAND = auto()
+    EMPTY_COMPLEMENT = auto()
+
+
+# Amino acids indexed by the code of the duplet that translates to them. The AA duplet (code 0) is punctuation.
+AMINO_ACIDS: tuple[Optional[AminoAcid], ...] = (None, *AminoAcid)
+AMINO_ACID_CODES: dict[AminoAcid, int] = {amino_acid: code for code, amino_acid in enumerate(AminoAcid, start=1)}
+_CODE_AMINO_ACIDS = {code: amino_acid for amino_acid, code in AMINO_ACID_CODES.items()}
+
+BASES: tuple[Base, ...] = (Base.A, Base.C, Base.G, Base.T)
+BASE_CODES: dict[Base, int] = {base: code for code, base in enumerate(BASES)}
+
+_STR_TO_CODE = bytes(BASE_CODES[Base.from_str(chr(c))] if chr(c) in "ACGT" else 0xFF for c in range(256))
+_CODE_TO_STR = bytes.maketrans(bytes(range(4)), b"ACGT")
+
 Duplet = tuple[Base, Base]
 
+# Amino acid codes indexed by duplet code, so that translating a duplet code is a single gather
+_DUPLET_CODES = np.array(
+    [0 if amino_acid is None else AMINO_ACID_CODES[amino_acid] for amino_acid in AMINO_ACIDS], dtype=np.uint8
+)
+
 
-@dataclass
 class Strand:
-    bases: list[Base]
+    """A strand of bases stored as one byte code per base.
+
+    Bases are encoded in alphabetical order (A=0, C=1, G=2, T=3), so the complement of a code is ``3 - code``,
+    purines have even codes, and the code of a duplet is ``4 * first + second``.
+    """
+
+    __slots__ = ("_first_units", "codes")
+
+    codes: bytes
+    _first_units: tuple[int, int, int, int]
+
+    def __init__(self, bases: Iterable[Base]) -> None:
+        self.codes = bytes(BASE_CODES[base] for base in bases)
+
+    @classmethod
+    def from_codes(cls, codes: bytes | bytearray | memoryview) -> "Strand":
+        strand = cls.__new__(cls)
+        strand.codes = bytes(codes)
+        return strand
 
     @classmethod
     def from_str(cls, strand_str: str) -> "Strand":
-        bases = []
-        for base_str in strand_str:
-            if base_str == " ":
-                continue
-            base = Base.from_str(base_str)
-            bases.append(base)
-        return cls(bases)
+        raw = strand_str.replace(" ", "").encode("ascii")
+        codes = raw.translate(_STR_TO_CODE)
+        if len(codes) > 0 and max(codes) > 3:  # noqa: PLR2004
+            msg = f"Invalid base in strand: {strand_str}"
+            raise ValueError(msg)
+        return cls.from_codes(codes)
+
+    @classmethod
+    def unpack(cls, packed: bytes, length: int) -> "Strand":
+        """Inverse of `Strand.pack`."""
+        packed_array = np.frombuffer(packed, dtype=np.uint8)
+        codes = np.empty((len(packed_array), 4), dtype=np.uint8)
+        for i, shift in enumerate((6, 4, 2, 0)):
+            codes[:, i] = (packed_array >> shift) & 3
+        return cls.from_codes(codes.reshape(-1)[:length].tobytes())
+
+    def pack(self) -> bytes:
+        """Pack four bases into each byte, first base in the high bits. The length must be stored separately."""
+        padded = np.zeros(-(-len(self) // 4) * 4, dtype=np.uint8)
+        padded[: len(self)] = self.to_array()
+        quads = padded.reshape(-1, 4)
+        return ((quads[:, 0] << 6) | (quads[:, 1] << 4) | (quads[:, 2] << 2) | quads[:, 3]).tobytes()
+
+    @property
+    def first_units(self) -> tuple[int, int, int, int]:
+        """First unit of each base code in the strand, or -1 for bases that do not occur.
+
+        Enzymes bind to the first occurrence of their binding base, and strands are immutable, so the index is built
+        the first time an enzyme binds to a strand and kept with it.
+        """
+        try:
+            return self._first_units
+        except AttributeError:
+            codes = self.codes
+            self._first_units = (codes.find(0), codes.find(1), codes.find(2), codes.find(3))
+            return self._first_units
+
+    def to_array(self) -> npt.NDArray[np.uint8]:
+        """Read-only view of the base codes that shares memory with the strand."""
+        return np.frombuffer(self.codes, dtype=np.uint8)
+
+    @property
+    def bases(self) -> list[Base]:
+        return [BASES[code] for code in self.codes]
 
     def iter_bases(self) -> Iterator[Base]:
-        yield from self.bases
+        for code in self.codes:
+            yield BASES[code]
 
     def iter_duplets(self) -> Iterator[Duplet]:
-        unit = 0
-        while True:
-            if unit + 1 >= len(self):
-                break
-
-            yield (self[unit], self[unit + 1])
-
-            unit += 2
+        codes = self.codes
+        for unit in range(0, len(codes) - 1, 2):
+            yield (BASES[codes[unit]], BASES[codes[unit + 1]])
 
     def __repr__(self) -> str:
-        return "".join([str(b) for b in self.bases])
+        return self.codes.translate(_CODE_TO_STR).decode("ascii")
 
     def __str__(self) -> str:
         return self.__repr__()
 
-    def __getitem__(self, unit: int) -> Base:
-        return self.bases[unit]
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Strand):
+            return NotImplemented
+        return self.codes == other.codes
+
+    def __hash__(self) -> int:
+        return hash(self.codes)
+
+    def __reduce__(self) -> tuple[Callable[[bytes], "Strand"], tuple[bytes]]:
+        return (Strand.from_codes, (self.codes,))
+
+    @overload
+    def __getitem__(self, unit: int) -> Base: ...
+
+    @overload
+    def __getitem__(self, unit: slice) -> "Strand": ...
+
+    def __getitem__(self, unit: int | slice) -> "Base | Strand":
+        if isinstance(unit, slice):
+            return Strand.from_codes(self.codes[unit])
+        return BASES[self.codes[unit]]
 
     def __len__(self) -> int:
-        return len(self.bases)
+        return len(self.codes)
 
 
 @dataclass
@@ -128,6 +229,13 @@ class Enzyme:
             amino_acids.append(amino_acid)
         return cls(amino_acids)
 
+    @classmethod
+    def from_codes(cls, codes: bytes) -> "Enzyme":
+        return cls(list(map(_CODE_AMINO_ACIDS.__getitem__, codes)))
+
+    def to_codes(self) -> bytes:
+        return bytes(AMINO_ACID_CODES[amino_acid] for amino_acid in self.amino_acids)
+
     def __repr__(self) -> str:
         return "-".join([str(b) for b in self.amino_acids])
 
@@ -154,43 +262,62 @@ class Translator:
 
     @classmethod
     def translate(cls, strand: Strand) -> list[Enzyme]:
-        enzymes = []
-        amino_acids: list[AminoAcid] = []
-        for duplet in strand.iter_duplets():
-            amino_acid = cls._translate_duplet(duplet)
-            if amino_acid is None and len(amino_acids) > 0:
-                enzyme = Enzyme(amino_acids)
-                enzymes.append(enzyme)
-                amino_acids = []
-            elif amino_acid is not None:
-                amino_acids.append(amino_acid)
-
-        if len(amino_acids) > 0:
-            enzyme = Enzyme(amino_acids)
-            enzymes.append(enzyme)
-
-        return enzymes
+        return [Enzyme.from_codes(codes) for codes in cls.translate_codes(strand)]
+
+    @classmethod
+    def translate_codes(cls, strand: Strand) -> list[bytes]:
+        """Translate a strand, returning the amino acid codes of each enzyme."""
+        codes = strand.codes
+        n_duplets = len(codes) // 2
+        # Base codes fit in two bits, so adding the big-endian integers of the first and second bases of each duplet
+        # computes every duplet code at once without carries.
+        firsts = int.from_bytes(codes[: 2 * n_duplets : 2])
+        seconds = int.from_bytes(codes[1 : 2 * n_duplets : 2])
+        duplet_codes = (4 * firsts + seconds).to_bytes(n_duplets)
+        return [genes for genes in duplet_codes.split(b"\x00") if len(genes) > 0]
+
+    @classmethod
+    def translate_batch(cls, strands: Sequence[Strand]) -> list[list[Enzyme]]:
+        return [[Enzyme.from_codes(codes) for codes in genes] for genes in cls.translate_codes_batch(strands)]
+
+    @classmethod
+    def translate_codes_batch(cls, strands: Sequence[Strand]) -> list[list[bytes]]:
+        """Translate many strands at once, returning the amino acid codes of each enzyme of each strand.
+
+        All strands are concatenated into one buffer so that duplet codes, punctuation and enzyme boundaries are found
+        with a handful of NumPy operations regardless of the number of strands.
+        """
+        lengths = np.fromiter((len(strand.codes) for strand in strands), dtype=np.int64, count=len(strands))
+        n_duplets = lengths // 2
+        total_duplets = int(n_duplets.sum())
+        if total_duplets == 0:
+            return [[] for _ in strands]
+
+        buffer = np.frombuffer(b"".join(strand.codes for strand in strands), dtype=np.uint8)
+        strand_starts = np.cumsum(lengths) - lengths
+        duplet_starts = np.cumsum(n_duplets) - n_duplets
+        duplet_strands = np.repeat(np.arange(len(strands)), n_duplets)
+        duplet_units = np.arange(total_duplets) - duplet_starts[duplet_strands]
+        positions = strand_starts[duplet_strands] + 2 * duplet_units
+        codes = _DUPLET_CODES[4 * buffer[positions] + buffer[positions + 1]]
+
+        coding = codes != 0
+        first_of_strand = duplet_units == 0
+        last_of_strand = np.append(first_of_strand[1:], True)
+        gene_starts = np.flatnonzero(coding & (first_of_strand | ~np.insert(coding[:-1], 0, False)))
+        gene_ends = np.flatnonzero(coding & (last_of_strand | ~np.append(coding[1:], False))) + 1
+
+        code_bytes = codes.tobytes()
+        gene_codes = [
+            code_bytes[start:end] for start, end in zip(gene_starts.tolist(), gene_ends.tolist(), strict=True)
+        ]
+        bounds = np.searchsorted(duplet_strands[gene_starts], np.arange(len(strands) + 1)).tolist()
+        return [gene_codes[bounds[i] : bounds[i + 1]] for i in range(len(strands))]
 
     @classmethod
     def _translate_duplet(cls, duplet: Duplet) -> Optional[AminoAcid]:
-        return {
-            (Base.A, Base.A): None,
-            (Base.A, Base.C): AminoAcid.CUT,
-            (Base.A, Base.G): AminoAcid.DEL,
-            (Base.A, Base.T): AminoAcid.SWI,
-            (Base.C, Base.A): AminoAcid.MVR,
-            (Base.C, Base.C): AminoAcid.MVL,
-            (Base.C, Base.G): AminoAcid.COP,
-            (Base.C, Base.T): AminoAcid.OFF,
-            (Base.G, Base.A): AminoAcid.INA,
-            (Base.G, Base.C): AminoAcid.INC,
-            (Base.G, Base.G): AminoAcid.ING,
-            (Base.G, Base.T): AminoAcid.INT,
-            (Base.T, Base.A): AminoAcid.RPY,
-            (Base.T, Base.C): AminoAcid.RPU,
-            (Base.T, Base.G): AminoAcid.LPY,
-            (Base.T, Base.T): AminoAcid.LPU,
-        }[duplet]
+        first, second = duplet
+        return AMINO_ACIDS[4 * BASE_CODES[first] + BASE_CODES[second]]
 
 
 class Orientation(StrEnum):
@@ -252,11 +379,29 @@ class Folder:
 
     @classmethod
     def fold(cls, enzyme: Enzyme) -> Orientation:
-        turning_number = 0
-        for amino_acid in enzyme.iter_amino_acids():
-            turn = cls.get_turn(amino_acid)
-            turning_number += turn.to_int()
-        return Orientation.from_turning_number(turning_number)
+        turning_number = sum(map(_AMINO_ACID_TURNS.__getitem__, enzyme.amino_acids))
+        return ORIENTATIONS[turning_number % 4]
+
+    @classmethod
+    def fold_batch(cls, enzymes: Sequence[Enzyme]) -> list[Orientation]:
+        turning_numbers = cls.get_turning_numbers_batch([enzyme.to_codes() for enzyme in enzymes])
+        return [ORIENTATIONS[turning_number] for turning_number in turning_numbers.tolist()]
+
+    @classmethod
+    def get_turning_numbers_batch(cls, genes: Sequence[bytes]) -> npt.NDArray[np.int64]:
+        """Turning numbers modulo 4 of enzymes given as amino acid codes, from one pass over all of their codes."""
+        lengths = np.fromiter(map(len, genes), dtype=np.int64, count=len(genes))
+        turns = _CODE_TURNS_ARRAY[np.frombuffer(b"".join(genes), dtype=np.uint8)]
+        cumulative_turns = np.concatenate(([0], np.cumsum(turns)))
+        ends = np.cumsum(lengths)
+        turning_numbers: npt.NDArray[np.int64] = (cumulative_turns[ends] - cumulative_turns[ends - lengths]) % 4
+        return turning_numbers
+
+    @classmethod
+    def get_binding_codes_batch(cls, genes: Sequence[bytes]) -> npt.NDArray[np.uint8]:
+        """Codes of the bases that enzymes given as amino acid codes bind to."""
+        binding_codes: npt.NDArray[np.uint8] = _BINDING_CODES_ARRAY[cls.get_turning_numbers_batch(genes)]
+        return binding_codes
 
     @classmethod
     def get_turn(cls, amino_acid: AminoAcid) -> Turn:
@@ -282,10 +427,14 @@ class Folder:
     def get_binding_site(cls, enzyme: Enzyme, strand: Strand) -> Optional[int]:
         orientation = cls.fold(enzyme)
         binding_affinity = cls.get_binding_affinity(orientation)
-        for unit, base in enumerate(strand.iter_bases()):
-            if base == binding_affinity:
-                return unit
-        return None
+        unit = strand.first_units[BASE_CODES[binding_affinity]]
+        return None if unit < 0 else unit
+
+    @classmethod
+    def get_binding_sites_batch(cls, enzymes: Sequence[Enzyme], strand: Strand) -> list[Optional[int]]:
+        first_units = strand.first_units
+        binding_codes = cls.get_binding_codes_batch([enzyme.to_codes() for enzyme in enzymes])
+        return [None if first_units[code] < 0 else first_units[code] for code in binding_codes.tolist()]
 
     @classmethod
     def get_binding_affinity(cls, orientation: Orientation) -> Base:
@@ -297,6 +446,16 @@ class Folder:
         }[orientation]
 
 
+# Turn of each amino acid, also indexed by amino acid code with no turn for punctuation
+_AMINO_ACID_TURNS = {amino_acid: Folder.get_turn(amino_acid).to_int() for amino_acid in AminoAcid}
+CODE_TURNS: tuple[int, ...] = tuple(0 if aa is None else _AMINO_ACID_TURNS[aa] for aa in AMINO_ACIDS)
+# Orientation and binding base code of each turning number modulo 4
+ORIENTATIONS: tuple[Orientation, ...] = tuple(Orientation.from_turning_number(n) for n in range(4))
+BINDING_CODES: tuple[int, ...] = tuple(BASE_CODES[Folder.get_binding_affinity(o)] for o in ORIENTATIONS)
+_CODE_TURNS_ARRAY = np.array(CODE_TURNS, dtype=np.int64)
+_BINDING_CODES_ARRAY = np.array(BINDING_CODES, dtype=np.uint8)
+
+
 @dataclass
 class BasePair:
     bind: Optional[Base]
@@ -333,22 +492,36 @@ class Rewriter:
 
     # pylint: disable=too-many-branches
     @classmethod
-    def rewrite(cls, enzyme: Enzyme, strand: Strand) -> list[Strand]:  # noqa: PLR0912, PLR0915
+    def rewrite(  # noqa: PLR0912, PLR0915
+        cls,
+        enzyme: Enzyme,
+        strand: Strand,
+        stats: Optional["Stats"] = None,
+        trace: Optional["TraceRecorder"] = None,
+    ) -> list[Strand]:
         copy_mode = False
 
         unit = Folder.get_binding_site(enzyme, strand)
         logger.debug("Rewriting strand %s with enzyme %s, unit=%s", strand, enzyme, unit)
+        if trace is not None:
+            trace.start(enzyme, strand, unit)
         if unit is None:
+            if stats is not None:
+                stats.terminations[Termination.UNBOUND] += 1
+            if trace is not None:
+                trace.finish(Termination.UNBOUND, [strand])
             return [strand]
 
         pairs = [BasePair(base, None) for base in strand.iter_bases()]
 
         logger.debug("Init @ %d, copy=%s", unit, copy_mode)
-        logger.debug(cls.pairs_to_string(pairs))
 
         strands = []
+        termination = Termination.COMPLETED
         for amino_acid in enzyme.iter_amino_acids():
             logger.debug("Applying %s @ %d, copy=%s", amino_acid, unit, copy_mode)
+            if stats is not None:
+                stats.amino_acid_codes[AMINO_ACID_CODES[amino_acid]] += 1
 
             if amino_acid == AminoAcid.CUT:
                 cut_pairs = pairs[unit + 1 :]
@@ -361,13 +534,16 @@ class Rewriter:
                 # after a deletion, we here we choose left arbitrarily.
                 if unit < 0:
                     logger.debug("Reached end of strand")
+                    termination = Termination.END_OF_STRAND
                     break
                 if pairs[unit].bind is None:
                     logger.debug("Reached end of strand")
+                    termination = Termination.END_OF_STRAND
                     break
             elif amino_acid == AminoAcid.SWI:
                 if pairs[unit].comp is None:
                     logger.debug("Tried to switch to empty base pair complement")
+                    termination = Termination.EMPTY_COMPLEMENT
                     break
                 for pair in pairs:
                     pair.swap()
@@ -377,9 +553,11 @@ class Rewriter:
                 unit += cls.amino_acid_to_direction(amino_acid)
                 if unit < 0 or unit >= len(pairs):
                     logger.debug("Reached end of strand")
+                    termination = Termination.END_OF_STRAND
                     break
                 if pairs[unit].bind is None:
                     logger.debug("Reached end of strand")
+                    termination = Termination.END_OF_STRAND
                     break
                 if copy_mode:
                     pairs[unit].add_comp()
@@ -412,11 +590,20 @@ class Rewriter:
                         break
                 if end_of_strand:
                     logger.debug("Reached end of strand")
+                    termination = Termination.END_OF_STRAND
                     break
 
-            logger.debug(cls.pairs_to_string(pairs))
+            if trace is not None:
+                trace.record(amino_acid, unit, copy_mode, pairs)
 
+        if stats is not None:
+            stats.terminations[termination] += 1
+        if trace is not None and termination != Termination.COMPLETED:
+            # The amino acid that stopped the enzyme broke out of the loop before it was recorded
+            trace.record(amino_acid, unit, copy_mode, pairs)
         strands += cls.strands_from_pairs(pairs)
+        if trace is not None:
+            trace.finish(termination, strands)
         return strands
 
     @classmethod
@@ -0,0 +1,32 @@
+from pathlib import Path
+
+from typogenetics.bench import Bench, iter_benchmarks
+
+
+class TestBench:
+    def test_benchmarks(self) -> None:
+        names = set()
+        for benchmark in iter_benchmarks():
+            names.add(benchmark.name.split("/")[0])
+            if not benchmark.name.startswith("search."):
+                benchmark.setup()()
+        # The paths the search loops run are timed, not only the reference implementations
+        assert {
+            "engine.rewrite",
+            "engine.sweep",
+            "translator.translate_codes",
+            "translator.translate_codes_batch",
+        } <= names
+
+    def test_run(self, tmp_path: Path) -> None:
+        results = Bench.run("strand.from_str", min_time=0.001, n_repeats=1)
+        assert set(results) == {"strand.from_str/16", "strand.from_str/256", "strand.from_str/4096"}
+        assert all(seconds > 0 for seconds in results.values())
+
+        path = tmp_path / "baseline.json"
+        Bench.save(results, path)
+        assert Bench.load(path) == results
+
+    def test_compare(self) -> None:
+        comparisons = Bench.compare({"a": 1.0, "b": 2.0, "c": 1.0}, {"a": 1.5, "b": 1.0, "d": 1.0})
+        assert [(comparison.name, comparison.ratio) for comparison in comparisons] == [("a", 1.5), ("b", 0.5)]
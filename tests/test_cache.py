@@ -0,0 +1,68 @@
+import numpy as np
+
+from typogenetics.cache import PhenotypeCache, RewriteCache
+from typogenetics.engine import Compiler, Engine
+from typogenetics.search import Search
+from typogenetics.stats import Stats
+from typogenetics.typogenetics import Enzyme, Strand
+
+
+class TestRewriteCache:
+    def test_rewrite(self) -> None:
+        cache = RewriteCache(10_000)
+        program = Compiler.compile(Enzyme.from_str("cop-ina-rpy-off"))
+        strand = Strand.from_str("CGGATACTAAACCGA")
+        assert cache.rewrite(program, strand) == Engine.rewrite(program, strand)
+        assert cache.rewrite(program, strand) == Engine.rewrite(program, strand)
+        assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 0)
+        assert cache.hit_rate == 0.5
+
+    def test_eviction(self) -> None:
+        cache = RewriteCache(1_000)
+        program = Compiler.compile(Enzyme.from_str("cop-ina-rpy-off"))
+        strands = [Strand.from_str(s) for s in ["CGGATACTAAACCGA", "GGA", "GTTTG", "GACGT"]]
+        for strand in strands:
+            cache.rewrite(program, strand)
+        assert cache.evictions > 0
+        assert cache.n_bytes <= cache.max_bytes
+        cache.rewrite(program, strands[-1])
+        assert cache.hits == 1
+
+    def test_random(self) -> None:
+        cache = RewriteCache(10_000_000)
+        init_strand = Strand.from_str("ATAGCGAATAGGATAATG")
+        stats, cached_stats = Stats(), Stats()
+        population = Search.random(init_strand, 2000, np.random.default_rng(42), cache=cache, stats=cached_stats)
+        assert population.strands == Search.random(init_strand, 2000, np.random.default_rng(42), stats=stats).strands
+        assert cache.hits > 0
+        # Hits replay the execution of the rewrite they replace
+        assert cached_stats.amino_acid_codes == stats.amino_acid_codes
+        assert cached_stats.terminations == stats.terminations
+
+
+class TestPhenotypeCache:
+    def test_get(self) -> None:
+        apply_strand = Strand.from_str("CGGATACTAAACCGA")
+        phenotypes = PhenotypeCache(apply_strand)
+        program = Compiler.compile(Enzyme.from_str("cop-ina-rpy-off"))
+        assert phenotypes.get(program) == Strand.from_str("CGAGATACTAAACCGA")
+        assert phenotypes.get(program) == Strand.from_str("CGAGATACTAAACCGA")
+        assert (phenotypes.hits, phenotypes.misses) == (1, 1)
+
+    def test_unbound(self) -> None:
+        apply_strand = Strand.from_str("CCCC")
+        phenotypes = PhenotypeCache(apply_strand)
+        assert phenotypes.get(Compiler.compile(Enzyme.from_str("cop-ina-rpy-off"))) == apply_strand
+        assert phenotypes.unbound == 1
+        assert len(phenotypes) == 0
+
+    def test_eviction(self) -> None:
+        apply_strand = Strand.from_str("CGGATACTAAACCGA")
+        phenotypes = PhenotypeCache(apply_strand, max_bytes=500)
+        programs = [Compiler.compile(Enzyme.from_str(s)) for s in ["cop-ina-rpy-off", "cop-inc", "ina-rpy", "mvr-int"]]
+        expected = [max(Engine.rewrite(program, apply_strand), key=len) for program in programs]
+        assert [phenotypes.get(program) for program in programs] == expected
+        assert phenotypes.evictions > 0
+        assert phenotypes.n_bytes <= phenotypes.max_bytes
+        assert phenotypes.get(programs[-1]) == expected[-1]
+        assert phenotypes.hits == 1
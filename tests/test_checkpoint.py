@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from typogenetics.checkpoint import Checkpoint, pack_bytes, pack_strands, unpack_bytes, unpack_strands
+from typogenetics.dedup import BloomDedup, DiskDedup
+from typogenetics.search import Search
+from typogenetics.typogenetics import Strand
+
+
+class TestCheckpoint:
+    def test_save_load(self, tmp_path: Path) -> None:
+        path = tmp_path / "checkpoint.bin"
+        Checkpoint({"depth": 3}, {"a": b"\x00\x01", "b": b""}).save(path)
+        checkpoint = Checkpoint.load(path)
+        assert checkpoint.header == {"depth": 3}
+        assert checkpoint.sections == {"a": b"\x00\x01", "b": b""}
+
+    def test_pack_strands(self) -> None:
+        strands = [Strand.from_str("ACGTA"), Strand.from_str(""), Strand.from_str("TTG")]
+        assert unpack_strands(pack_strands(strands)) == strands
+        assert unpack_bytes(pack_bytes([b"\x01\x02", b"\x03"])) == [b"\x01\x02", b"\x03"]
+
+
+class TestResume:
+    def test_random(self, tmp_path: Path) -> None:
+        init_strand = Strand.from_str("ATAGCGAATAGGATAATG")
+        path = tmp_path / "random.bin"
+        expected = Search.random(init_strand, 2000, np.random.default_rng(42))
+        Search.random(init_strand, 1000, np.random.default_rng(42), checkpoint_path=path, checkpoint_interval=300)
+        resumed = Search.random(init_strand, 2000, np.random.default_rng(0), checkpoint_path=path, resume=True)
+        assert resumed.strands == expected.strands
+        assert resumed.pool == expected.pool
+
+    def test_random_bloom(self, tmp_path: Path) -> None:
+        init_strand = Strand.from_str("ATAGCGAATAGGATAATG")
+        path = tmp_path / "random.bin"
+        expected = Search.random(init_strand, 2000, np.random.default_rng(42), seen=BloomDedup())
+        Search.random(init_strand, 1000, np.random.default_rng(42), seen=BloomDedup(), checkpoint_path=path)
+        resumed = Search.random(init_strand, 2000, np.random.default_rng(0), checkpoint_path=path, resume=True)
+        assert resumed.strands == expected.strands
+
+    def test_bfs(self, tmp_path: Path) -> None:
+        init_strand = Strand.from_str("ATAAACGATAATTGACAGAGCGAATG")
+        apply_strand = Strand.from_str("ATCGATAGGGAACATGTCGT")
+        path = tmp_path / "bfs.bin"
+        expected = Search.bfs(init_strand, apply_strand, 4, 5, np.random.default_rng(42))
+        seen = DiskDedup(path=tmp_path / "seen.sqlite", max_memory_bytes=1_000)
+        Search.bfs(init_strand, apply_strand, 2, 5, np.random.default_rng(42), seen=seen, checkpoint_path=path)
+        seen.close()
+        resumed = Search.bfs(
+            init_strand, apply_strand, 4, 5, np.random.default_rng(0), checkpoint_path=path, resume=True
+        )
+        assert resumed == expected
+
+    def test_bfs_closes_restored(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        init_strand = Strand.from_str("ATAAACGATAATTGACAGAGCGAATG")
+        apply_strand = Strand.from_str("ATCGATAGGGAACATGTCGT")
+        path = tmp_path / "bfs.bin"
+        seen = DiskDedup(path=tmp_path / "seen.sqlite")
+        Search.bfs(init_strand, apply_strand, 2, 5, np.random.default_rng(42), seen=seen, checkpoint_path=path)
+        seen.close()
+
+        closed: list[DiskDedup] = []
+        close = DiskDedup.close
+        monkeypatch.setattr(DiskDedup, "close", lambda disk: closed.append(disk) or close(disk))
+        Search.bfs(init_strand, apply_strand, 4, 5, np.random.default_rng(0), checkpoint_path=path, resume=True)
+        assert len(closed) == 1
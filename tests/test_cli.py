@@ -0,0 +1,22 @@
+from typer.testing import CliRunner
+
+from typogenetics.cli import app
+
+INIT_STRAND = "ATAGCGAATAGGATAATG"
+
+
+class TestCli:
+    def test_simulate_shared_options(self) -> None:
+        runner = CliRunner()
+        result = runner.invoke(app, ["simulate", INIT_STRAND, "--shared", "--no-info"])
+        assert isinstance(result.exception, ValueError)
+        assert "more than one worker" in str(result.exception)
+
+        for option in ["--max-strands", "--max-bases"]:
+            result = runner.invoke(app, ["simulate", INIT_STRAND, "--workers", "2", option, "100", "--no-info"])
+            assert isinstance(result.exception, ValueError)
+            assert "only size the population" in str(result.exception)
+
+        result = runner.invoke(app, ["simulate", INIT_STRAND, "--workers", "2", "--shared", "--stats", "--no-info"])
+        assert isinstance(result.exception, ValueError)
+        assert "do not support --stats" in str(result.exception)
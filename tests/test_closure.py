@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from typogenetics.closure import Closure
+from typogenetics.engine import Engine
+from typogenetics.search import Search
+from typogenetics.sink import NdjsonSink, Sink, SinkFormat
+from typogenetics.typogenetics import Strand
+
+
+class TestClosure:
+    def test_run(self) -> None:
+        closure = Closure([Strand.from_str("CGGATACTAAACCGA")], max_length=12)
+        population = closure.run()
+        assert closure.complete
+        assert len(population) == 35
+        assert len(closure.programs) == 15
+        assert len(closure.rounds) == 13
+        assert sum(closure_round.n_pairs for closure_round in closure.rounds) == len(population) * len(closure.programs)
+        assert closure.rounds[-1].n_new_strands == 0
+
+        for program in closure.programs:
+            for strand in population:
+                for new_strand in Engine.rewrite(program, strand):
+                    assert len(new_strand) > 12 or new_strand in population.seen
+
+    def test_max_strands(self) -> None:
+        closure = Closure([Strand.from_str("ACGT")], max_length=12, max_strands=100)
+        population = closure.run()
+        assert closure.truncated
+        assert not closure.complete
+        assert len(population) == 100
+
+    def test_max_rounds(self) -> None:
+        closure = Closure([Strand.from_str("CGGATACTAAACCGA")], max_length=12)
+        closure.run(max_rounds=2)
+        assert len(closure.rounds) == 2
+        assert not closure.complete
+        closure.run()
+        assert closure.complete
+        assert len(closure.population) == 35
+
+    def test_search(self, tmp_path: Path) -> None:
+        path = tmp_path / "closure.ndjson"
+        with Sink.open(path, SinkFormat.NDJSON) as sink:
+            population = Search.closure(Strand.from_str("CGGATACTAAACCGA"), max_length=12, sink=sink)
+        records = list(NdjsonSink.read(path))
+        assert [strand for strand, _ in records] == population.strands
+        assert records[0] == (Strand.from_str("CGGATACTAAACCGA"), 0)
@@ -0,0 +1,83 @@
+import itertools
+from pathlib import Path
+
+from typogenetics.dedup import BloomDedup, DiskDedup, Interner
+from typogenetics.population import Population
+from typogenetics.typogenetics import Strand
+
+
+def get_strands(n: int) -> list[Strand]:
+    """The first n distinct strands of five bases."""
+    return [Strand.from_str("".join(bases)) for bases in itertools.islice(itertools.product("ACGT", repeat=5), n)]
+
+
+class TestInterner:
+    def test_intern(self) -> None:
+        interner = Interner()
+        assert interner.intern(Strand.from_str("ACGT")) == (0, True)
+        assert interner.intern(Strand.from_str("CG")) == (1, True)
+        assert interner.intern(Strand.from_str("AC GT")) == (0, False)
+        assert interner.get_id(Strand.from_str("CG")) == 1
+        assert interner.get_id(Strand.from_str("C")) is None
+        assert interner[1] == Strand.from_str("CG")
+        assert len(interner) == 2
+
+
+class TestBloomDedup:
+    def test_add(self) -> None:
+        seen = BloomDedup()
+        assert seen.add(Strand.from_str("ACGT"))
+        assert not seen.add(Strand.from_str("AC GT"))
+        assert Strand.from_str("ACGT") in seen
+        assert Strand.from_str("CG") not in seen
+        assert len(seen) == 1
+
+    def test_scale(self) -> None:
+        seen = BloomDedup(fp_rate=1e-4, initial_capacity=64)
+        strands = get_strands(1_000)
+        n_new = sum(seen.add(strand) for strand in strands)
+        assert n_new >= 999
+        assert len(seen.filters) > 1
+        assert all(strand in seen for strand in strands)
+
+    def test_memory_cap(self) -> None:
+        seen = BloomDedup(fp_rate=1e-4, max_bytes=1_000, initial_capacity=64)
+        for strand in get_strands(1_000):
+            seen.add(strand)
+        assert seen.saturated
+        assert seen.n_bytes <= 1_000
+
+
+class TestDiskDedup:
+    def test_spill(self, tmp_path: Path) -> None:
+        seen = DiskDedup(path=tmp_path / "seen.sqlite", max_memory_bytes=1_000)
+        strands = get_strands(100)
+        assert all(seen.add(strand) for strand in strands)
+        assert not any(seen.add(strand) for strand in strands)
+        assert len(seen) == 100
+        seen.close()
+
+    def test_population(self) -> None:
+        seen = DiskDedup()
+        population = Population([Strand.from_str("ACGT")], seen=seen)
+        assert not population.add(Strand.from_str("ACGT"))
+        assert population.add(Strand.from_str("CG"))
+        assert len(population) == 2
+        seen.close()
+
+    def test_reuse_path(self, tmp_path: Path) -> None:
+        path = tmp_path / "seen.sqlite"
+        strand = Strand.from_str("ACGT")
+        seen = DiskDedup(path=path)
+        seen.add(strand)
+        meta, data = seen.dump()
+        seen.close()
+
+        # Restoring a checkpoint keeps the strands spilled before it, while a new run starts empty
+        restored = DiskDedup.load(meta, data)
+        assert strand in restored
+        restored.close()
+        seen = DiskDedup(path=path)
+        assert len(seen) == 0
+        assert seen.add(strand)
+        seen.close()
@@ -0,0 +1,75 @@
+import numpy as np
+
+from typogenetics.engine import EMPTY, Compiler, Engine, Program, RewriteState
+from typogenetics.typogenetics import AminoAcid, Base, Enzyme, Rewriter, Strand
+
+
+class TestEngine:
+    def test_compile(self) -> None:
+        enzyme = Enzyme.from_str("cop-ina-rpy-off")
+        program = Compiler.compile(enzyme)
+        assert program == Program(bytes([6, 8, 12, 7]), Strand([Base.G]).codes[0])
+        assert Compiler.decompile(program) == enzyme
+
+    def test_compile_codes_batch(self) -> None:
+        rng = np.random.default_rng(42)
+        genes = [bytes(rng.integers(1, 16, rng.integers(0, 12)).tolist()) for _ in range(500)]
+        assert Compiler.compile_codes_batch(genes) == [Compiler.compile_codes(codes) for codes in genes]
+        assert Compiler.compile_codes_batch([]) == []
+
+    def test_rewrite(self) -> None:
+        program = Compiler.compile(Enzyme.from_str("cop-ina-rpy-off"))
+        strand = Strand.from_str("CGGATACTAAACCGA")
+        assert Engine.rewrite(program, strand) == [
+            Strand.from_str("ATCTC"),
+            Strand.from_str("CGAGATACTAAACCGA"),
+        ]
+
+    def test_rewrite_matches_rewriter(self) -> None:
+        rng = np.random.default_rng(42)
+        amino_acids = list(AminoAcid)
+        for _ in range(2000):
+            strand = Strand.from_codes(bytes(rng.integers(0, 4, rng.integers(1, 30)).tolist()))
+            enzyme = Enzyme([amino_acids[i] for i in rng.integers(0, len(amino_acids), rng.integers(1, 12))])
+            assert Engine.rewrite(Compiler.compile(enzyme), strand) == Rewriter.rewrite(enzyme, strand)
+
+    def test_execute_switch(self) -> None:
+        state = RewriteState(Strand.from_str("ACGT"), 1)
+        program = Compiler.compile(Enzyme.from_str("cop-mvr-swi-ina"))
+        assert Engine.execute(state, program.opcodes)
+        assert state.flipped
+        assert state.live_codes() == (bytes([EMPTY, 1, 0, 2, EMPTY]), bytes([3, 2, 3, 1, 0]))
+        assert not Engine.execute(state, Compiler.compile(Enzyme.from_str("mvr-mvr-mvr")).opcodes)
+
+    def test_strands_from_codes(self) -> None:
+        bind = bytes([0, 1, EMPTY, 2, 3])
+        comp = bytes([EMPTY, 2, 1, EMPTY, 0])
+        assert Engine.strands_from_codes(bind, comp) == [
+            Strand.from_str("AC"),
+            Strand.from_str("CG"),
+            Strand.from_str("GT"),
+            Strand.from_str("A"),
+        ]
+
+    def test_fork(self) -> None:
+        state = RewriteState(Strand.from_str("ACGT"), 1)
+        assert Engine.execute(state, Compiler.compile(Enzyme.from_str("mvr")).opcodes)
+        fork = state.fork()
+        assert fork.primary is state.primary
+        assert Engine.execute(fork, Compiler.compile(Enzyme.from_str("cop-ina-cut")).opcodes)
+        assert fork.primary is not state.primary
+        assert state.materialize() == [Strand.from_str("ACGT")]
+        expected = RewriteState(Strand.from_str("ACGT"), 1)
+        assert Engine.execute(expected, Compiler.compile(Enzyme.from_str("mvr-cop-ina-cut")).opcodes)
+        assert fork.materialize() == expected.materialize()
+
+    def test_sweep(self) -> None:
+        for strand_str in ["CGGATACTAAACCGA", "AAAA", "GGTC", ""]:
+            strand = Strand.from_str(strand_str)
+            results = list(Engine.sweep(strand, 3))
+            assert len(results) == 15 + 15**2 + 15**3
+            assert len({program.opcodes for program, _ in results}) == len(results)
+            for program, strands in results:
+                assert program == Compiler.compile_codes(program.opcodes)
+                assert strands == Engine.rewrite(program, strand)
+        assert list(Engine.sweep(Strand.from_str("ACGT"), 0)) == []
@@ -0,0 +1,88 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from typogenetics.gpmap import (
+    GenotypePhenotypeMap,
+    PhenotypeKind,
+    get_genotype_id,
+    get_genotype_offset,
+    get_strand,
+)
+from typogenetics.search import Search
+from typogenetics.typogenetics import Strand, Translator
+
+APPLY_STRAND = Strand.from_str("ATCGATAGGGAACATGTCGT")
+
+
+class TestGenotypePhenotypeMap:
+    def test_genotype_ids(self) -> None:
+        assert get_genotype_offset(1) == 0
+        assert get_genotype_offset(3) == 4 + 16
+        assert get_genotype_id(Strand.from_str("A")) == 0
+        assert get_genotype_id(Strand.from_str("AA")) == 4
+        assert get_genotype_id(Strand.from_str("TT")) == 19
+        for genotype_id in range(get_genotype_offset(6)):
+            assert get_genotype_id(get_strand(genotype_id)) == genotype_id
+
+    def test_function(self, tmp_path: Path) -> None:
+        gpmap = GenotypePhenotypeMap.build(tmp_path, 6, apply_strand=APPLY_STRAND, chunk_size=100)
+        assert len(gpmap) == get_genotype_offset(7)
+        for genotype_id in range(len(gpmap)):
+            strand = get_strand(genotype_id)
+            assert gpmap.get_function(gpmap.get_key(strand)) == Search.get_largest_rewrite_strand(strand, APPLY_STRAND)
+            assert genotype_id in gpmap.get_genotype_ids(gpmap.get_phenotype_id(strand))
+        n_genotypes = sum(len(gpmap.get_genotype_ids(phenotype_id)) for phenotype_id in range(gpmap.n_phenotypes))
+        assert n_genotypes == len(gpmap)
+
+    def test_translation(self, tmp_path: Path) -> None:
+        gpmap = GenotypePhenotypeMap.build(tmp_path, 6, PhenotypeKind.TRANSLATION, chunk_size=100)
+        for genotype_id in range(len(gpmap)):
+            strand = get_strand(genotype_id)
+            assert gpmap.get_translation(gpmap.get_key(strand)) == Translator.translate_codes(strand)
+        phenotype_id = gpmap.get_phenotype_id(Strand.from_str("CG"))
+        assert Strand.from_str("CGA") in gpmap.get_strands(phenotype_id)
+        assert gpmap.find_phenotype_id(1 << 60) is None
+
+    def test_resume(self, tmp_path: Path) -> None:
+        expected = GenotypePhenotypeMap.build(tmp_path / "expected", 6, apply_strand=APPLY_STRAND, chunk_size=100)
+
+        path = tmp_path / "resumed"
+        GenotypePhenotypeMap.build(path, 6, apply_strand=APPLY_STRAND, chunk_size=100)
+        manifest = json.loads((path / "manifest.json").read_text())
+        manifest.update(complete=False, n_chunks_done=10)
+        (path / "manifest.json").write_text(json.dumps(manifest))
+        with pytest.raises(ValueError, match="has not been finished"):
+            GenotypePhenotypeMap(path)
+        with pytest.raises(ValueError, match="chunk_size"):
+            GenotypePhenotypeMap.build(path, 6, apply_strand=APPLY_STRAND, chunk_size=50, resume=True)
+
+        resumed = GenotypePhenotypeMap.build(path, 6, apply_strand=APPLY_STRAND, chunk_size=100, resume=True)
+        assert np.array_equal(resumed.genotype_keys, expected.genotype_keys)
+        assert np.array_equal(resumed.genotype_ids, expected.genotype_ids)
+        assert resumed.functions == expected.functions
+
+    def test_workers(self, tmp_path: Path) -> None:
+        expected = GenotypePhenotypeMap.build(tmp_path / "serial", 5, apply_strand=APPLY_STRAND, chunk_size=100)
+        gpmap = GenotypePhenotypeMap.build(
+            tmp_path / "parallel", 5, apply_strand=APPLY_STRAND, chunk_size=100, n_workers=2
+        )
+        assert np.array_equal(gpmap.genotype_keys, expected.genotype_keys)
+        assert gpmap.functions == expected.functions
+
+    def test_chunk_sizes(self, tmp_path: Path) -> None:
+        # Chunks much smaller than the most common phenotype, and one chunk holding the whole map in a single bucket
+        for kind in PhenotypeKind:
+            apply_strand = APPLY_STRAND if kind == PhenotypeKind.FUNCTION else None
+            expected = GenotypePhenotypeMap.build(tmp_path / f"{kind}-small", 5, kind, apply_strand, chunk_size=7)
+            gpmap = GenotypePhenotypeMap.build(tmp_path / f"{kind}-large", 5, kind, apply_strand, chunk_size=1 << 20)
+            assert gpmap.n_phenotypes == expected.n_phenotypes
+            for genotype_id in range(len(gpmap)):
+                key = gpmap.genotype_keys[genotype_id]
+                expected_ids = expected.get_genotype_ids(expected.get_phenotype_id(get_strand(genotype_id)))
+                assert gpmap.get_genotype_ids(gpmap.get_phenotype_id(get_strand(genotype_id))).tolist() == (
+                    expected_ids.tolist()
+                )
+                assert expected_ids.tolist() == np.flatnonzero(expected.genotype_keys == key).tolist()
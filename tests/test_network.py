@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from typogenetics.gpmap import GenotypePhenotypeMap, PhenotypeKind, get_genotype_id, get_genotype_offset, get_strand
+from typogenetics.network import NeutralNetwork, UnionFind, get_lengths
+from typogenetics.search import Editor
+from typogenetics.typogenetics import Strand
+
+
+class TestUnionFind:
+    def test_union(self) -> None:
+        union_find = UnionFind(6)
+        union_find.union(np.array([4, 1, 5]), np.array([5, 4, 3]))
+        assert union_find.get_labels().tolist() == [0, 1, 2, 1, 1, 1]
+        union_find.union(np.array([0]), np.array([3]))
+        assert union_find.get_labels().tolist() == [0, 0, 2, 0, 0, 0]
+
+
+class TestNeutralNetwork:
+    def test_get_lengths(self) -> None:
+        genotype_ids = np.array([0, 3, 4, 19, 20, get_genotype_offset(7) - 1], dtype=np.uint64)
+        assert get_lengths(genotype_ids).tolist() == [1, 1, 2, 2, 3, 6]
+
+    def test_edges(self) -> None:
+        n_genotypes = get_genotype_offset(6)
+        genotype_ids = np.arange(n_genotypes, dtype=np.uint64)
+        # Group strands by how many bases they have that are A
+        phenotype_keys = np.array(
+            [str(get_strand(genotype_id)).count("A") % 3 for genotype_id in range(n_genotypes)], dtype=np.uint64
+        )
+        neutral_network = NeutralNetwork.build(genotype_ids, phenotype_keys, batch_size=100)
+
+        expected = set()
+        for genotype_id in range(n_genotypes):
+            for neighbor in Editor.iter_neighbors(get_strand(genotype_id)):
+                if len(neighbor) == 0:
+                    continue
+                neighbor_id = get_genotype_id(neighbor)
+                if neighbor_id < n_genotypes and phenotype_keys[neighbor_id] == phenotype_keys[genotype_id]:
+                    expected.add(frozenset((genotype_id, neighbor_id)))
+        edges = [frozenset(edge) for edge in neutral_network.edges.tolist()]
+        assert len(edges) == len(expected)
+        assert set(edges) == expected
+
+    def test_components(self) -> None:
+        # Two paths of three strands, where the ends of each path are two edits apart
+        strands = ["A", "AC", "ACC", "GT", "GTT", "TTT"]
+        genotype_ids = np.array([get_genotype_id(Strand.from_str(strand)) for strand in strands], dtype=np.uint64)
+        neutral_network = NeutralNetwork.build(genotype_ids, np.array([0, 0, 0, 1, 1, 1], dtype=np.uint64))
+        assert neutral_network.n_components == 2
+        summaries = neutral_network.summarize()
+        assert [(summary.n_genotypes, summary.n_components) for summary in summaries] == [(3, 1), (3, 1)]
+        assert [(summary.diameter, summary.exact) for summary in summaries] == [(2, True), (2, True)]
+
+        with pytest.raises(ValueError, match="distinct"):
+            NeutralNetwork.build(np.array([1, 1], dtype=np.uint64), np.array([0, 0], dtype=np.uint64))
+
+    def test_from_map(self, tmp_path: Path) -> None:
+        genotype_map = GenotypePhenotypeMap.build(tmp_path / "map", 6, PhenotypeKind.TRANSLATION, chunk_size=100)
+        from_map = NeutralNetwork.from_map(genotype_map, batch_size=100, path=tmp_path / "edges.i64")
+        built = NeutralNetwork.build(
+            np.arange(len(genotype_map), dtype=np.uint64), np.asarray(genotype_map.genotype_keys)
+        )
+        assert len(from_map.edges) == len(built.edges)
+        assert np.array_equal(from_map.labels, built.labels)
+
+        summaries = from_map.summarize(exact_limit=4)
+        assert sum(summary.n_genotypes for summary in summaries) == len(genotype_map)
+        assert len(summaries) == genotype_map.n_phenotypes
+        exact_diameters = {summary.phenotype: summary.diameter for summary in from_map.summarize(exact_limit=1 << 20)}
+        for summary in summaries:
+            assert summary.exact == (summary.largest_component <= 4)
+            assert summary.diameter <= exact_diameters[summary.phenotype]
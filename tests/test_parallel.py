@@ -0,0 +1,39 @@
+from pathlib import Path
+
+import numpy as np
+
+from typogenetics.parallel import ParallelSearch
+from typogenetics.search import Search
+from typogenetics.sink import NdjsonSink
+from typogenetics.typogenetics import Strand
+
+
+class TestParallelSearch:
+    def test_random(self) -> None:
+        init_strand = Strand.from_str("ATAGCGAATAGGATAATG")
+        population = ParallelSearch.random(init_strand, 2000, 2, seed=42, sync_interval=300)
+        assert population.strands[0] == init_strand
+        assert len(population) > 1
+        assert ParallelSearch.random(init_strand, 2000, 2, seed=42, sync_interval=300).strands == population.strands
+
+    def test_bfs(self) -> None:
+        init_strand = Strand.from_str("ATAAACGATAATTGACAGAGCGAATG")
+        apply_strand = Strand.from_str("ATCGATAGGGAACATGTCGT")
+        valid_strands = ParallelSearch.bfs(init_strand, apply_strand, 4, 5, np.random.default_rng(42), 2, chunk_size=7)
+        assert valid_strands == Search.bfs(init_strand, apply_strand, 4, 5, np.random.default_rng(42))
+
+    def test_random_shared(self) -> None:
+        init_strand = Strand.from_str("ATAGCGAATAGGATAATG")
+        strands = ParallelSearch.random_shared(init_strand, 2000, 2, seed=42, max_strands=10_000, max_bases=1_000_000)
+        assert strands[0] == init_strand
+        assert len(set(strands)) == len(strands) > 1
+
+    def test_random_shared_full(self, tmp_path: Path) -> None:
+        init_strand = Strand.from_str("ATAGCGAATAGGATAATG")
+        path = tmp_path / "strands.ndjson"
+        with NdjsonSink(path) as sink:
+            strands = ParallelSearch.random_shared(
+                init_strand, 20_000, 2, seed=42, max_strands=50, max_bases=1_000_000, sink=sink
+            )
+        assert len(strands) == 50
+        assert len(path.read_text().splitlines()) == 50
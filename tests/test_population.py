@@ -0,0 +1,25 @@
+from typogenetics.engine import Compiler
+from typogenetics.population import Population
+from typogenetics.typogenetics import Enzyme, Strand
+
+
+class TestPopulation:
+    def test_add(self) -> None:
+        population = Population([Strand.from_str("CGGATACTAAACCGA")])
+        assert not population.add(Strand.from_str("CG GA TA CT AA AC CG A"))
+        assert population.add(Strand.from_str("ACGT"))
+        assert len(population) == 2
+        assert population.strands[1] == Strand.from_str("ACGT")
+        assert Strand.from_str("ACGT") in population
+
+    def test_programs(self) -> None:
+        population = Population([Strand.from_str("CGGATACTAAACCGA"), Strand.from_str("AA")])
+        programs = [Compiler.compile(Enzyme.from_str("cop-ina-rpy-off")), Compiler.compile(Enzyme.from_str("cut-cop"))]
+        assert population.programs == [programs, []]
+        assert population.pool == programs
+
+    def test_extend(self) -> None:
+        population = Population([Strand.from_str("ACGT")])
+        new_strands = population.extend([Strand.from_str("ACGT"), Strand.from_str("CG"), Strand.from_str("CG")])
+        assert new_strands == [Strand.from_str("CG")]
+        assert population.programs[1] == [Compiler.compile(Enzyme.from_str("cop"))]
@@ -1,6 +1,8 @@
+from collections import Counter
+
 import numpy as np
 
-from typogenetics.search import Editor, EditType
+from typogenetics.search import EditMode, Editor, EditType, Search
 from typogenetics.typogenetics import Strand
 
 
@@ -26,3 +28,61 @@ class TestSearch:
         strand = Strand.from_str("ACGT")
         new_strand = Editor.delete(strand, rng)
         assert new_strand == Strand.from_str("CGT")
+
+    def test_edit_batch(self) -> None:
+        rng = np.random.default_rng(42)
+        strand = Strand.from_str("ACGT")
+        new_strands = Editor.edit_batch(strand, 1000, rng)
+        assert len(new_strands) == 1000
+        assert strand == Strand.from_str("ACGT")
+        lengths = Counter(len(new_strand) for new_strand in new_strands)
+        assert set(lengths) == {3, 4, 5}
+        assert lengths[4] > lengths[3] + lengths[5]
+        for new_strand in new_strands:
+            if len(new_strand) == len(strand):
+                assert sum(a != b for a, b in zip(new_strand.codes, strand.codes, strict=True)) == 1
+        assert all(len(new_strand) == 1 for new_strand in Editor.edit_batch(Strand.from_str(""), 10, rng))
+        assert Editor.edit_batch(strand, 0, rng) == []
+
+    def test_iter_neighbors(self) -> None:
+        for strand_str in ["", "A", "AAC", "ACGT", "CGGATACTAAACCGA"]:
+            strand = Strand.from_str(strand_str)
+            n = len(strand)
+            expected = set()
+            for position in range(n):
+                for base in "ACGT":
+                    expected.add(strand_str[:position] + base + strand_str[position + 1 :])
+                expected.add(strand_str[:position] + strand_str[position + 1 :])
+            for position in range(n + 1):
+                for base in "ACGT":
+                    expected.add(strand_str[:position] + base + strand_str[position:])
+            expected.discard(strand_str)
+
+            neighbors = [str(neighbor) for neighbor in Editor.iter_neighbors(strand)]
+            assert len(neighbors) == len(set(neighbors))
+            assert set(neighbors) == expected
+            assert len(neighbors) <= 3 * n + 4 * (n + 1) + n
+
+    def test_random(self) -> None:
+        rng = np.random.default_rng(42)
+        population = Search.random(Strand.from_str("ATAGCGAATAGGATAATG"), 2000, rng)
+        assert len(population) == 754
+
+    def test_bfs(self) -> None:
+        rng = np.random.default_rng(42)
+        init_strand = Strand.from_str("ATAAACGATAATTGACAGAGCGAATG")
+        apply_strand = Strand.from_str("ATCGATAGGGAACATGTCGT")
+        valid_strands = Search.bfs(init_strand, apply_strand, 3, 5, rng)
+        assert len(valid_strands) == 2
+
+    def test_bfs_exhaustive(self) -> None:
+        init_strand = Strand.from_str("ATAAACGATAATTGACAGAGCGAATG")
+        apply_strand = Strand.from_str("ATCGATAGGGAACATGTCGT")
+        valid_strands = Search.bfs(
+            init_strand, apply_strand, 1, 0, np.random.default_rng(42), edit_mode=EditMode.EXHAUSTIVE
+        )
+        other_strands = Search.bfs(
+            init_strand, apply_strand, 1, 0, np.random.default_rng(7), edit_mode=EditMode.EXHAUSTIVE
+        )
+        assert valid_strands == other_strands
+        assert len(valid_strands) == len(set(valid_strands)) > 0
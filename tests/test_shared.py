@@ -0,0 +1,38 @@
+import pytest
+
+from typogenetics.shared import PopulationFullError, SharedPopulation
+from typogenetics.typogenetics import Strand
+
+
+class TestSharedPopulation:
+    def test_add(self) -> None:
+        population = SharedPopulation.create(10, 100)
+        try:
+            assert population.add(Strand.from_str("CGGATACTAAACCGA"))
+            assert not population.add(Strand.from_str("CG GA TA CT AA AC CG A"))
+            assert population.add(Strand.from_str("ACGT"))
+            assert len(population) == 2
+            assert population[1] == Strand.from_str("ACGT")
+            assert Strand.from_str("ACGT") in population
+            assert Strand.from_str("ACG") not in population
+            assert list(population) == [Strand.from_str("CGGATACTAAACCGA"), Strand.from_str("ACGT")]
+        finally:
+            population.close()
+            population.unlink()
+
+    def test_full(self) -> None:
+        population = SharedPopulation.create(10, 6)
+        try:
+            population.add(Strand.from_str("ACGT"))
+            with pytest.raises(PopulationFullError, match="full"):
+                population.add(Strand.from_str("TTT"))
+        finally:
+            population.close()
+            population.unlink()
+
+    def test_too_large(self) -> None:
+        available = SharedPopulation.get_available_size()
+        if available is None:
+            pytest.skip("Shared memory is not backed by a file system")
+        with pytest.raises(ValueError, match="lower the maximums"):
+            SharedPopulation.create(10, available + 1)
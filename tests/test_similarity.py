@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from typogenetics.similarity import StrandIndex, get_edit_distance, get_edit_distances
+from typogenetics.typogenetics import Strand
+
+
+def get_reference_distance(strand_a: Strand, strand_b: Strand) -> int:
+    row = list(range(len(strand_b) + 1))
+    for i, code_a in enumerate(strand_a.codes, 1):
+        new_row = [i]
+        for j, code_b in enumerate(strand_b.codes, 1):
+            new_row.append(min(row[j] + 1, new_row[j - 1] + 1, row[j - 1] + (code_a != code_b)))
+        row = new_row
+    return row[-1]
+
+
+def random_strand(length: int, rng: np.random.Generator) -> Strand:
+    return Strand.from_codes(rng.integers(0, 4, length, dtype=np.uint8).tobytes())
+
+
+class TestSimilarity:
+    def test_edit_distance(self) -> None:
+        assert get_edit_distance(Strand.from_str("ACGT"), Strand.from_str("ACGT")) == 0
+        assert get_edit_distance(Strand.from_str("ACGT"), Strand.from_str("AGT")) == 1
+        assert get_edit_distance(Strand.from_str("AAAA"), Strand.from_str("TT")) == 4
+        assert get_edit_distance(Strand.from_str(""), Strand.from_str("TT")) == 2
+        rng = np.random.default_rng(42)
+        for _ in range(100):
+            strand_a = random_strand(int(rng.integers(0, 80)), rng)
+            strand_b = random_strand(int(rng.integers(0, 80)), rng)
+            assert get_edit_distance(strand_a, strand_b) == get_reference_distance(strand_a, strand_b)
+
+    def test_edit_distances(self) -> None:
+        rng = np.random.default_rng(42)
+        strands = [random_strand(int(rng.integers(0, 30)), rng) for _ in range(200)]
+        strand_index = StrandIndex(strands)
+        # Queries of up to a machine word use the vectorized kernel and longer ones fall back to the scalar kernel
+        for length in [0, 5, 64, 70]:
+            query = random_strand(length, rng)
+            distances = get_edit_distances(query, strand_index.codes, strand_index.starts, strand_index.lengths)
+            assert distances.tolist() == [get_reference_distance(query, strand) for strand in strands]
+
+    def test_within(self) -> None:
+        rng = np.random.default_rng(42)
+        # One long strand among short ones, which are stored without padding to its length
+        strands = [random_strand(int(rng.integers(10, 20)), rng) for _ in range(500)] + [random_strand(1000, rng)]
+        strand_index = StrandIndex(strands, q=3)
+        assert len(strand_index.codes) == sum(len(strand) for strand in strands)
+        query = strands[0]
+        distances = [get_reference_distance(query, strand) for strand in strands]
+        for radius in range(8):
+            expected = sorted((distance, i) for i, distance in enumerate(distances) if distance <= radius)
+            assert strand_index.within(query, radius) == [(strands[i], distance) for distance, i in expected]
+
+        assert strand_index.within(Strand.from_str("AC"), 0) == []
+        with pytest.raises(ValueError, match="q must be between"):
+            StrandIndex(strands, q=0)
+        with pytest.raises(ValueError, match="q must be between"):
+            StrandIndex(strands, q=9)
+
+    def test_nearest(self) -> None:
+        rng = np.random.default_rng(42)
+        strands = [random_strand(int(rng.integers(10, 20)), rng) for _ in range(500)]
+        strand_index = StrandIndex(strands)
+        query = random_strand(15, rng)
+        expected = sorted((get_reference_distance(query, strand), i) for i, strand in enumerate(strands))
+        for k in [1, 10, 500, 600]:
+            assert strand_index.nearest(query, k) == [(strands[i], distance) for distance, i in expected[:k]]
+
+    def test_short_strands(self) -> None:
+        query = Strand.from_str("ACGTACGT")
+        assert StrandIndex([]).within(query, 10) == []
+        assert StrandIndex([]).nearest(query, 3) == []
+
+        # Strands shorter than q have no q-grams, so they are only found once the length bound lets them through
+        strands = [Strand.from_str("A"), Strand.from_str(""), Strand.from_str("GT")]
+        strand_index = StrandIndex(strands)
+        assert strand_index.within(query, 1) == []
+        assert strand_index.within(Strand.from_str("AT"), 1) == [(strands[0], 1), (strands[2], 1)]
+        assert strand_index.nearest(query, 2) == [(strands[2], 6), (strands[0], 7)]
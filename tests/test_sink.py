@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import numpy as np
+
+from typogenetics.search import Search
+from typogenetics.sink import BinarySink, NdjsonSink, Sink, SinkFormat, SqliteSink
+from typogenetics.typogenetics import Strand
+
+READERS = {SinkFormat.NDJSON: NdjsonSink.read, SinkFormat.BINARY: BinarySink.read, SinkFormat.SQLITE: SqliteSink.read}
+
+
+class TestSink:
+    def test_write(self, tmp_path: Path) -> None:
+        records = [(Strand.from_str("ACGTA"), 0), (Strand.from_str("TTG"), 3), (Strand.from_str("C"), 7)]
+        for sink_format, read in READERS.items():
+            path = tmp_path / f"strands.{sink_format}"
+            with Sink.open(path, sink_format, buffer_size=2) as sink:
+                for strand, step in records:
+                    sink.write(strand, step)
+            assert list(read(path)) == records
+
+    def test_truncate(self, tmp_path: Path) -> None:
+        for sink_format, read in READERS.items():
+            path = tmp_path / f"strands.{sink_format}"
+            with Sink.open(path, sink_format) as sink:
+                sink.write(Strand.from_str("ACGTA"), 0)
+                position = sink.tell()
+                sink.write(Strand.from_str("TTG"), 3)
+            with Sink.open(path, sink_format, append=True) as sink:
+                sink.truncate(position)
+                sink.write(Strand.from_str("C"), 7)
+            assert list(read(path)) == [(Strand.from_str("ACGTA"), 0), (Strand.from_str("C"), 7)]
+
+    def test_random(self, tmp_path: Path) -> None:
+        path = tmp_path / "strands.ndjson"
+        with Sink.open(path, SinkFormat.NDJSON) as sink:
+            population = Search.random(Strand.from_str("ATAGCGAATAGGATAATG"), 500, np.random.default_rng(42), sink=sink)
+        records = list(NdjsonSink.read(path))
+        assert [strand for strand, _ in records] == population.strands
+        assert records[0][1] == 0
+        assert all(0 < step <= 500 for _, step in records[1:])
+
+    def test_resume(self, tmp_path: Path) -> None:
+        init_strand = Strand.from_str("ATAGCGAATAGGATAATG")
+        checkpoint_path, path = tmp_path / "random.bin", tmp_path / "strands.bin"
+        with Sink.open(path, SinkFormat.BINARY) as sink:
+            Search.random(init_strand, 2000, np.random.default_rng(42), sink=sink)
+        expected = list(BinarySink.read(path))
+
+        with Sink.open(path, SinkFormat.BINARY) as sink:
+            rng = np.random.default_rng(42)
+            Search.random(init_strand, 1000, rng, checkpoint_path=checkpoint_path, checkpoint_interval=300, sink=sink)
+            # Strands found after the last checkpoint are written again when the run resumes
+            Search.iterate_random(Search.load_random_checkpoint(checkpoint_path, rng)[0], 50, rng, sink=sink)
+        with Sink.open(path, SinkFormat.BINARY, append=True) as sink:
+            rng = np.random.default_rng(0)
+            Search.random(init_strand, 2000, rng, checkpoint_path=checkpoint_path, resume=True, sink=sink)
+        assert list(BinarySink.read(path)) == expected
@@ -0,0 +1,52 @@
+import numpy as np
+
+from typogenetics.engine import Compiler, Engine
+from typogenetics.search import Editor, Search
+from typogenetics.stats import Stats
+from typogenetics.typogenetics import AminoAcid, Enzyme, Rewriter, Strand, Termination
+
+
+class TestStats:
+    def test_rewrite(self) -> None:
+        enzyme = Enzyme.from_str("rpy-cop-mvr-mvr-mvr")
+        strand = Strand.from_str("CGGATACT")
+        rewriter_stats, engine_stats = Stats(), Stats()
+        Rewriter.rewrite(enzyme, strand, stats=rewriter_stats)
+        Engine.rewrite(Compiler.compile(enzyme), strand, stats=engine_stats)
+        for stats in (rewriter_stats, engine_stats):
+            assert stats.get_amino_acid_counts() == {"rpy": 1, "cop": 1, "mvr": 2}
+            assert stats.terminations == {Termination.END_OF_STRAND: 1}
+
+    def test_stop_on_last_opcode(self) -> None:
+        for enzyme_str, strand_str in [("mvr", "CGGA"), ("rpy-cop-mvr-mvr", "CGGATACT"), ("swi", "CGGA")]:
+            enzyme, strand = Enzyme.from_str(enzyme_str), Strand.from_str(strand_str)
+            rewriter_stats, engine_stats = Stats(), Stats()
+            Rewriter.rewrite(enzyme, strand, stats=rewriter_stats)
+            Engine.rewrite(Compiler.compile(enzyme), strand, stats=engine_stats)
+            assert engine_stats.terminations == rewriter_stats.terminations
+            assert engine_stats.get_amino_acid_counts() == rewriter_stats.get_amino_acid_counts()
+            assert Termination.COMPLETED not in engine_stats.terminations
+
+    def test_unbound(self) -> None:
+        stats = Stats()
+        Engine.rewrite(Compiler.compile(Enzyme.from_str("cop")), Strand.from_str("AAA"), stats=stats)
+        assert stats.terminations == {Termination.UNBOUND: 1}
+
+    def test_edit(self) -> None:
+        stats = Stats()
+        rng = np.random.default_rng(42)
+        for _ in range(100):
+            Editor.edit(Strand.from_str("ACGT"), rng, stats=stats)
+        assert sum(stats.edits.values()) == 100
+
+    def test_random(self) -> None:
+        init_strand = Strand.from_str("ATAGCGAATAGGATAATG")
+        samples = []
+        stats = Stats(sample_interval=500, hook=lambda stats: samples.append(stats.samples[-1]))
+        population = Search.random(init_strand, 2000, np.random.default_rng(42), stats=stats)
+        assert len(population) == len(Search.random(init_strand, 2000, np.random.default_rng(42)))
+        assert stats.counters["iterations"] == 2000
+        assert stats.counters["rewrite"] > 0
+        assert sum(stats.terminations.values()) == stats.counters["rewrite"]
+        assert [sample["iteration"] for sample in samples] == [500, 1000, 1500, 2000]
+        assert AminoAcid.COP.value in stats.to_dict()["amino_acids"]
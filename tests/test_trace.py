@@ -0,0 +1,38 @@
+import numpy as np
+
+from typogenetics.trace import GAP, TraceRecorder
+from typogenetics.typogenetics import Base, BasePair, Enzyme, Rewriter, Strand, Termination
+
+
+class TestTraceRecorder:
+    def test_record(self) -> None:
+        trace = TraceRecorder()
+        strands = Rewriter.rewrite(Enzyme.from_str("cop-ina-rpy-off"), Strand.from_str("CGGATACTAAACCGA"), trace=trace)
+        assert [event.amino_acid.value for event in trace.events] == ["cop", "ina", "rpy", "off"]
+        assert trace.events[1].n_removed == 0
+        assert trace.events[1].inserted == ("AT",)
+        assert trace.termination == Termination.COMPLETED
+        assert trace.strands == strands
+
+    def test_stopped(self) -> None:
+        trace = TraceRecorder()
+        Rewriter.rewrite(Enzyme.from_str("rpy-cop-mvr-mvr-mvr"), Strand.from_str("CGGATACT"), trace=trace)
+        assert len(trace.events) == 4
+        assert trace.termination == Termination.END_OF_STRAND
+
+    def test_replay(self) -> None:
+        rng = np.random.default_rng(0)
+        enzyme = Enzyme.from_str("swi-cop-lpu-inc-cut-mvr-del-rpy")
+        for _ in range(200):
+            strand = Strand.from_codes(rng.integers(0, 4, 20, dtype=np.uint8).tobytes())
+            trace = TraceRecorder()
+            Rewriter.rewrite(enzyme, strand, trace=trace)
+            loaded = TraceRecorder.from_dict(trace.to_dict())
+            assert loaded.render() == trace.render()
+            if len(loaded.events) == 0:
+                continue
+
+            _, pairs = list(loaded.replay())[-1]
+            base_pairs = [BasePair(*(None if c == GAP else Base.from_str(c) for c in pair)) for pair in pairs]
+            final_strands = Rewriter.strands_from_pairs(base_pairs)
+            assert loaded.strands[len(loaded.strands) - len(final_strands) :] == final_strands
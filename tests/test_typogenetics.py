@@ -1,4 +1,6 @@
-from typogenetics.typogenetics import Base, Enzyme, Folder, Orientation, Rewriter, Strand, Translator
+import numpy as np
+
+from typogenetics.typogenetics import AminoAcid, Base, Enzyme, Folder, Orientation, Rewriter, Strand, Translator
 
 
 class TestTypogenetics:
@@ -44,3 +46,53 @@ class TestTypogenetics:
             Strand.from_str("ATCTC"),
             Strand.from_str("CGAGATACTAAACCGA"),
         ]
+
+    def test_strand_codes(self) -> None:
+        strand = Strand.from_str("ACGT")
+        assert strand.codes == bytes([0, 1, 2, 3])
+        assert strand[1] == Base.C
+        assert strand[1:3] == Strand.from_str("CG")
+        assert str(strand) == "ACGT"
+
+    def test_strand_hash(self) -> None:
+        assert hash(Strand.from_str("CGGA")) == hash(Strand([Base.C, Base.G, Base.G, Base.A]))
+        assert len({Strand.from_str("CGGA"), Strand.from_str("CG GA"), Strand.from_str("CGG")}) == 2
+
+    def test_strand_pack(self) -> None:
+        strand = Strand.from_str("CGGATACTAAACCGA")
+        packed = strand.pack()
+        assert len(packed) == 4
+        assert Strand.unpack(packed, len(strand)) == strand
+
+    def test_translate_batch(self) -> None:
+        rng = np.random.default_rng(42)
+        strands = [Strand.from_codes(bytes(rng.integers(0, 4, rng.integers(0, 40)).tolist())) for _ in range(500)]
+        strands += [
+            Strand.from_str(""),
+            Strand.from_str("A"),
+            Strand.from_str("AAAA"),
+            Strand.from_str("CGGATACTAAACCGA"),
+        ]
+        assert Translator.translate_batch(strands) == [Translator.translate(strand) for strand in strands]
+        assert Translator.translate_batch([]) == []
+
+    def test_strand_first_units(self) -> None:
+        strand = Strand.from_str("CGGATACTAAACCGA")
+        assert strand.first_units == (3, 0, 1, 4)
+        assert Strand.from_str("GGC").first_units == (-1, 2, 0, -1)
+        assert Strand.from_str("").first_units == (-1, -1, -1, -1)
+
+    def test_fold_batch(self) -> None:
+        rng = np.random.default_rng(42)
+        amino_acids = list(AminoAcid)
+        enzymes = [Enzyme([amino_acids[i] for i in rng.integers(0, 15, rng.integers(0, 12))]) for _ in range(500)]
+        for enzyme in enzymes:
+            turning_number = sum(Folder.get_turn(amino_acid).to_int() for amino_acid in enzyme.iter_amino_acids())
+            assert Folder.fold(enzyme) == Orientation.from_turning_number(turning_number)
+        assert Folder.fold_batch(enzymes) == [Folder.fold(enzyme) for enzyme in enzymes]
+        assert Folder.fold_batch([]) == []
+
+        strand = Strand.from_str("CGGATACTAAACCGA")
+        expected = [Folder.get_binding_site(enzyme, strand) for enzyme in enzymes]
+        assert Folder.get_binding_sites_batch(enzymes, strand) == expected
+        assert Folder.get_binding_sites_batch(enzymes, Strand.from_str("")) == [None] * len(enzymes)